@@ -0,0 +1,85 @@
+"""
+Excel 출력 벤치마크: 기존 pd.ExcelWriter(openpyxl) 방식과 스트리밍(write-only) 방식 비교.
+
+사용법: python benchmarks/bench_excel.py [--news-rows 50000] [--ranked-rows 300]
+합성 결과 프레임(뉴스 본문 요약 포함)을 두 방식으로 저장해 소요 시간과
+Python 힙 최대 사용량(tracemalloc)을 출력한다.
+"""
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.excel_export import write_frames  # noqa: E402
+
+
+def make_frames(news_rows: int, ranked_rows: int) -> list[tuple[str, pd.DataFrame]]:
+    rng = np.random.default_rng(0)
+    tickers = np.array([f"{i:06d}" for i in rng.choice(999_999, ranked_rows, replace=False)])
+    ranked = pd.DataFrame({
+        "ticker": tickers,
+        "name": [f"종목{i}" for i in range(ranked_rows)],
+        "volume": rng.integers(1_000_000, 50_000_000, ranked_rows),
+        "trading_value": rng.integers(10**10, 10**12, ranked_rows),
+        "change_pct": rng.normal(0, 5, ranked_rows).round(2),
+        "score_total": rng.uniform(0, 100, ranked_rows),
+        "grade": rng.choice(list("ABCDEF"), ranked_rows),
+    })
+    body = "회사는 사상 최대 실적을 기록했다. 주가가 급등했다. " * 6
+    news = pd.DataFrame({
+        "ticker": rng.choice(tickers, news_rows),
+        "name": "종목",
+        "news_title": [f"뉴스 제목 {i}" for i in range(news_rows)],
+        "news_link": [f"https://news.example.com/article/{i}" for i in range(news_rows)],
+        "news_summary": body[:120],
+        "news_date": "Fri, 14 Feb 2025 09:00:00 +0900",
+        "news_body_summary": body[:300],
+    })
+    themes = pd.DataFrame({"sector": ["반도체", "조선"], "count": [10, 5], "theme_strength": [31.2, 12.5], "sample_tickers": ["005930, 000660", "009540"]})
+    return [("Ranked", ranked), ("Themes", themes), ("Valuation", ranked[["ticker", "name"]]), ("Screened", ranked), ("News", news)]
+
+
+def write_pandas(path: Path, sheets) -> None:
+    with pd.ExcelWriter(path, engine="openpyxl") as w:
+        for title, df in sheets:
+            df.to_excel(w, sheet_name=title, index=False)
+
+
+def measure(func, path: Path, sheets) -> tuple[float, float]:
+    """Elapsed seconds (untraced run) and peak traced MB (second run; tracemalloc slows execution)."""
+    t0 = time.perf_counter()
+    func(path, sheets)
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    func(path, sheets)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Excel 출력 벤치마크")
+    parser.add_argument("--news-rows", type=int, default=50_000)
+    parser.add_argument("--ranked-rows", type=int, default=300)
+    args = parser.parse_args()
+
+    sheets = make_frames(args.news_rows, args.ranked_rows)
+    print(f"뉴스 {args.news_rows}행, 랭킹 {args.ranked_rows}행")
+    print(f"{'방식':<28}{'시간(s)':>10}{'최대 메모리(MB)':>18}{'파일(KB)':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, func in (("pd.ExcelWriter (기존)", write_pandas), ("write-only 스트리밍", write_frames)):
+            path = Path(tmp) / f"{func.__name__}.xlsx"
+            elapsed, peak = measure(func, path, sheets)
+            print(f"{label:<28}{elapsed:>10.2f}{peak:>18.1f}{path.stat().st_size / 1024:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+이력 프레임 메모리 벤치마크: 5년×2,500종목 일간 패널을 현재 파이프라인 형식(문자열 종목코드·일자·업종,
+float64 숫자)으로 합성한 뒤 history_frames의 압축 배치로 바꿔 메모리 사용량(deep)과 변환 시간을 비교한다.
+
+사용법: python benchmarks/bench_history_memory.py [--years 5] [--tickers 2500]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.history_frames import History, TickerDictionary, compact  # noqa: E402
+
+SECTORS = ["반도체", "제약", "화학", "은행", "조선", "유통", "건설", "자동차", "철강", "통신", "음식료", "게임"]
+LABELS = ["저평가", "적정", "고평가"]
+
+
+def make_frames(years: int, n_tickers: int) -> dict[str, pd.DataFrame]:
+    """Long date x ticker frames in the pipeline's layout (object strings, float64 numerics)."""
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range("2020-01-02", periods=years * 250).strftime("%Y%m%d").to_numpy()
+    codes = np.array([f"{5930 + i * 7:06d}" for i in range(n_tickers)])
+    n = len(dates) * n_tickers
+    date_col = np.repeat(dates, n_tickers).astype(object)
+    ticker_col = np.tile(codes, len(dates)).astype(object)
+    close = np.round(rng.lognormal(9.5, 1.2, n)).clip(100, 3_000_000)
+    volume = np.round(rng.lognormal(12, 1.5, n))
+    ohlcv = pd.DataFrame({
+        "date": date_col,
+        "ticker": ticker_col,
+        "open": np.round(close * rng.uniform(0.97, 1.03, n)),
+        "high": np.round(close * 1.03),
+        "low": np.round(close * 0.97),
+        "close": close,
+        "volume": volume,
+        "trading_value": volume * close,
+        "change_pct": np.round(rng.normal(0, 3, n), 2),
+    })
+    sector = np.array(SECTORS, dtype=object)[rng.integers(0, len(SECTORS), n_tickers)]
+    per = np.round(rng.lognormal(2.5, 0.6, n), 2)
+    per[rng.random(n) < 0.1] = np.nan
+    valuation = pd.DataFrame({
+        "date": date_col,
+        "ticker": ticker_col,
+        "bps": np.round(close / rng.uniform(0.5, 3, n)),
+        "per": per,
+        "pbr": np.round(rng.lognormal(0, 0.5, n), 2),
+        "sector": np.tile(sector, len(dates)),
+        "valuation_label": np.array(LABELS, dtype=object)[rng.integers(0, 3, n)],
+        "sector_median_per": np.round(rng.lognormal(2.5, 0.2, n), 2),
+    })
+    return {"ohlcv": ohlcv, "valuation": valuation}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="이력 프레임 메모리 벤치마크")
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--tickers", type=int, default=2500)
+    args = parser.parse_args()
+
+    frames = make_frames(args.years, args.tickers)
+    print(f"{args.years}년×{args.tickers:,}종목 ({len(frames['ohlcv']):,}행/프레임)")
+    dictionary = TickerDictionary()
+    compacted = {}
+    print(f"{'프레임':<12}{'기존 MB':>10}{'압축 MB':>10}{'변환(s)':>9}")
+    for name, df in frames.items():
+        before = df.memory_usage(deep=True).sum() / 2**20
+        t0 = time.perf_counter()
+        compacted[name] = compact(df, dictionary)
+        elapsed = time.perf_counter() - t0
+        after = compacted[name].memory_usage(deep=True).sum() / 2**20
+        print(f"{name:<12}{before:>10.1f}{after:>10.1f}{elapsed:>9.2f}")
+    # 값 보존 확인 (종목코드·종가·PER)
+    ohlcv, valuation = compacted["ohlcv"], compacted["valuation"]
+    assert (dictionary.decode(ohlcv["ticker_id"].to_numpy()) == frames["ohlcv"]["ticker"].to_numpy().astype("U6")).all()
+    assert np.array_equal(ohlcv["close"].to_numpy(np.float64), frames["ohlcv"]["close"].to_numpy())
+    assert np.allclose(valuation["per"].to_numpy(np.float64), frames["valuation"]["per"].to_numpy(), equal_nan=True, atol=5e-3)
+    print()
+    print(History(dictionary, compacted).report(detail=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+뉴스 단계 부하 시험: 로컬 네이버 모의 서버(mock_naver.py)를 띄우고 선별 종목 수를 늘려 가며
+run_news_collector를 실행해 처리량, 종목별·요청별 꼬리 지연(p50/p95/p99), 뉴스 단계 전체 시간,
+429·5xx 응답 수를 출력한다. 실제 네이버에는 요청하지 않는다.
+
+사용법: python benchmarks/bench_news_load.py [--tickers 50,200,1000] [--parse-workers 0]
+        [--api-latency-ms 30] [--article-latency-ms 40,80,150] [--slow-article-ms 0]
+        [--error-rate 0] [--api-rate-limit 10] [--scrape] [--no-body]
+"""
+import argparse
+import copy
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mock_naver import EndpointProfile, MockNaver  # noqa: E402
+
+from src.config_loader import load_config, use_config  # noqa: E402
+from src.news_collector import run_news_collector  # noqa: E402
+
+DATE = "20250214"
+
+
+def percentiles(values_ms) -> str:
+    if len(values_ms) == 0:
+        return f"{'-':>8}{'-':>8}{'-':>8}"
+    p50, p95, p99 = np.percentile(values_ms, [50, 95, 99])
+    return f"{p50:>8.0f}{p95:>8.0f}{p99:>8.0f}"
+
+
+def screened_frame(n: int) -> pd.DataFrame:
+    return pd.DataFrame({"ticker": [f"{900000 + i:06d}" for i in range(n)], "name": [f"부하종목{i}" for i in range(n)]})
+
+
+def run_once(mock: MockNaver, cfg: dict, n: int) -> dict:
+    """One news-stage run over n synthetic tickers; returns wall time, per-ticker gaps and server stats."""
+    mock.reset_stats()
+    done_at = []
+    t0 = time.perf_counter()
+    with use_config(cfg):
+        news = run_news_collector(screened_frame(n), DATE, on_ticker=lambda t, c: done_at.append(time.perf_counter()))
+    elapsed = time.perf_counter() - t0
+    # 종목별 소요 = 직전 종목 확정 이후 이 종목이 확정되기까지 걸린 시간 (순차 다운로드 기준)
+    gaps = np.diff([t0] + done_at) * 1000
+    return {"seconds": elapsed, "rows": len(news), "ticker_ms": gaps, "stats": mock.stats()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="뉴스 단계 부하 시험 (로컬 모의 서버)")
+    parser.add_argument("--tickers", default="50,200,1000", help="쉼표로 구분한 선별 종목 수")
+    parser.add_argument("--parse-workers", type=int, default=0, help="news.parse_workers")
+    parser.add_argument("--api-latency-ms", type=float, default=30)
+    parser.add_argument("--search-latency-ms", type=float, default=60)
+    parser.add_argument("--article-latency-ms", default="40,80,150", help="언론사 도메인별 기사 지연 (도메인 수 = 항목 수)")
+    parser.add_argument("--slow-article-ms", type=float, default=0, help="0보다 크면 이 지연의 느린 언론사 도메인 추가")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="모든 엔드포인트 HTTP 500 비율")
+    parser.add_argument("--api-rate-limit", type=float, default=10, help="API 초당 요청 한도 (0=무제한, 초과 시 429)")
+    parser.add_argument("--delay", type=float, default=0.0, help="news.request_delay_seconds / article_request_delay_seconds")
+    parser.add_argument("--scrape", action="store_true", help="API 대신 검색 결과 페이지 스크래핑")
+    parser.add_argument("--no-body", action="store_true", help="기사 본문 수집 생략 (fetch_article_body=false)")
+    args = parser.parse_args()
+
+    domains = {
+        f"news-{chr(ord('a') + i)}": EndpointProfile(ms, ms / 3, args.error_rate)
+        for i, ms in enumerate(float(v) for v in args.article_latency_ms.split(","))
+    }
+    if args.slow_article_ms > 0:
+        domains["news-slow"] = EndpointProfile(args.slow_article_ms, args.slow_article_ms / 5, args.error_rate)
+    mock = MockNaver(
+        api=EndpointProfile(args.api_latency_ms, args.api_latency_ms / 3, args.error_rate, args.api_rate_limit),
+        search=EndpointProfile(args.search_latency_ms, args.search_latency_ms / 3, args.error_rate),
+        domains=domains,
+        date=DATE,
+    )
+
+    cfg = copy.deepcopy(load_config())
+    news_cfg = cfg.setdefault("news", {})
+    news_cfg.update({
+        "use_api": not args.scrape,
+        "request_delay_seconds": args.delay,
+        "article_request_delay_seconds": args.delay,
+        "fetch_article_body": not args.no_body,
+        "parse_workers": args.parse_workers,
+        # 매 실행을 외부 조회로 (아카이브 재사용·색인 기록 없음)
+        "archive_enabled": False,
+        "index_enabled": False,
+    })
+    if not args.scrape:
+        os.environ.setdefault("NAVER_CLIENT_ID", "mock")
+        os.environ.setdefault("NAVER_CLIENT_SECRET", "mock")
+
+    sizes = [int(v) for v in args.tickers.split(",")]
+    with mock:
+        news_cfg["api_base_url"] = mock.api_base_url
+        news_cfg["search_base_url"] = mock.search_base_url
+        print(f"모의 서버 {mock.api_base_url} (기사 도메인 {len(mock.domains)}개), parse_workers={args.parse_workers}, "
+              f"{'스크래핑' if args.scrape else 'API'}{', 본문 생략' if args.no_body else ''}")
+        print(f"\n{'종목':>6}{'시간(s)':>9}{'종목/s':>8}{'요청':>7}{'요청/s':>8}{'429':>6}{'5xx':>6}{'뉴스':>7}"
+              f"  종목별 ms{'p50':>6}{'p95':>8}{'p99':>8}")
+        runs = []
+        for n in sizes:
+            r = run_once(mock, cfg, n)
+            runs.append((n, r))
+            stats = r["stats"].values()
+            requests = sum(s.requests for s in stats)
+            throttled = sum(s.statuses.get(429, 0) for s in stats)
+            errors = sum(c for s in stats for code, c in s.statuses.items() if code >= 500)
+            print(f"{n:>6}{r['seconds']:>9.2f}{n / r['seconds']:>8.1f}{requests:>7}{requests / r['seconds']:>8.1f}"
+                  f"{throttled:>6}{errors:>6}{r['rows']:>7}  {'':>9}{percentiles(r['ticker_ms'])}")
+
+        print(f"\n요청별 서버 응답 시간 (ms, 가장 큰 실행 {sizes[-1]}종목 기준)")
+        print(f"{'엔드포인트':<12}{'요청':>7}{'p50':>8}{'p95':>8}{'p99':>8}  상태 코드")
+        for name, s in runs[-1][1]["stats"].items():
+            if s.requests:
+                codes = ", ".join(f"{code}:{c}" for code, c in sorted(s.statuses.items()))
+                print(f"{name:<12}{s.requests:>7}{percentiles(s.latencies_ms)}  {codes}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+CLI 시작 시간 벤치마크.
+
+사용법: python benchmarks/bench_startup.py [--repeat 5]
+각 명령을 새 프로세스로 반복 실행해 최소/중앙값(ms)을 출력하고,
+캐시 전용 경로(render)에서 pykrx·requests·bs4가 import되지 않았는지 확인한다.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+COMMANDS = {
+    "python (빈 프로세스)": [sys.executable, "-c", "pass"],
+    "main.py --help": [sys.executable, "main.py", "--help"],
+    "main.py render --help": [sys.executable, "main.py", "render", "--help"],
+    "import src.pipeline": [sys.executable, "-c", "import src.pipeline"],
+    "import src.report": [sys.executable, "-c", "import src.report"],
+    "import pykrx (참고)": [sys.executable, "-c", "import pykrx"],
+}
+
+HEAVY_MODULES = ("pykrx", "requests", "bs4")
+
+CHECK_RENDER_IMPORTS = (
+    "import sys, main\n"
+    "from src import report, results_store\n"
+    f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+)
+
+
+def time_command(cmd: list[str], repeat: int) -> list[float]:
+    out = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        subprocess.run(cmd, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        out.append((time.perf_counter() - t0) * 1000)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CLI startup benchmark")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'command':<28}{'min(ms)':>10}{'median(ms)':>12}")
+    for label, cmd in COMMANDS.items():
+        times = time_command(cmd, args.repeat)
+        print(f"{label:<28}{min(times):>10.1f}{statistics.median(times):>12.1f}")
+
+    loaded = subprocess.run(
+        [sys.executable, "-c", CHECK_RENDER_IMPORTS], cwd=ROOT, capture_output=True, text=True
+    ).stdout.strip()
+    print(f"\nrender 경로에서 로드된 무거운 모듈: {loaded or '없음'}")
+
+
+if __name__ == "__main__":
+    main()
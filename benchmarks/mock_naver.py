@@ -0,0 +1,336 @@
+"""
+네이버 뉴스 모의 서버: 검색 API(JSON), 뉴스 검색 결과 페이지(HTML), 여러 언론사 도메인의 기사 페이지를
+로컬에서 흉내 낸다. 엔드포인트별 지연·오류율·초당 요청 한도(초과 시 429)를 설정할 수 있고,
+언론사 도메인은 각각 별도 포트(호스트)로 띄워 호스트별 지연 지표가 실제처럼 나뉜다.
+
+단독 실행: python benchmarks/mock_naver.py [--port 8650] [--latency-ms 30] [--api-rate-limit 10]
+출력된 주소를 config.yaml의 news.api_base_url / news.search_base_url에 넣고 NAVER_CLIENT_ID/SECRET에
+아무 값이나 지정하면 파이프라인의 뉴스 단계가 모의 서버로 요청한다. 부하 시험은 bench_news_load.py.
+"""
+import argparse
+import html
+import json
+import random
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# 기사 본문 문장 (EUC-KR로도 인코딩되는 글자만 사용)
+SENTENCES = [
+    "회사는 올해 영업이익이 전년 대비 크게 늘었다고 밝혔다.",
+    "증권가는 목표주가를 상향 조정했다.",
+    "외국인과 기관이 동반 순매수에 나섰다.",
+    "신규 수주가 이어지며 실적 개선 기대감이 커졌다.",
+    "원자재 가격 상승으로 수익성 악화 우려가 나온다.",
+    "시장에서는 하반기 업황 회복을 점치고 있다.",
+    "거래량이 평소의 세 배 수준으로 늘었다.",
+    "회사 측은 주주환원 정책을 확대하겠다고 말했다.",
+]
+
+
+@dataclass
+class EndpointProfile:
+    """Injected behaviour of one endpoint: latency (+ uniform jitter), error rate (HTTP 500), rate limit (429)."""
+
+    latency_ms: float = 30
+    jitter_ms: float = 10
+    error_rate: float = 0.0
+    rate_limit: float = 0  # 초당 요청 수 (0 = 무제한)
+
+
+@dataclass
+class EndpointStats:
+    requests: int = 0
+    statuses: dict[int, int] = field(default_factory=dict)
+    latencies_ms: list[float] = field(default_factory=list)
+
+
+class _TokenBucket:
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self) -> bool:
+        if self.rate <= 0:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class _Endpoint:
+    def __init__(self, name: str, profile: EndpointProfile, rng: random.Random):
+        self.name = name
+        self.profile = profile
+        self.bucket = _TokenBucket(profile.rate_limit)
+        self.stats = EndpointStats()
+        self.rng = rng
+        self.lock = threading.Lock()
+
+    def admit(self) -> int | None:
+        """Sleep the injected latency; return an error status to send instead of the page, or None."""
+        p = self.profile
+        with self.lock:
+            delay = max(0.0, p.latency_ms + self.rng.uniform(-p.jitter_ms, p.jitter_ms)) / 1000
+            fail = p.error_rate > 0 and self.rng.random() < p.error_rate
+        if not self.bucket.take():
+            return 429
+        time.sleep(delay)
+        return 500 if fail else None
+
+    def record(self, status: int, started: float) -> None:
+        with self.lock:
+            self.stats.requests += 1
+            self.stats.statuses[status] = self.stats.statuses.get(status, 0) + 1
+            self.stats.latencies_ms.append((time.perf_counter() - started) * 1000)
+
+
+def _seeded(*parts) -> random.Random:
+    return random.Random(zlib.crc32("|".join(map(str, parts)).encode("utf-8")))
+
+
+class MockNaver:
+    """
+    Local stand-in for the Naver news endpoints used by src.news_collector.
+
+      {api_base_url}/v1/search/news.json?query=&display=&start=   검색 API (클라이언트 ID/Secret 헤더 필요)
+      {search_base_url}/search.naver?where=news&query=            뉴스 검색 결과 HTML
+      http://127.0.0.1:{port}/article/{id}                         언론사 도메인별 기사 (도메인마다 다른 마크업)
+
+    Results are deterministic per query (articles dated around `date`); latency, errors and rate limits
+    follow the EndpointProfile of each endpoint. Call stats() for per-endpoint counts and latencies.
+    """
+
+    def __init__(
+        self,
+        api: EndpointProfile | None = None,
+        search: EndpointProfile | None = None,
+        domains: dict[str, EndpointProfile] | None = None,
+        date: str = "20250214",
+        articles_per_query: int = 20,
+        port: int = 0,
+        seed: int = 0,
+    ):
+        rng = random.Random(seed)
+        self.date = datetime.strptime(date, "%Y%m%d")
+        self.articles_per_query = articles_per_query
+        self.seed = seed
+        self.port = port
+        self.endpoints = {"api": _Endpoint("api", api or EndpointProfile(), rng), "search": _Endpoint("search", search or EndpointProfile(60, 20), rng)}
+        domains = domains or {"news-a": EndpointProfile(40, 15), "news-b": EndpointProfile(80, 30), "news-c": EndpointProfile(150, 50)}
+        self.domains = list(domains)
+        for name, profile in domains.items():
+            self.endpoints[name] = _Endpoint(name, profile, rng)
+        self._servers: dict[str, ThreadingHTTPServer] = {}
+        self._threads: list[threading.Thread] = []
+
+    # --- 서버 수명 ---
+
+    def start(self) -> "MockNaver":
+        self._serve("main", self.port)
+        for name in self.domains:
+            self._serve(name, 0)
+        return self
+
+    def _serve(self, name: str, port: int) -> None:
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                mock._handle(self, name)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        server.daemon_threads = True
+        thread = threading.Thread(target=server.serve_forever, name=f"mock-naver-{name}", daemon=True)
+        thread.start()
+        self._servers[name] = server
+        self._threads.append(thread)
+
+    def stop(self) -> None:
+        for server in self._servers.values():
+            server.shutdown()
+            server.server_close()
+        self._servers.clear()
+        self._threads.clear()
+
+    def __enter__(self) -> "MockNaver":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def url(self, name: str = "main") -> str:
+        return f"http://127.0.0.1:{self._servers[name].server_address[1]}"
+
+    @property
+    def api_base_url(self) -> str:
+        return self.url()
+
+    @property
+    def search_base_url(self) -> str:
+        return self.url()
+
+    def stats(self) -> dict[str, EndpointStats]:
+        return {name: ep.stats for name, ep in self.endpoints.items()}
+
+    def reset_stats(self) -> None:
+        for ep in self.endpoints.values():
+            with ep.lock:
+                ep.stats = EndpointStats()
+            ep.bucket = _TokenBucket(ep.profile.rate_limit)
+
+    # --- 응답 생성 ---
+
+    def _articles(self, query: str, count: int, start: int = 1) -> list[dict]:
+        out = []
+        for i in range(start - 1, min(start - 1 + count, self.articles_per_query)):
+            rng = _seeded(self.seed, query, i)
+            domain = self.domains[rng.randrange(len(self.domains))]
+            article_id = f"{zlib.crc32(query.encode('utf-8')):08x}{i:03d}"
+            published = self.date + timedelta(days=-(i // 4), hours=-rng.randrange(0, 9), minutes=-rng.randrange(60))
+            out.append({
+                "title": f"<b>{query}</b> {rng.choice(SENTENCES)[:18]}",
+                "originallink": f"{self.url(domain)}/article/{article_id}",
+                "link": f"{self.url(domain)}/article/{article_id}",
+                "description": rng.choice(SENTENCES),
+                "pubDate": published.strftime("%a, %d %b %Y %H:%M:%S +0900"),
+                "_date": published,
+            })
+        return out
+
+    def _api(self, handler, params: dict) -> tuple[int, bytes, str]:
+        if not handler.headers.get("X-Naver-Client-Id") or not handler.headers.get("X-Naver-Client-Secret"):
+            body = {"errorMessage": "NID AUTH Result Invalid (1000) : Authentication failed.", "errorCode": "024"}
+            return 401, json.dumps(body).encode("utf-8"), "application/json; charset=utf-8"
+        query = params.get("query", "")
+        display = min(int(params.get("display", 10) or 10), 100)
+        start = int(params.get("start", 1) or 1)
+        items = [{k: v for k, v in it.items() if not k.startswith("_")} for it in self._articles(query, display, start)]
+        body = {
+            "lastBuildDate": self.date.strftime("%a, %d %b %Y 18:00:00 +0900"),
+            "total": self.articles_per_query,
+            "start": start,
+            "display": len(items),
+            "items": items,
+        }
+        return 200, json.dumps(body, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8"
+
+    def _search(self, params: dict) -> tuple[int, bytes, str]:
+        query = params.get("query", "")
+        parts = [f"<html><head><meta charset='utf-8'><title>{html.escape(query)} : 네이버 뉴스검색</title></head><body>"]
+        parts.append("<ul class='list_news'>")
+        for it in self._articles(query, 10):
+            parts.append(
+                "<li class='bx'><div class='news_wrap'><div class='news_area'>"
+                f"<div class='news_info'><span class='info'>{it['_date'].strftime('%Y.%m.%d.')}</span></div>"
+                f"<a class='news_tit' href='{it['link']}' title='{html.escape(it['title'])}'>{html.escape(it['title'])}</a>"
+                f"<div class='news_dsc'><a class='dsc_txt_wrap'>{html.escape(it['description'])}</a></div>"
+                "</div></div></li>"
+            )
+        parts.append("</ul></body></html>")
+        return 200, "".join(parts).encode("utf-8"), "text/html; charset=utf-8"
+
+    def _article(self, domain: str, path: str) -> tuple[int, bytes, str]:
+        article_id = path.rsplit("/", 1)[-1]
+        rng = _seeded(self.seed, domain, article_id)
+        text = " ".join(rng.choice(SENTENCES) for _ in range(rng.randrange(12, 40)))
+        title = html.escape(rng.choice(SENTENCES))
+        index = self.domains.index(domain) % 3
+        # 도메인마다 다른 본문 선택자·인코딩 (세 번째 유형은 EUC-KR, 문자셋 추정 경로)
+        if index == 0:
+            body = f"<div id='articleBody'><p>{text}</p></div>"
+        elif index == 1:
+            body = f"<div class='article_view'><p>{text}</p><p>기자 이메일</p></div>"
+        else:
+            body = f"<article><h2>{title}</h2><p>{text}</p></article>"
+        charset = "euc-kr" if index == 2 else "utf-8"
+        page = (
+            f"<html><head><meta charset='{charset}'><title>{title}</title>"
+            "<script>var ad = 1;</script><style>p{margin:0}</style></head>"
+            f"<body><header>언론사 {domain}</header>{body}<footer>무단 전재 및 재배포 금지</footer></body></html>"
+        )
+        # EUC-KR 기사는 Content-Type에 문자셋을 싣지 않는 언론사처럼 응답
+        return 200, page.encode(charset), "text/html" if charset == "euc-kr" else "text/html; charset=utf-8"
+
+    def _handle(self, handler: BaseHTTPRequestHandler, server: str) -> None:
+        started = time.perf_counter()
+        url = urlparse(handler.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if server != "main":
+            endpoint = self.endpoints[server]
+            route = (lambda: self._article(server, url.path)) if url.path.startswith("/article/") else None
+        elif url.path == "/v1/search/news.json":
+            endpoint, route = self.endpoints["api"], lambda: self._api(handler, params)
+        elif url.path == "/search.naver":
+            endpoint, route = self.endpoints["search"], lambda: self._search(params)
+        else:
+            endpoint, route = None, None
+        if route is None:
+            status, body, ctype = 404, b"not found", "text/plain"
+        else:
+            error = endpoint.admit()
+            if error == 429:
+                body = {"errorMessage": "Rate limit exceeded. (속도 제한을 초과했습니다.)", "errorCode": "012"}
+                status, body, ctype = 429, json.dumps(body, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8"
+            elif error:
+                status, body, ctype = error, b"internal server error", "text/plain"
+            else:
+                status, body, ctype = route()
+        handler.send_response(status)
+        handler.send_header("Content-Type", ctype)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+        if endpoint is not None:
+            endpoint.record(status, started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="네이버 뉴스 모의 서버")
+    parser.add_argument("--port", type=int, default=8650, help="API·검색 페이지 포트 (기사 도메인은 임의 포트)")
+    parser.add_argument("--date", default="20250214", help="기사 발행일 기준 (YYYYMMDD)")
+    parser.add_argument("--latency-ms", type=float, default=30, help="API 지연")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="모든 엔드포인트 HTTP 500 비율")
+    parser.add_argument("--api-rate-limit", type=float, default=10, help="API 초당 요청 한도 (0=무제한, 초과 시 429)")
+    args = parser.parse_args()
+
+    mock = MockNaver(
+        api=EndpointProfile(args.latency_ms, args.latency_ms / 3, args.error_rate, args.api_rate_limit),
+        search=EndpointProfile(60, 20, args.error_rate),
+        domains={
+            "news-a": EndpointProfile(40, 15, args.error_rate),
+            "news-b": EndpointProfile(80, 30, args.error_rate),
+            "news-c": EndpointProfile(150, 50, args.error_rate),
+        },
+        date=args.date,
+        port=args.port,
+    ).start()
+    print(f"news.api_base_url: {mock.api_base_url}")
+    print(f"news.search_base_url: {mock.search_base_url}")
+    for name in mock.domains:
+        print(f"기사 도메인 {name}: {mock.url(name)}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        mock.stop()
+
+
+if __name__ == "__main__":
+    main()
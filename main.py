@@ -1,20 +1,30 @@
 #!/usr/bin/env python3
 """
 한국 주식 분석·추천 프로그램 CLI 진입점.
-사용법: python main.py [--date YYYY-MM-DD]
+사용법: python main.py [--date YYYY-MM-DD] [--profiles a.yaml b.yaml ...]
+       python main.py serve [--host 127.0.0.1] [--port 8765]
+       python main.py render [--date YYYY-MM-DD] [--profile NAME] [--rankings-only] [--top N]
+       python main.py sketch-backfill --start YYYY-MM-DD --end YYYY-MM-DD
+       python main.py news-search 검색어 [--start YYYY-MM-DD] [--end YYYY-MM-DD] [--ticker 005930 ...]
+       python main.py news-index
+       python main.py ohlcv-backfill --start YYYY-MM-DD --end YYYY-MM-DD [--force]
+       python main.py export-excel --start YYYY-MM-DD --end YYYY-MM-DD [--profile NAME] [--out 파일.xlsx]
+       python main.py discover-themes [--date YYYY-MM-DD]
+       python main.py sector-breadth [--date YYYY-MM-DD]
 --date 생략 시 최근 영업일(또는 어제) 사용.
+--profiles 지정 시 시장 데이터·뉴스를 한 번만 조회해 프로필별로 output/{date}/{profile}/ 에 저장.
+serve: 캐시를 유지하는 상주 프로세스로 로컬 HTTP/JSON API 제공.
+render: 저장된 결과(output/{date}/)만으로 리포트 재생성·랭킹 재출력 (pykrx·스크래핑 모듈 미로드).
+export-excel: 저장된 여러 일자 결과를 하나의 Excel 통합문서로 (스트리밍 기록).
+discover-themes: 로컬 OHLCV 패널의 수익률 상관으로 테마(군집) 재계산·출력 (theme.source: correlation에서 사용).
+sector-breadth: 전종목 업종별 상승/하락 종목 수·거래대금·등락률 중앙값·시총 가중 등락률 (cache/breadth/).
+news-search: 수집 뉴스 전문 검색 색인 조회, news-index: 저장된 output/*/news.csv를 색인에 추가.
+--metrics-file: 실행 지표(단계 시간·외부 호출 지연·캐시 적중·등급 분포)를 Prometheus textfile로 기록 (cron + node-exporter).
+--record/--replay: 외부 호출(pykrx·네이버) 응답을 아카이브로 녹화/재생 (재현 가능한 실행, 네트워크 없는 프로파일링).
 """
 import argparse
-from datetime import datetime, timedelta
 
-from src.pipeline import run_pipeline
-
-
-def get_recent_business_day(dt: datetime) -> str:
-    """Return YYYYMMDD for the most recent weekday (skip weekend)."""
-    while dt.weekday() >= 5:  # 5=Saturday, 6=Sunday
-        dt -= timedelta(days=1)
-    return dt.strftime("%Y%m%d")
+from src.dates import default_target_date, get_recent_business_day, normalize_date  # noqa: F401
 
 
 def parse_args():
@@ -30,21 +40,317 @@ def parse_args():
         action="store_true",
         help="파일 저장 없이 콘솔만 출력",
     )
+    parser.add_argument(
+        "--profiles",
+        nargs="+",
+        default=None,
+        metavar="CONFIG",
+        help="설정 프로필 파일 목록 (config.yaml 대비 변경 항목만 기재 가능). 데이터·뉴스 1회 조회 후 프로필별 실행",
+    )
+    watch_group = parser.add_mutually_exclusive_group()
+    watch_group.add_argument(
+        "--tickers",
+        type=str,
+        default=None,
+        metavar="CODES",
+        help="관심 종목 코드 (쉼표 구분, 예: 005930,000660). 지정 종목만 분석하고 뉴스도 해당 종목만 수집 (output/{date}/watchlist/)",
+    )
+    watch_group.add_argument(
+        "--watchlist",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="관심 종목 파일 (줄마다 종목코드, 쉼표·공백 구분 가능, # 주석)",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help="실행 지표를 Prometheus 텍스트 형식으로 기록 (node-exporter textfile, 예: /var/lib/node_exporter/kstock.prom). 생략 시 metrics.textfile 설정",
+    )
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument(
+        "--record",
+        type=str,
+        default=None,
+        metavar="ARCHIVE",
+        help="외부 호출 응답을 압축 아카이브로 녹화 (예: cassettes/20250214.pkl.gz)",
+    )
+    cassette_group.add_argument(
+        "--replay",
+        type=str,
+        default=None,
+        metavar="ARCHIVE",
+        help="녹화된 아카이브만으로 실행 (네트워크 미사용)",
+    )
+    parser.add_argument("--replay-latency-ms", type=float, default=0.0, help="재생 시 호출당 지연(ms) 모사")
+    parser.add_argument("--replay-jitter-ms", type=float, default=0.0, help="재생 시 추가 무작위 지연 상한(ms)")
+    sub = parser.add_subparsers(dest="command")
+    serve_p = sub.add_parser("serve", help="상주 서버 모드 (캐시 유지 + 로컬 HTTP/JSON API)")
+    serve_p.add_argument("--host", type=str, default="127.0.0.1", help="바인드 주소 (기본 127.0.0.1)")
+    serve_p.add_argument("--port", type=int, default=8765, help="포트 (기본 8765)")
+    serve_p.add_argument("--no-save", action="store_true", help="실행 결과를 파일로 저장하지 않음")
+    render_p = sub.add_parser("render", help="저장된 결과로 리포트 재생성/랭킹 재출력 (네트워크·pykrx 미사용)")
+    render_p.add_argument("--date", type=str, default=argparse.SUPPRESS, help="대상 일자. 생략 시 어제(또는 최근 영업일)")
+    render_p.add_argument("--profile", type=str, default=None, help="프로필 이름 (output/{date}/{profile}/)")
+    render_p.add_argument("--rankings-only", action="store_true", help="랭킹만 출력 (report.html 재생성 안 함)")
+    render_p.add_argument("--top", type=int, default=20, help="출력할 랭킹 수 (기본 20)")
+    sketch_p = sub.add_parser("sketch-backfill", help="기간 내 일자별 업종 PER/PBR 분위 스케치 누적")
+    sketch_p.add_argument("--start", type=str, required=True, help="시작 일자")
+    sketch_p.add_argument("--end", type=str, required=True, help="종료 일자")
+    search_p = sub.add_parser("news-search", help="수집 뉴스 전문 검색 (제목·요약·본문)")
+    search_p.add_argument("query", type=str, help="검색어 (공백으로 구분한 단어 모두 포함, 3글자 이상은 관련도 순·2글자 이하가 있으면 일자 순, 1글자는 전체 스캔)")
+    search_p.add_argument("--start", type=str, default=None, help="시작 일자")
+    search_p.add_argument("--end", type=str, default=None, help="종료 일자")
+    search_p.add_argument("--ticker", nargs="+", default=None, help="종목코드로 제한")
+    search_p.add_argument("--limit", type=int, default=20, help="최대 결과 수 (기본 20)")
+    sub.add_parser("news-index", help="저장된 output/*/news.csv를 검색 색인에 추가")
+    ohlcv_p = sub.add_parser("ohlcv-backfill", help="기간 내 전종목 OHLCV를 로컬 저장소(cache/ohlcv/)에 저장")
+    ohlcv_p.add_argument("--start", type=str, required=True, help="시작 일자")
+    ohlcv_p.add_argument("--end", type=str, required=True, help="종료 일자")
+    ohlcv_p.add_argument("--force", action="store_true", help="기간 내 휴장 표식을 지우고 다시 조회 (KRX 장애로 잘못 기록된 휴장일)")
+    excel_p = sub.add_parser("export-excel", help="저장된 여러 일자 결과를 하나의 Excel 파일로 (일자 열 추가)")
+    excel_p.add_argument("--start", type=str, required=True, help="시작 일자")
+    excel_p.add_argument("--end", type=str, required=True, help="종료 일자")
+    excel_p.add_argument("--profile", type=str, default=None, help="프로필 이름 (output/{date}/{profile}/)")
+    excel_p.add_argument("--out", type=str, default=None, help="출력 파일 (기본 output/report_{start}_{end}.xlsx)")
+    themes_p = sub.add_parser("discover-themes", help="수익률 상관 기반 테마(군집) 재계산 (cache/corr_themes.json)")
+    themes_p.add_argument("--date", type=str, default=None, help="기준 일자 (생략 시 최근 영업일)")
+    history_p = sub.add_parser("history", help="저장된 OHLCV·결과 이력을 압축 프레임으로 읽고 메모리 사용량 출력")
+    history_p.add_argument("--start", type=str, required=True, help="시작 일자")
+    history_p.add_argument("--end", type=str, required=True, help="종료 일자")
+    history_p.add_argument("--tables", type=str, default="ohlcv,screened,ranked,valuation", help="쉼표 구분 (ohlcv/screened/ranked/valuation)")
+    history_p.add_argument("--profile", type=str, default=None, help="프로필 이름 (output/{date}/{profile}/)")
+    history_p.add_argument("--detail", action="store_true", help="열별 형식·메모리 출력")
+    dash_p = sub.add_parser("dashboard", help="저장된 결과로 여러 일자 대시보드 데이터 생성 (output/dashboard/)")
+    dash_p.add_argument("--start", type=str, default=None, help="시작 일자 (기본: 저장된 가장 이른 일자)")
+    dash_p.add_argument("--end", type=str, default=None, help="종료 일자 (기본: 오늘)")
+    dash_p.add_argument("--profile", type=str, default=None, help="프로필 이름 (output/{date}/{profile}/)")
+    dash_p.add_argument("--force", action="store_true", help="변경 없는 일자도 다시 기록")
+    breadth_p = sub.add_parser("sector-breadth", help="업종별 시장 폭 (상승/하락 종목 수·거래대금·등락률)")
+    breadth_p.add_argument("--date", type=str, default=None, help="대상 일자 (생략 시 최근 영업일)")
     return parser.parse_args()
 
 
+def resolve_date(value: str | None) -> str:
+    if not value:
+        return default_target_date()
+    try:
+        return normalize_date(value)
+    except ValueError:
+        raise SystemExit("--date는 YYYY-MM-DD 또는 YYYYMMDD 형식이어야 합니다.")
+
+
+def render(args) -> None:
+    """Cache-only path: only pandas + report are imported."""
+    from src import report
+    from src.daily_diff import load_diff
+    from src.results_store import load_results, result_dir
+
+    target_date = resolve_date(args.date)
+    out_dir = result_dir(target_date, args.profile)
+    try:
+        results = load_results(out_dir)
+    except FileNotFoundError as e:
+        raise SystemExit(str(e))
+    if args.rankings_only:
+        print(f"\n=== 저장된 랭킹 ({target_date}{' / ' + args.profile if args.profile else ''}) ===\n")
+        report.print_rankings(results["ranked"], top_n=args.top)
+        return
+    report.print_console(
+        target_date=target_date,
+        screened=results["screened"],
+        themes_df=results["themes"],
+        valuation_df=results["valuation"],
+        news_df=results["news"],
+        ranked_df=results["ranked"],
+        top_n=args.top,
+    )
+    report.save_html(
+        out_dir,
+        target_date=target_date,
+        screened=results["screened"],
+        themes_df=results["themes"],
+        valuation_df=results["valuation"],
+        news_df=results["news"],
+        ranked_df=results["ranked"],
+        recommended_df=results["recommended"],
+        diff=load_diff(out_dir),
+    )
+
+
+def news_search(args) -> None:
+    from src import news_index
+
+    rows, ms = news_index.timed_search(
+        args.query,
+        start=resolve_date(args.start) if args.start else None,
+        end=resolve_date(args.end) if args.end else None,
+        tickers=args.ticker,
+        limit=args.limit,
+    )
+    print(f"\n=== 뉴스 검색: {args.query} ({len(rows)}건, {ms:.1f}ms) ===\n")
+    for r in rows:
+        print(f"{r['date']}  {r['ticker']} {r['name']}  {r['title']}")
+        if r["snippet"]:
+            print(f"    {r['snippet']}")
+        print(f"    {r['link']}")
+
+
+def export_excel(args) -> None:
+    """Cache-only: multi-day workbook from stored results."""
+    from pathlib import Path
+
+    from src import excel_export
+    from src.results_store import OUTPUT_ROOT
+
+    start, end = resolve_date(args.start), resolve_date(args.end)
+    dates = excel_export.stored_dates(start, end, args.profile)
+    if not dates:
+        raise SystemExit(f"저장된 결과 없음: {start}~{end}")
+    suffix = f"_{args.profile}" if args.profile else ""
+    out = Path(args.out) if args.out else OUTPUT_ROOT / f"report_{start}_{end}{suffix}.xlsx"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    rows = excel_export.write_multi_day(out, dates, args.profile)
+    print(f"Excel 저장: {out} ({len(dates)}일, " + ", ".join(f"{k} {v}행" for k, v in rows.items()) + ")")
+
+
+def discover_themes(args) -> None:
+    from src import corr_themes
+    from src.config_loader import load_config
+
+    target_date = resolve_date(args.date)
+    data = corr_themes.get_clusters(target_date, load_config().get("theme", {}).get("correlation"), force=True)
+    print(f"\n=== 상관 테마 ({data['asof']}, {len(data['clusters'])}개) ===\n")
+    for c in data["clusters"].values():
+        print(f"{c['name']} ({len(c['members'])}종목): {', '.join(c['members'][:10])}")
+
+
+def history(args) -> None:
+    import time
+
+    from src import history_frames
+
+    tables = [t.strip() for t in args.tables.split(",") if t.strip()]
+    unknown = [t for t in tables if t not in history_frames.TABLES]
+    if unknown:
+        raise SystemExit(f"알 수 없는 테이블: {', '.join(unknown)}")
+    start, end = resolve_date(args.start), resolve_date(args.end)
+    t0 = time.perf_counter()
+    hist = history_frames.load_history(start, end, tables, args.profile)
+    print(f"\n=== 이력 프레임 ({start}~{end}, {time.perf_counter() - t0:.1f}초) ===\n")
+    print(hist.report(detail=args.detail))
+
+
+def build_dashboard(args) -> None:
+    from src import dashboard
+
+    start = resolve_date(args.start) if args.start else "00000000"
+    end = resolve_date(args.end)
+    written, skipped = dashboard.build(start, end, args.profile, force=args.force)
+    print(f"대시보드: {written}일 기록, {skipped}일 변경 없음 → {dashboard.dashboard_root() / 'index.html'}")
+
+
 def main():
     args = parse_args()
-    if args.date:
-        raw = args.date.replace("-", "")
-        if len(raw) != 8:
-            raise SystemExit("--date는 YYYY-MM-DD 또는 YYYYMMDD 형식이어야 합니다.")
-        target_date = raw
-    else:
-        yesterday = datetime.now() - timedelta(days=1)
-        target_date = get_recent_business_day(yesterday)
-
-    run_pipeline(target_date=target_date, save_output=not args.no_save)
+    if args.command == "serve":
+        from src.server import serve
+
+        serve(host=args.host, port=args.port, save_output=not args.no_save)
+        return
+    if args.command == "render":
+        render(args)
+        return
+    if args.command == "sketch-backfill":
+        from src import valuation_history
+        from src.config_loader import load_config
+        from src.dates import trading_day_range
+
+        dates = trading_day_range(resolve_date(args.start), resolve_date(args.end))
+        alpha = load_config().get("valuation", {}).get("sketch_alpha", 0.01)
+        added = valuation_history.backfill(dates, alpha=alpha)
+        print(f"스케치 누적 완료: {added}일")
+        return
+    if args.command == "news-search":
+        news_search(args)
+        return
+    if args.command == "ohlcv-backfill":
+        from src import ohlcv_store, trading_calendar
+        from src.dates import trading_day_range, weekday_range
+
+        start, end = resolve_date(args.start), resolve_date(args.end)
+        if args.force:
+            cleared = trading_calendar.clear_closed(weekday_range(start, end))
+            print(f"휴장 표식 {cleared}건 삭제")
+        trading = ohlcv_store.ensure_snapshots(trading_day_range(start, end))
+        panel = ohlcv_store.load_panel()
+        print(f"OHLCV 저장 완료: 거래일 {len(trading)}일 (저장소 전체 {len(panel.dates)}일 × {len(panel.tickers)}종목)")
+        return
+    if args.command == "export-excel":
+        export_excel(args)
+        return
+    if args.command == "discover-themes":
+        discover_themes(args)
+        return
+    if args.command == "history":
+        history(args)
+        return
+    if args.command == "dashboard":
+        build_dashboard(args)
+        return
+    if args.command == "sector-breadth":
+        from src.sector_breadth import get_breadth
+
+        target_date = resolve_date(args.date)
+        df = get_breadth(target_date)
+        if df.empty:
+            raise SystemExit(f"[{target_date}] 시장 데이터 없음")
+        print(f"\n=== 업종별 시장 폭 ({target_date}, {len(df)}개 업종) ===\n")
+        print(df.to_string(index=False))
+        return
+    if args.command == "news-index":
+        from src import news_index
+
+        n = news_index.index_stored_outputs()
+        print(f"뉴스 색인 추가: {n}건 → {news_index.stats()}")
+        return
+
+    import time
+
+    from src import cassette, metrics
+    from src.config_loader import load_config
+    from src.pipeline import read_watchlist, run_pipeline, run_profiles, run_watchlist
+
+    if args.record:
+        cassette.configure("record", args.record)
+    elif args.replay:
+        cassette.configure(
+            "replay", args.replay, latency_ms=args.replay_latency_ms, jitter_ms=args.replay_jitter_ms
+        )
+
+    target_date = resolve_date(args.date)
+    metrics_file = args.metrics_file or load_config().get("metrics", {}).get("textfile")
+    started, status = time.perf_counter(), "failure"
+    try:
+        if args.tickers or args.watchlist:
+            if args.profiles:
+                raise SystemExit("--tickers/--watchlist는 --profiles와 함께 쓸 수 없습니다.")
+            try:
+                tickers = args.tickers.split(",") if args.tickers else read_watchlist(args.watchlist)
+            except FileNotFoundError as e:
+                raise SystemExit(str(e))
+            run_watchlist(target_date=target_date, tickers=[t.strip() for t in tickers if t.strip()], save_output=not args.no_save)
+        elif args.profiles:
+            run_profiles(target_date=target_date, profile_paths=args.profiles, save_output=not args.no_save)
+        else:
+            run_pipeline(target_date=target_date, save_output=not args.no_save)
+        status = "success"
+    finally:
+        cassette.finish()
+        metrics.record_run(status, time.perf_counter() - started)
+        if metrics_file:
+            print(f"지표 저장: {metrics.write_textfile(metrics_file)}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,135 @@
+"""
+외부 호출 녹화/재생(cassette): pykrx·네이버 API·검색·기사 페이지 응답을 압축 아카이브로 저장하고,
+재생 모드에서는 네트워크 없이 아카이브만으로 파이프라인을 실행 (동일 입력 → 동일 출력).
+
+  record: 실제 호출 결과(예외 포함)를 기록, finish() 시 아카이브 저장
+  replay: 아카이브에서만 응답 제공 (없는 호출은 CassetteMiss), 선택적으로 지연 시간 모사
+같은 호출이 여러 번이면(빈 시세 재조회 등) 응답을 호출 순서대로 모두 기록하고 재생도 같은 순서로 제공한다.
+"""
+import gzip
+import json
+import pickle
+import random
+import threading
+import time
+from pathlib import Path
+
+FORMAT_VERSION = 2  # 2: 키마다 호출 순서대로 응답 목록 (1: 키마다 첫 응답 하나)
+
+_mode = "off"  # off | record | replay
+_path: Path | None = None
+_entries: dict[str, list[bytes]] = {}
+_replayed: dict[str, int] = {}  # replay: key -> responses already served
+_latency_ms = 0.0
+_jitter_ms = 0.0
+_lock = threading.Lock()
+
+
+class CassetteMiss(RuntimeError):
+    """Replay mode was asked for a call that is not in the archive."""
+
+
+class _RecordedError:
+    """Marker for an exception raised by the live call (replayed as RuntimeError)."""
+
+    def __init__(self, exc: BaseException):
+        self.type_name = type(exc).__name__
+        self.message = str(exc)
+
+
+def configure(mode: str, path: str | Path | None = None, latency_ms: float = 0.0, jitter_ms: float = 0.0) -> None:
+    """Select off/record/replay. Replay loads the archive immediately."""
+    global _mode, _path, _entries, _replayed, _latency_ms, _jitter_ms
+    if mode not in ("off", "record", "replay"):
+        raise ValueError(f"cassette mode must be off/record/replay: {mode}")
+    if mode != "off" and not path:
+        raise ValueError("record/replay 모드에는 아카이브 경로가 필요합니다.")
+    _mode = mode
+    _path = Path(path) if path else None
+    _latency_ms = float(latency_ms or 0)
+    _jitter_ms = float(jitter_ms or 0)
+    _entries = {}
+    _replayed = {}
+    if mode == "replay":
+        if not _path.exists():
+            raise FileNotFoundError(f"cassette 아카이브 없음: {_path}")
+        with gzip.open(_path, "rb") as f:
+            data = pickle.load(f)
+        if data.get("version") == 1:
+            _entries = {k: [blob] for k, blob in data["entries"].items()}
+        elif data.get("version") == FORMAT_VERSION:
+            _entries = data["entries"]
+        else:
+            raise ValueError(f"지원하지 않는 cassette 버전: {data.get('version')}")
+
+
+def mode() -> str:
+    return _mode
+
+
+def is_replay() -> bool:
+    return _mode == "replay"
+
+
+def _key(kind: str, parts) -> str:
+    return kind + "|" + json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+
+
+def call(kind: str, parts, fetch):
+    """
+    Run an external call through the cassette.
+    kind: endpoint label (e.g. "pykrx.get_market_ohlcv_by_ticker", "http").
+    parts: JSON-serializable arguments identifying the call (must not contain secrets).
+    fetch: zero-arg callable doing the live call.
+    Repeated identical calls are recorded in order; replay serves the n-th recorded answer to the
+    n-th call (the last one again if the replay makes more identical calls than the recording).
+    """
+    if _mode == "off":
+        return fetch()
+    key = _key(kind, parts)
+    if _mode == "replay":
+        with _lock:
+            blobs = _entries.get(key)
+            blob = None
+            if blobs:
+                n = _replayed.get(key, 0)
+                _replayed[key] = n + 1
+                blob = blobs[min(n, len(blobs) - 1)]
+        if blob is None:
+            raise CassetteMiss(f"cassette에 없는 호출: {key[:200]}")
+        if _latency_ms or _jitter_ms:
+            time.sleep((_latency_ms + random.uniform(0, _jitter_ms)) / 1000)
+        value = pickle.loads(blob)
+        if isinstance(value, _RecordedError):
+            raise RuntimeError(f"(replayed {value.type_name}) {value.message}")
+        return value
+    # record
+    try:
+        value = fetch()
+    except Exception as e:
+        with _lock:
+            _entries.setdefault(key, []).append(pickle.dumps(_RecordedError(e)))
+        raise
+    with _lock:
+        _entries.setdefault(key, []).append(pickle.dumps(value))
+    return value
+
+
+def throttle(seconds: float) -> None:
+    """Politeness delay between live requests; skipped in replay (no network is touched)."""
+    if _mode != "replay" and seconds > 0:
+        time.sleep(seconds)
+
+
+def finish() -> None:
+    """Write the archive in record mode (gzip-compressed pickle)."""
+    if _mode != "record" or _path is None:
+        return
+    _path.parent.mkdir(parents=True, exist_ok=True)
+    with _lock:
+        data = {"version": FORMAT_VERSION, "entries": {k: list(v) for k, v in _entries.items()}}
+    tmp = _path.with_name(_path.name + ".tmp")
+    with gzip.open(tmp, "wb", compresslevel=6) as f:
+        pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp.replace(_path)
+    print(f"cassette 저장: {_path} ({sum(len(v) for v in data['entries'].values())}건)")
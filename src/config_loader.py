@@ -1,5 +1,8 @@
 """Load config from config.yaml and .env."""
+import copy
 import os
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 
 import yaml
@@ -9,24 +12,82 @@ from dotenv import load_dotenv
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 load_dotenv(PROJECT_ROOT / ".env")
 
+# 로컬 캐시(스케치·스냅샷 등) 저장 위치
+CACHE_ROOT = PROJECT_ROOT / "cache"
+
 _config = None
+# use_config 재정의는 호출한 스레드에만 적용 (serve 작업 스레드의 프로필이 요청 처리 스레드에 보이지 않도록)
+_local = threading.local()
+
+
+def _read_yaml(path: Path) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
+def _normalize(cfg: dict) -> dict:
+    # Replace numeric literals in YAML (e.g. 5_000_000 is read as int 5000000)
+    for key in ("min_volume", "min_trading_value"):
+        if key in cfg.get("screener", {}):
+            val = cfg["screener"][key]
+            if isinstance(val, str) and "_" in val:
+                cfg["screener"][key] = int(val.replace("_", ""))
+    return cfg
+
+
+def _deep_merge(base: dict, override: dict) -> dict:
+    out = copy.deepcopy(base)
+    for key, val in override.items():
+        if isinstance(val, dict) and isinstance(out.get(key), dict):
+            out[key] = _deep_merge(out[key], val)
+        else:
+            out[key] = copy.deepcopy(val)
+    return out
 
 
 def load_config():
+    override = getattr(_local, "config", None)
+    if override is not None:
+        return override
     global _config
     if _config is None:
-        config_path = PROJECT_ROOT / "config" / "config.yaml"
-        with open(config_path, "r", encoding="utf-8") as f:
-            _config = yaml.safe_load(f)
-        # Replace numeric literals in YAML (e.g. 5_000_000 is read as int 5000000)
-        for key in ("min_volume", "min_trading_value"):
-            if key in _config.get("screener", {}):
-                val = _config["screener"][key]
-                if isinstance(val, str) and "_" in val:
-                    _config["screener"][key] = int(val.replace("_", ""))
+        _config = _normalize(_read_yaml(PROJECT_ROOT / "config" / "config.yaml"))
     return _config
 
 
+def resolve_profile_path(path: str | Path) -> Path:
+    """Return profile path as given, or under config/ when only a file name is passed."""
+    p = Path(path)
+    if not p.exists() and (PROJECT_ROOT / "config" / p).exists():
+        p = PROJECT_ROOT / "config" / p
+    if not p.exists():
+        raise FileNotFoundError(f"프로필 설정 파일 없음: {path}")
+    return p
+
+
+def load_profile(path: str | Path) -> dict:
+    """
+    Load a config profile. Keys in the profile override config/config.yaml,
+    so a profile may contain only the sections it changes.
+    """
+    base = _normalize(_read_yaml(PROJECT_ROOT / "config" / "config.yaml"))
+    return _normalize(_deep_merge(base, _read_yaml(resolve_profile_path(path))))
+
+
+@contextmanager
+def use_config(cfg: dict):
+    """
+    Temporarily make cfg the config returned by load_config() in the calling thread. Other threads keep
+    seeing their own config, so a serve job running a profile does not leak into request handlers.
+    """
+    prev = getattr(_local, "config", None)
+    _local.config = cfg
+    try:
+        yield cfg
+    finally:
+        _local.config = prev
+
+
 def get_naver_credentials():
     return {
         "client_id": os.getenv("NAVER_CLIENT_ID", "").strip(),
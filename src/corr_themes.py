@@ -0,0 +1,226 @@
+"""
+수익률 상관 기반 테마 발굴: 로컬 OHLCV 패널의 최근 N거래일 일간 수익률로 전종목 상관을 블록 단위로 계산,
+상호 k-최근접(상관 >= 기준) 그래프의 연결 요소를 데이터 기반 테마(군집)로 사용.
+군집 결과는 기준일별로 cache/corr_themes.json에 저장하고(최근 MAX_CACHED_ASOF개), 대상일 이전 기준일의
+결과만 재사용한다 (이후 수익률이 섞이지 않도록). refresh_days 거래일이 지나면 대상일 기준으로 전체를 다시
+계산하되 이전 군집과 구성원이 많이 겹치면 같은 번호를 유지한다.
+"""
+import json
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from src import ohlcv_store
+from src.config_loader import CACHE_ROOT
+
+CLUSTER_PATH = CACHE_ROOT / "corr_themes.json"
+MAX_CACHED_ASOF = 32
+
+DEFAULTS = {
+    "window_days": 120,
+    "min_history_ratio": 0.8,
+    "min_avg_trading_value": 1_000_000_000,
+    "neighbors": 10,
+    "min_corr": 0.5,
+    "min_cluster_size": 3,
+    "refresh_days": 5,
+    "block_size": 512,
+}
+
+
+def _params(cfg: dict | None) -> dict:
+    p = dict(DEFAULTS)
+    p.update({k: v for k, v in (cfg or {}).items() if k in DEFAULTS})
+    p["min_avg_trading_value"] = float(str(p["min_avg_trading_value"]).replace("_", ""))
+    return p
+
+
+def _mean_valid(a: np.ndarray) -> np.ndarray:
+    """Column means over finite values (NaN for columns without any)."""
+    count = np.isfinite(a).sum(axis=0)
+    return np.where(count > 0, np.nansum(a, axis=0) / np.maximum(count, 1), np.nan)
+
+
+def standardized_returns(close: np.ndarray, min_valid: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    close: (days, tickers). Returns (z, keep): z is (days-1, kept tickers) log returns standardized per
+    column with missing days set to 0, so z.T @ z / rows approximates the correlation matrix.
+    """
+    with np.errstate(invalid="ignore", divide="ignore"):
+        r = np.diff(np.log(np.where(close > 0, close, np.nan)), axis=0)
+    valid = np.isfinite(r)
+    keep = valid.sum(axis=0) >= min_valid
+    r, valid = r[:, keep], valid[:, keep]
+    n = valid.sum(axis=0)
+    mean = np.where(valid, r, 0).sum(axis=0) / n
+    dev = np.where(valid, r - mean, 0)
+    std = np.sqrt((dev ** 2).sum(axis=0) / n)
+    keep_idx = np.flatnonzero(keep)
+    ok = std > 0
+    return (dev[:, ok] / std[ok]).astype(np.float32), keep_idx[ok]
+
+
+def mutual_knn_edges(z: np.ndarray, k: int, min_corr: float, block_size: int) -> np.ndarray:
+    """
+    Edges (i, j), i < j, where j is among i's k most correlated peers and vice versa (corr >= min_corr).
+    Correlations are computed block_size rows at a time: memory O(block_size × tickers).
+    """
+    rows, n = z.shape
+    k = min(k, n - 1)
+    if k <= 0:
+        return np.empty((0, 2), dtype=np.int64)
+    nbr = np.full((n, k), -1, dtype=np.int64)
+    for start in range(0, n, block_size):
+        stop = min(n, start + block_size)
+        corr = z[:, start:stop].T @ z / rows  # (block, n)
+        corr[np.arange(stop - start), np.arange(start, stop)] = -np.inf  # 자기 자신 제외
+        top = np.argpartition(-corr, k - 1, axis=1)[:, :k]
+        top_corr = np.take_along_axis(corr, top, axis=1)
+        nbr[start:stop] = np.where(top_corr >= min_corr, top, -1)
+    src = np.repeat(np.arange(n), k)
+    dst = nbr.ravel()
+    ok = dst >= 0
+    pairs = np.stack([src[ok], dst[ok]], axis=1)
+    # 상호 최근접만: (i, j)와 (j, i)가 모두 있는 쌍
+    key = pairs[:, 0] * n + pairs[:, 1]
+    rev = pairs[:, 1] * n + pairs[:, 0]
+    mutual = pairs[np.isin(key, rev) & (pairs[:, 0] < pairs[:, 1])]
+    return mutual
+
+
+def connected_components(n: int, edges: np.ndarray) -> np.ndarray:
+    """Component label per node (union-find with path halving)."""
+    parent = np.arange(n)
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for a, b in edges:
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            parent[max(ra, rb)] = min(ra, rb)
+    return np.array([find(i) for i in range(n)])
+
+
+def _stable_ids(clusters: list[list[str]], previous: dict[str, list[str]]) -> list[int]:
+    """Reuse a previous cluster id when Jaccard overlap >= 0.3 (largest clusters matched first)."""
+    prev_sets = {int(cid): set(m) for cid, m in previous.items()}
+    next_id = max(prev_sets, default=0) + 1
+    ids, taken = [], set()
+    for members in clusters:
+        s = set(members)
+        best, best_j = None, 0.3
+        for cid, ps in prev_sets.items():
+            if cid in taken:
+                continue
+            j = len(s & ps) / len(s | ps)
+            if j >= best_j:
+                best, best_j = cid, j
+        if best is None:
+            best, next_id = next_id, next_id + 1
+        taken.add(best)
+        ids.append(best)
+    return ids
+
+
+def discover(asof: str, cfg: dict | None = None, previous: dict | None = None) -> dict:
+    """
+    Cluster the market on returns up to asof (a stored trading day). Returns the cache payload:
+    {"asof", "params", "clusters": {id: {"name", "members"}}}.
+    """
+    p = _params(cfg)
+    window = p["window_days"] + 1
+    ohlcv_store.ensure_snapshots(ohlcv_store.calendar_window(asof, window))
+    panel = ohlcv_store.load_panel()
+    if panel.row(asof) < 0:
+        raise RuntimeError(f"OHLCV 저장소에 거래일 없음: {asof}")
+    close = panel.window("close", asof, window)
+    value = panel.window("trading_value", asof, window)
+    liquid = np.nan_to_num(_mean_valid(value)) >= p["min_avg_trading_value"]
+    cols = np.flatnonzero(liquid & np.isfinite(close[-1]))
+    cols = cols[np.argsort(panel.tickers.to_numpy()[cols], kind="stable")]  # 패널 열 순서와 무관하게 종목코드 순
+    z, keep = standardized_returns(close[:, cols], int((window - 1) * p["min_history_ratio"]))
+    cols = cols[keep]
+    tickers = panel.tickers.to_numpy()[cols]
+
+    edges = mutual_knn_edges(z, p["neighbors"], p["min_corr"], p["block_size"])
+    labels = connected_components(len(cols), edges)
+    sizes = Counter(labels.tolist())
+    groups: dict[int, list[int]] = {}
+    for i, lab in enumerate(labels):
+        if sizes[lab] >= p["min_cluster_size"]:
+            groups.setdefault(lab, []).append(i)
+    avg_value = _mean_valid(value[:, cols])
+    ordered = sorted(groups.values(), key=len, reverse=True)
+    members = [[tickers[i] for i in sorted(g, key=lambda i: -avg_value[i])] for g in ordered]
+    prev_members = {cid: c["members"] for cid, c in (previous or {}).get("clusters", {}).items()}
+    ids = _stable_ids(members, prev_members)
+
+    # 군집 이름: 구성원 최다 KRX 업종 · 평균 거래대금 1위 종목
+    from src.universe import TickerUniverse
+
+    universe = TickerUniverse.build(asof)
+    clusters = {}
+    for cid, mem in zip(ids, members):
+        pos = universe.positions(mem)
+        pos = pos[pos >= 0]
+        sectors = [s for s in universe.sectors_at(pos) if isinstance(s, str)]
+        sector = Counter(sectors).most_common(1)[0][0] if sectors else "기타"
+        leader = universe.names_at(pos[:1])[0] if len(pos) else mem[0]
+        clusters[str(cid)] = {"name": f"[C{cid}] {sector}·{leader}", "members": mem}
+    print(f"[{asof}] 상관 테마 {len(clusters)}개 (대상 {len(cols)}종목, 군집 포함 {sum(len(m) for m in members)}종목)")
+    return {"asof": asof, "params": p, "clusters": clusters}
+
+
+def _load_cache() -> list[dict]:
+    """Cached payloads, one per asof (the older single-payload file becomes one entry)."""
+    if not CLUSTER_PATH.exists():
+        return []
+    data = json.loads(CLUSTER_PATH.read_text(encoding="utf-8"))
+    return data["entries"] if "entries" in data else [data]
+
+
+def _save_cache(entries: list[dict]) -> None:
+    entries = sorted(entries, key=lambda e: e["asof"])[-MAX_CACHED_ASOF:]
+    CLUSTER_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = CLUSTER_PATH.with_name(CLUSTER_PATH.name + ".tmp")
+    tmp.write_text(json.dumps({"entries": entries}, ensure_ascii=False), encoding="utf-8")
+    tmp.replace(CLUSTER_PATH)
+
+
+def get_clusters(target_date: str, cfg: dict | None = None, force: bool = False) -> dict:
+    """
+    Clusters for target_date. Reuses the latest cached clustering as of target_date or earlier (never a
+    later one: it saw returns after target_date) when it is fewer than refresh_days weekdays old and its
+    parameters match; otherwise recomputes as of target_date and adds it to the cache.
+    """
+    p = _params(cfg)
+    entries = _load_cache()
+    same = sorted((e for e in entries if e.get("params") == p), key=lambda e: e["asof"])
+    earlier = [e for e in same if e["asof"] <= target_date]
+    if earlier and not force:
+        cached = earlier[-1]
+        gap = int(np.busday_count(pd.Timestamp(cached["asof"]).date(), pd.Timestamp(target_date).date()))  # 평일 수 (휴장일 포함 근사)
+        if gap < p["refresh_days"]:
+            return cached
+    # 군집 번호는 가장 가까운 기준일 결과에서 이어받음 (번호만 맞추므로 이후 기준일이어도 무방)
+    nearest = min(same, key=lambda e: abs(pd.Timestamp(e["asof"]) - pd.Timestamp(target_date)), default=None)
+    data = discover(target_date, cfg, previous=nearest)
+    _save_cache([e for e in entries if e["asof"] != target_date] + [data])
+    return data
+
+
+def cluster_taxonomy(target_date: str, cfg: dict | None = None):
+    """Clusters as a ThemeTaxonomy (each ticker in at most one theme) for run_theme_analyzer."""
+    from src.theme_taxonomy import ThemeTaxonomy
+
+    clusters = get_clusters(target_date, cfg)["clusters"]
+    themes, tickers = [], []
+    for c in clusters.values():
+        themes += [c["name"]] * len(c["members"])
+        tickers += c["members"]
+    return ThemeTaxonomy.from_pairs(themes, pd.Index(tickers, dtype=object))
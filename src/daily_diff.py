@@ -0,0 +1,158 @@
+"""
+전일 대비 변화: 저장된 직전 결과(output/{이전 일자}[/{profile}]/)와 당일 결과를 키(종목코드·업종)로 조인해
+신규 진입·이탈, 등급 상향·하향, 주도 테마 순위 변동, 밸류에이션 라벨 변경을 계산하고 diff.json으로 저장.
+이전 일자는 다시 실행하지 않고 저장된 CSV에서 필요한 열만 읽는다.
+"""
+import json
+from pathlib import Path
+
+import pandas as pd
+
+from src.results_store import OUTPUT_ROOT, RESULT_FILES, read_result_csv, result_slot
+
+DIFF_FILE = "diff.json"
+GRADES = "ABCDEF"
+
+
+def find_previous(target_date: str, out_dir: Path) -> tuple[str, Path] | None:
+    """
+    (date, directory) of the most recent stored result before target_date for the same output slot
+    (output/{date}/ or output/{date}/{profile}/). None when out_dir is outside output/{target_date}/
+    or nothing earlier is stored.
+    """
+    slot = result_slot(target_date, out_dir)
+    root = OUTPUT_ROOT.resolve()
+    if slot is None or not root.exists():
+        return None
+    dates = sorted((p.name for p in root.iterdir() if p.name.isdigit() and len(p.name) == 8 and p.name < target_date), reverse=True)
+    for date in dates:
+        prev_dir = root / date / slot
+        if (prev_dir / RESULT_FILES["ranked"]).exists():
+            return date, prev_dir
+    return None
+
+
+def _records(df: pd.DataFrame) -> list[dict]:
+    return [{k: (None if pd.isna(v) else v) for k, v in row.items()} for row in df.to_dict("records")]
+
+
+def _grade_index(grades: pd.Series) -> pd.Series:
+    return grades.map({g: i for i, g in enumerate(GRADES)})
+
+
+def rank_changes(ranked: pd.DataFrame, prev: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    """Entries, exits and grade changes from an outer join on ticker."""
+    cur = ranked[["ticker", "name", "grade", "score_total"]]
+    old = prev[["ticker", "grade", "score_total"] + (["name"] if "name" in prev.columns else [])]
+    joined = cur.merge(old, on="ticker", how="outer", suffixes=("", "_prev"), indicator=True)
+    if "name_prev" in joined.columns:
+        joined["name"] = joined["name"].fillna(joined["name_prev"])
+    entries = joined[joined["_merge"] == "left_only"].sort_values("score_total", ascending=False)
+    exits = joined[joined["_merge"] == "right_only"].sort_values("score_total_prev", ascending=False)
+    both = joined[joined["_merge"] == "both"].copy()
+    both["grade_change"] = _grade_index(both["grade_prev"]) - _grade_index(both["grade"])  # 양수 = 상향
+    both["score_change"] = (both["score_total"] - both["score_total_prev"]).round(2)
+    changed = both[both["grade_change"] != 0].sort_values(["grade_change", "score_change"], ascending=False)
+    return {
+        "entries": entries.assign(score_total=entries["score_total"].round(2))[["ticker", "name", "grade", "score_total"]],
+        "exits": exits.rename(columns={"grade_prev": "prev_grade"})[["ticker", "name", "prev_grade"]],
+        "grade_changes": changed.rename(columns={"grade_prev": "prev_grade"})[
+            ["ticker", "name", "prev_grade", "grade", "score_change"]
+        ],
+    }
+
+
+def sector_moves(themes: pd.DataFrame, prev: pd.DataFrame) -> pd.DataFrame:
+    """Theme/sector rank (row order) today vs before: rank, prev_rank, change (positive = moved up)."""
+    cur = pd.DataFrame({"sector": themes["sector"].to_numpy(), "rank": range(1, len(themes) + 1)})
+    old = pd.DataFrame({"sector": prev["sector"].to_numpy(), "prev_rank": range(1, len(prev) + 1)})
+    joined = cur.merge(old, on="sector", how="outer")
+    joined["change"] = joined["prev_rank"] - joined["rank"]
+    moved = joined[joined["change"].fillna(1) != 0]  # 신규·이탈(순위 없음)도 포함
+    return moved.sort_values(["rank", "prev_rank"], na_position="last").astype(
+        {"rank": "Int64", "prev_rank": "Int64", "change": "Int64"}
+    )
+
+
+def valuation_flips(valuation: pd.DataFrame, prev: pd.DataFrame) -> pd.DataFrame:
+    """Stocks in both days whose valuation_label changed."""
+    joined = valuation[["ticker", "valuation_label"]].merge(
+        prev[["ticker", "valuation_label"]], on="ticker", suffixes=("", "_prev")
+    )
+    flips = joined[joined["valuation_label"] != joined["valuation_label_prev"]]
+    return flips.rename(columns={"valuation_label_prev": "prev_label", "valuation_label": "label"})[
+        ["ticker", "prev_label", "label"]
+    ].sort_values("ticker")
+
+
+def compute_diff(target_date: str, results: dict, prev_date: str, prev_dir: Path) -> dict:
+    """Structured diff of today's result frames against the stored results in prev_dir."""
+    prev_ranked = read_result_csv(prev_dir / RESULT_FILES["ranked"], ["ticker", "name", "grade", "score_total"])
+    prev_themes = read_result_csv(prev_dir / RESULT_FILES["themes"], ["sector"])
+    prev_val = read_result_csv(prev_dir / RESULT_FILES["valuation"], ["ticker", "valuation_label"])
+
+    ranked = results["ranked"]
+    changes = rank_changes(ranked, prev_ranked) if prev_ranked is not None and "grade" in prev_ranked.columns else None
+    themes, valuation = results["themes"], results["valuation"]
+    moves = (
+        sector_moves(themes, prev_themes)
+        if prev_themes is not None and "sector" in prev_themes.columns and "sector" in themes.columns
+        else None
+    )
+    flips = (
+        valuation_flips(valuation, prev_val)
+        if prev_val is not None and "valuation_label" in prev_val.columns and "valuation_label" in valuation.columns
+        else None
+    )
+    if flips is not None and not flips.empty:
+        names = ranked.set_index("ticker")["name"]
+        flips.insert(1, "name", flips["ticker"].map(names))
+
+    empty = pd.DataFrame()
+    changes = changes or {"entries": empty, "exits": empty, "grade_changes": empty}
+    moves = empty if moves is None else moves
+    flips = empty if flips is None else flips
+    gc = changes["grade_changes"]
+    steps = _grade_index(gc["prev_grade"]) - _grade_index(gc["grade"]) if not gc.empty else pd.Series(dtype=int)
+    new_a = (
+        (changes["entries"]["grade"] == "A").sum() if not changes["entries"].empty else 0
+    ) + ((gc["grade"] == "A").sum() if not gc.empty else 0)
+    return {
+        "date": target_date,
+        "previous_date": prev_date,
+        "summary": {
+            "entries": len(changes["entries"]),
+            "exits": len(changes["exits"]),
+            "upgrades": int((steps > 0).sum()),
+            "downgrades": int((steps < 0).sum()),
+            "new_a": int(new_a),
+            "sector_moves": len(moves),
+            "valuation_flips": len(flips),
+        },
+        "entries": _records(changes["entries"]),
+        "exits": _records(changes["exits"]),
+        "grade_changes": _records(gc),
+        "sectors": _records(moves),
+        "valuation_flips": _records(flips),
+    }
+
+
+def write_diff(out_dir: Path, diff: dict) -> Path:
+    path = Path(out_dir) / DIFF_FILE
+    path.write_text(json.dumps(diff, ensure_ascii=False, separators=(",", ":"), default=int), encoding="utf-8")
+    return path
+
+
+def load_diff(out_dir: Path) -> dict | None:
+    """Stored diff.json for a result directory (render), or None."""
+    path = Path(out_dir) / DIFF_FILE
+    return json.loads(path.read_text(encoding="utf-8")) if path.exists() else None
+
+
+def summary_line(diff: dict) -> str:
+    s = diff["summary"]
+    return (
+        f"[전일 대비 {diff['previous_date']}] 신규 {s['entries']} · 제외 {s['exits']} · 상향 {s['upgrades']} · "
+        f"하향 {s['downgrades']} · 신규 A {s['new_a']} · 테마 순위 변동 {s['sector_moves']} · "
+        f"밸류 라벨 변경 {s['valuation_flips']}"
+    )
@@ -0,0 +1,391 @@
+"""
+여러 일자 대시보드: output/dashboard/에 정적 index.html 한 장과 일자별 데이터 조각(shard)을 쓴다.
+조각은 표 하나(랭킹·주도 테마·밸류에이션·뉴스·전일 대비)의 열 단위 JSON을 kstockShard(...) 호출로 감싼 .js 파일로,
+페이지가 필요한 일자·표만 <script>로 불러온다 (file://로 열어도 동작). 정렬·필터·페이지 나누기는 브라우저에서 한다.
+새 일자는 그 일자의 조각만 쓰고 목록(manifest.json → index.js)에 한 줄을 갱신한다.
+"""
+import json
+import os
+import re
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.results_store import OUTPUT_ROOT, RESULT_FILES, load_results, result_dir, result_slot
+
+NEWS_COLUMNS = ["ticker", "name", "news_title", "news_link", "news_date", "summary"]
+_TAG_RE = re.compile(r"<[^>]+>")
+
+_lock = threading.Lock()
+
+
+def dashboard_root() -> Path:
+    return OUTPUT_ROOT / "dashboard"
+
+
+def _slot_name(slot) -> str:
+    """"" for the day's main result, else the profile / watchlist directory name."""
+    return "" if slot is None or str(slot) in ("", ".") else str(slot)
+
+
+def _shard_key(date: str, slot: str, table: str) -> str:
+    return f"{date}/{slot}/{table}" if slot else f"{date}/{table}"
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    tmp.replace(path)
+
+
+def columnar(df: pd.DataFrame) -> dict:
+    """{"columns": [...], "values": [[column 0 values], ...]}: floats rounded to 4 places, NaN -> null."""
+    values = []
+    for col in df.columns:
+        s = df[col]
+        if s.dtype.kind == "f":
+            arr = np.round(s.to_numpy(dtype=np.float64), 4)
+            values.append([None if np.isnan(v) else (int(v) if v.is_integer() else v) for v in arr.tolist()])
+        else:
+            values.append([None if pd.isna(v) else v for v in s.tolist()])
+    return {"columns": [str(c) for c in df.columns], "values": values}
+
+
+def _news_frame(news_df: pd.DataFrame) -> pd.DataFrame:
+    """One row per article: tags stripped, body summary (or the description) as summary."""
+    if news_df is None or news_df.empty:
+        return pd.DataFrame(columns=NEWS_COLUMNS)
+    out = pd.DataFrame(index=news_df.index)
+    for col in NEWS_COLUMNS[:-1]:
+        out[col] = news_df[col].fillna("").astype(str) if col in news_df.columns else ""
+    out["news_title"] = out["news_title"].str.replace(_TAG_RE, "", regex=True)
+    body = news_df.get("news_body_summary", pd.Series("", index=news_df.index)).fillna("").astype(str)
+    desc = news_df.get("news_summary", pd.Series("", index=news_df.index)).fillna("").astype(str)
+    out["summary"] = body.where(body.ne("") & body.ne("(요약 없음)"), desc).str.replace(_TAG_RE, "", regex=True)
+    if "sentiment" in news_df.columns:
+        out["sentiment"] = news_df["sentiment"]
+    return out.reset_index(drop=True)
+
+
+def _valuation_frame(valuation_df: pd.DataFrame, screened: pd.DataFrame) -> pd.DataFrame:
+    """Valuation with the stock name next to the ticker."""
+    if valuation_df is None or valuation_df.empty or screened is None or "name" not in screened.columns:
+        return valuation_df if valuation_df is not None else pd.DataFrame()
+    names = screened.drop_duplicates("ticker").set_index("ticker")["name"]
+    out = valuation_df.copy()
+    out.insert(1, "name", out["ticker"].map(names).fillna(""))
+    return out
+
+
+def write_day(target_date: str, results: dict, slot: str = "", diff: dict | None = None) -> dict:
+    """Write one day's shards and update the manifest and index.js. Returns the manifest entry."""
+    root = dashboard_root()
+    slot = _slot_name(slot)
+    ranked = results.get("ranked")
+    tables = {
+        "ranked": ranked if ranked is not None else pd.DataFrame(),
+        "themes": results.get("themes") if results.get("themes") is not None else pd.DataFrame(),
+        "valuation": _valuation_frame(results.get("valuation"), results.get("screened")),
+        "news": _news_frame(results.get("news")),
+    }
+    shards = {}
+    for table, df in tables.items():
+        key = _shard_key(target_date, slot, table)
+        payload = json.dumps(columnar(df), ensure_ascii=False, separators=(",", ":"), default=str)
+        _write_atomic(root / "data" / f"{key}.js", f"kstockShard({json.dumps(key)},{payload});\n")
+        shards[table] = len(df)
+    if diff:
+        key = _shard_key(target_date, slot, "diff")
+        payload = json.dumps(diff, ensure_ascii=False, separators=(",", ":"), default=int)
+        _write_atomic(root / "data" / f"{key}.js", f"kstockShard({json.dumps(key)},{payload});\n")
+        shards["diff"] = diff["summary"]["entries"] + diff["summary"]["exits"]
+
+    grades = ranked["grade"].value_counts() if ranked is not None and "grade" in ranked.columns else pd.Series(dtype=int)
+    themes = tables["themes"]
+    source = result_dir(target_date, slot or None) / RESULT_FILES["ranked"]
+    entry = {
+        "date": target_date,
+        "slot": slot,
+        "shards": shards,
+        "grades": {g: int(grades.get(g, 0)) for g in "ABCDEF"},
+        "top_theme": str(themes["sector"].iloc[0]) if not themes.empty and "sector" in themes.columns else "",
+        "source_mtime": source.stat().st_mtime_ns if source.exists() else 0,
+    }
+    with _lock:
+        manifest = _read_manifest(root)
+        days = [d for d in manifest["days"] if (d["date"], d["slot"]) != (target_date, slot)]
+        entry["version"] = max((d.get("version", 0) for d in manifest["days"]), default=0) + 1
+        days.append(entry)
+        manifest["days"] = sorted(days, key=lambda d: (d["date"], d["slot"]), reverse=True)
+        _write_index(root, manifest)
+    return entry
+
+
+def _read_manifest(root: Path) -> dict:
+    path = root / "manifest.json"
+    if path.exists():
+        return json.loads(path.read_text(encoding="utf-8"))
+    return {"days": []}
+
+
+def _write_index(root: Path, manifest: dict) -> None:
+    """manifest.json (read back by the next update) and index.js (the page's day list) plus the page itself."""
+    _write_atomic(root / "manifest.json", json.dumps(manifest, ensure_ascii=False, separators=(",", ":")))
+    days = [{k: v for k, v in d.items() if k != "source_mtime"} for d in manifest["days"]]
+    _write_atomic(root / "index.js", "kstockIndex(" + json.dumps(days, ensure_ascii=False, separators=(",", ":")) + ");\n")
+    page = root / "index.html"
+    if not page.exists() or page.read_text(encoding="utf-8") != PAGE:
+        _write_atomic(page, PAGE)
+
+
+def update_day(target_date: str, results: dict, out_dir: Path, diff: dict | None = None) -> dict | None:
+    """Pipeline hook: shards for a result saved in out_dir (skipped when out_dir is outside output/{date}/)."""
+    slot = result_slot(target_date, out_dir)
+    if slot is None:
+        return None
+    return write_day(target_date, results, str(slot), diff)
+
+
+def build(start: str, end: str, profile: str | None = None, force: bool = False) -> tuple[int, int]:
+    """
+    Shards for every stored day in [start, end] (profile: output/{date}/{profile}/). Days whose ranked.csv
+    has not changed since their shards were written are skipped unless force. Returns (written, skipped).
+    """
+    from src.daily_diff import load_diff
+    from src.excel_export import stored_dates
+
+    slot = _slot_name(profile)
+    done = {
+        (d["date"], d["slot"]): d.get("source_mtime", 0)
+        for d in _read_manifest(dashboard_root())["days"]
+    }
+    written = skipped = 0
+    for date in stored_dates(start, end, profile):
+        out_dir = result_dir(date, profile)
+        mtime = (out_dir / RESULT_FILES["ranked"]).stat().st_mtime_ns
+        if not force and done.get((date, slot)) == mtime:
+            skipped += 1
+            continue
+        write_day(date, load_results(out_dir), slot, load_diff(out_dir))
+        written += 1
+    return written, skipped
+
+
+PAGE = """<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8"><title>한국 주식 분석 대시보드</title>
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<style>
+body{font-family:Malgun Gothic,sans-serif;margin:0;background:#f0f2f5;color:#333}
+header{background:#37474f;color:#fff;padding:12px 20px;display:flex;flex-wrap:wrap;gap:12px;align-items:center}
+header h1{font-size:1.2em;margin:0 12px 0 0}
+header select,header button,header input{font-size:0.95em;padding:4px 8px}
+main{max-width:1300px;margin:0 auto;padding:16px}
+.cards{display:flex;flex-wrap:wrap;gap:10px;margin-bottom:12px}
+.card{background:#fff;border:1px solid #e0e0e0;border-radius:8px;padding:10px 16px;min-width:110px}
+.card strong{display:block;font-size:1.3em}
+.tabs{display:flex;gap:4px;margin-bottom:0}
+.tabs button{border:1px solid #ccc;border-bottom:none;background:#e8eaed;padding:8px 14px;cursor:pointer;border-radius:6px 6px 0 0}
+.tabs button.active{background:#fff;font-weight:bold}
+.panel{background:#fff;border:1px solid #ccc;padding:12px;border-radius:0 6px 6px 6px}
+.controls{display:flex;flex-wrap:wrap;gap:8px;align-items:center;margin-bottom:8px}
+table{width:100%;border-collapse:collapse;font-size:0.9em}
+th,td{border:1px solid #ddd;padding:6px 8px;text-align:left;vertical-align:top}
+th{background:#37474f;color:#fff;cursor:pointer;white-space:nowrap;user-select:none}
+tbody tr:nth-child(even){background:#f5f5f5}
+td.num{text-align:right;white-space:nowrap}
+.up{color:#c62828}.down{color:#1565c0}
+.pager{margin-top:8px;display:flex;gap:8px;align-items:center}
+.muted{color:#777;font-size:0.9em}
+.summary{color:#555;font-size:0.92em;max-width:560px}
+</style></head><body>
+<header><h1>한국 주식 분석 대시보드</h1>
+<button id="prev" title="이전 일자">◀</button><select id="date"></select><button id="next" title="다음 일자">▶</button>
+<select id="slot"></select>
+<input id="ticker" placeholder="종목코드 이력 (예: 005930)" size="22"><button id="history">이력</button>
+</header>
+<main><div class="cards" id="cards"></div>
+<div class="tabs" id="tabs"></div>
+<div class="panel"><div class="controls">
+<input id="filter" placeholder="필터 (모든 열)" size="28"><select id="grade"><option value="">전체 등급</option></select>
+<label class="muted">행 수 <select id="size"><option>25</option><option selected>50</option><option>100</option><option>500</option></select></label>
+<span class="muted" id="status"></span></div>
+<div id="table"></div><div class="pager" id="pager"></div></div></main>
+<script>
+const TABS = [["ranked","A~F 랭크"],["themes","주도 테마"],["valuation","밸류에이션"],["news","뉴스"],["diff","전일 대비"]];
+const CHANGE_COLS = new Set(["change_pct","change","score_change"]);
+const MAX_HISTORY_DAYS = 60;
+const shards = {}, waiting = {};
+let days = [], state = {date: "", slot: "", tab: "ranked", sort: null, desc: true, page: 0, rows: [], columns: []};
+
+window.kstockShard = (key, data) => { shards[key] = data; (waiting[key] || []).forEach(f => f[0](data)); delete waiting[key]; };
+window.kstockIndex = list => { days = list; initIndex(); };
+
+function loadScript(src, onerror) {
+  const s = document.createElement("script"); s.src = src; s.onerror = onerror; document.head.appendChild(s);
+}
+function loadShard(key, version) {
+  if (shards[key]) return Promise.resolve(shards[key]);
+  return new Promise((resolve, reject) => {
+    if (waiting[key]) { waiting[key].push([resolve, reject]); return; }
+    waiting[key] = [[resolve, reject]];
+    loadScript("data/" + key + ".js?v=" + version, () => { (waiting[key] || []).forEach(f => f[1](new Error(key))); delete waiting[key]; });
+  });
+}
+function esc(v) { return String(v).replace(/[&<>"']/g, c => ({"&":"&amp;","<":"&lt;",">":"&gt;","\\"":"&quot;","'":"&#39;"}[c])); }
+function key(date, slot, table) { return slot ? `${date}/${slot}/${table}` : `${date}/${table}`; }
+function entry() { return days.find(d => d.date === state.date && d.slot === state.slot); }
+
+function initIndex() {
+  const slots = [...new Set(days.map(d => d.slot))];
+  const slotSel = document.getElementById("slot");
+  slotSel.innerHTML = slots.map(s => `<option value="${esc(s)}">${s ? esc(s) : "기본"}</option>`).join("");
+  slotSel.style.display = slots.length > 1 ? "" : "none";
+  const params = new URLSearchParams(location.hash.slice(1));
+  state.slot = params.get("slot") ?? (slots.includes("") ? "" : slots[0] || "");
+  slotSel.value = state.slot;
+  fillDates(params.get("date"));
+  state.tab = params.get("tab") || "ranked";
+  show();
+}
+function fillDates(selected) {
+  const list = days.filter(d => d.slot === state.slot);
+  const sel = document.getElementById("date");
+  sel.innerHTML = list.map(d => `<option>${d.date}</option>`).join("");
+  state.date = list.some(d => d.date === selected) ? selected : (list[0] ? list[0].date : "");
+  sel.value = state.date;
+}
+function cards(e) {
+  const g = e.grades || {};
+  const items = [["랭크 종목", e.shards.ranked ?? 0], ["A등급", g.A || 0], ["B등급", g.B || 0], ["주도 테마", e.top_theme || "-"], ["뉴스", e.shards.news ?? 0]];
+  document.getElementById("cards").innerHTML = items.map(([k, v]) => `<div class="card">${k}<strong>${esc(v)}</strong></div>`).join("");
+}
+function tabs(e) {
+  document.getElementById("tabs").innerHTML = TABS.filter(([t]) => t in e.shards)
+    .concat(state.tab === "history" ? [["history", "종목 이력"]] : [])
+    .map(([t, label]) => `<button data-tab="${t}" class="${t === state.tab ? "active" : ""}">${label}</button>`).join("");
+}
+async function show() {
+  const e = entry();
+  if (!e) { document.getElementById("status").textContent = "저장된 일자 없음"; return; }
+  location.hash = new URLSearchParams({date: state.date, slot: state.slot, tab: state.tab}).toString();
+  cards(e);
+  if (state.tab !== "history" && !(state.tab in e.shards)) state.tab = "ranked";
+  tabs(e);
+  document.getElementById("status").textContent = "불러오는 중...";
+  try {
+    if (state.tab === "history") await loadHistory(document.getElementById("ticker").value.trim());
+    else if (state.tab === "diff") setDiff(await loadShard(key(state.date, state.slot, "diff"), e.version));
+    else setTable(await loadShard(key(state.date, state.slot, state.tab), e.version));
+  } catch (err) {
+    state.columns = []; state.rows = [];
+    document.getElementById("status").textContent = "불러오기 실패: " + err.message;
+  }
+  render();
+}
+function setTable(shard) {
+  state.columns = shard.columns;
+  const n = shard.values.length ? shard.values[0].length : 0;
+  state.rows = Array.from({length: n}, (_, i) => shard.values.map(col => col[i]));
+}
+function setDiff(d) {
+  const rows = [];
+  const add = (kind, list, fmt) => list.forEach(r => rows.push([kind, r.ticker ?? "", r.name ?? r.sector ?? "", fmt(r)]));
+  add("신규", d.entries, r => `${r.grade} (${r.score_total})`);
+  add("제외", d.exits, r => `이전 ${r.prev_grade}`);
+  add("등급 변경", d.grade_changes, r => `${r.prev_grade} → ${r.grade} (${r.score_change > 0 ? "+" : ""}${r.score_change})`);
+  add("테마 순위", d.sectors, r => `${r.prev_rank ?? "-"} → ${r.rank ?? "-"}`);
+  add("밸류 라벨", d.valuation_flips, r => `${r.prev_label} → ${r.label}`);
+  state.columns = ["구분", "ticker", "name", `변화 (${d.previous_date} → ${d.date})`];
+  state.rows = rows;
+}
+async function loadHistory(ticker) {
+  const list = days.filter(d => d.slot === state.slot && "ranked" in d.shards).slice(0, MAX_HISTORY_DAYS);
+  const shardsLoaded = await Promise.all(list.map(d => loadShard(key(d.date, d.slot, "ranked"), d.version).catch(() => null)));
+  const cols = ["date", "grade", "score_total", "change_pct", "sector", "theme_rank", "news_count"];
+  state.columns = cols; state.rows = [];
+  shardsLoaded.forEach((s, i) => {
+    if (!s) return;
+    const t = s.columns.indexOf("ticker"), idx = s.values[t].indexOf(ticker);
+    if (idx < 0) return;
+    state.rows.push(cols.map(c => c === "date" ? list[i].date : (s.columns.includes(c) ? s.values[s.columns.indexOf(c)][idx] : null)));
+  });
+}
+function visibleRows() {
+  const f = document.getElementById("filter").value.trim().toLowerCase();
+  const grade = document.getElementById("grade").value;
+  const gi = state.columns.indexOf("grade");
+  let rows = state.rows;
+  if (grade && gi >= 0) rows = rows.filter(r => r[gi] === grade);
+  if (f) rows = rows.filter(r => r.some(v => v !== null && String(v).toLowerCase().includes(f)));
+  if (state.sort !== null) {
+    const i = state.sort, dir = state.desc ? -1 : 1;
+    rows = rows.slice().sort((a, b) => {
+      const x = a[i], y = b[i];
+      if (x === null || x === "") return 1;
+      if (y === null || y === "") return -1;
+      return (typeof x === "number" && typeof y === "number" ? x - y : String(x).localeCompare(String(y), "ko")) * dir;
+    });
+  }
+  return rows;
+}
+function cell(col, v, row) {
+  if (v === null || v === undefined) return "<td></td>";
+  if (col === "news_title") {
+    const link = row[state.columns.indexOf("news_link")];
+    return `<td><a href="${esc(link || "#")}" target="_blank" rel="noopener">${esc(v)}</a></td>`;
+  }
+  if (typeof v === "number") {
+    const cls = CHANGE_COLS.has(col) ? (v > 0 ? " up" : v < 0 ? " down" : "") : "";
+    return `<td class="num${cls}">${Number.isInteger(v) ? v.toLocaleString() : v.toFixed(2)}</td>`;
+  }
+  return `<td${col === "summary" ? ' class="summary"' : ""}>${esc(v)}</td>`;
+}
+function render() {
+  const gradeSel = document.getElementById("grade");
+  gradeSel.style.display = state.columns.includes("grade") && state.tab !== "history" ? "" : "none";
+  const rows = visibleRows(), size = +document.getElementById("size").value;
+  const pages = Math.max(1, Math.ceil(rows.length / size));
+  state.page = Math.min(state.page, pages - 1);
+  const hidden = new Set(["news_link"]);
+  const cols = state.columns.map((c, i) => [c, i]).filter(([c]) => !hidden.has(c));
+  const head = cols.map(([c, i]) => `<th data-col="${i}">${esc(c)}${state.sort === i ? (state.desc ? " ▼" : " ▲") : ""}</th>`).join("");
+  const body = rows.slice(state.page * size, (state.page + 1) * size)
+    .map(r => "<tr>" + cols.map(([c, i]) => cell(c, r[i], r)).join("") + "</tr>").join("");
+  document.getElementById("table").innerHTML = state.columns.length
+    ? `<table><thead><tr>${head}</tr></thead><tbody>${body}</tbody></table>` : "";
+  document.getElementById("pager").innerHTML = `<button data-page="-1">이전</button><span>${state.page + 1} / ${pages}</span>` +
+    `<button data-page="1">다음</button><span class="muted">${rows.length.toLocaleString()}행 (전체 ${state.rows.length.toLocaleString()})</span>`;
+  if (document.getElementById("status").textContent === "불러오는 중...") document.getElementById("status").textContent = "";
+}
+function step(delta) {
+  const list = days.filter(d => d.slot === state.slot).map(d => d.date);
+  const i = list.indexOf(state.date) - delta;
+  if (i >= 0 && i < list.length) { state.date = list[i]; document.getElementById("date").value = state.date; state.page = 0; show(); }
+}
+
+"ABCDEF".split("").forEach(g => document.getElementById("grade").insertAdjacentHTML("beforeend", `<option>${g}</option>`));
+document.getElementById("date").onchange = e => { state.date = e.target.value; state.page = 0; show(); };
+document.getElementById("slot").onchange = e => { state.slot = e.target.value; fillDates(state.date); state.page = 0; show(); };
+document.getElementById("prev").onclick = () => step(-1);
+document.getElementById("next").onclick = () => step(1);
+document.getElementById("history").onclick = () => { state.tab = "history"; state.sort = null; state.page = 0; show(); };
+document.getElementById("tabs").onclick = e => {
+  const t = e.target.dataset.tab;
+  if (t && t !== state.tab) { state.tab = t; state.sort = null; state.page = 0; document.getElementById("filter").value = ""; show(); }
+};
+document.getElementById("table").onclick = e => {
+  const th = e.target.closest("th");
+  if (!th) return;
+  const i = +th.dataset.col;
+  state.desc = state.sort === i ? !state.desc : true; state.sort = i; render();
+};
+document.getElementById("pager").onclick = e => { const d = +e.target.dataset.page; if (d) { state.page += d; if (state.page < 0) state.page = 0; render(); } };
+document.getElementById("filter").oninput = () => { state.page = 0; render(); };
+document.getElementById("grade").onchange = () => { state.page = 0; render(); };
+document.getElementById("size").onchange = () => { state.page = 0; render(); };
+loadScript("index.js?t=" + Date.now(), () => { document.getElementById("status").textContent = "index.js 없음"; });
+</script></body></html>
+"""
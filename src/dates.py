@@ -0,0 +1,46 @@
+"""
+대상 일자 해석: YYYY-MM-DD/YYYYMMDD 입력 정규화, 기본 일자(직전 거래일) 계산.
+거래일 판정은 src.trading_calendar (주말·KRX 휴장일 제외)
+"""
+from datetime import datetime, timedelta
+
+
+def get_recent_business_day(dt: datetime) -> str:
+    """Return YYYYMMDD for the most recent weekday (skip weekend)."""
+    while dt.weekday() >= 5:  # 5=Saturday, 6=Sunday
+        dt -= timedelta(days=1)
+    return dt.strftime("%Y%m%d")
+
+
+def normalize_date(value: str) -> str:
+    """YYYY-MM-DD or YYYYMMDD -> YYYYMMDD. Raises ValueError on bad format."""
+    raw = str(value).strip().replace("-", "")
+    if len(raw) != 8 or not raw.isdigit():
+        raise ValueError("날짜는 YYYY-MM-DD 또는 YYYYMMDD 형식이어야 합니다.")
+    return raw
+
+
+def default_target_date() -> str:
+    """Yesterday, or the most recent KRX trading day before it."""
+    from src.trading_calendar import previous_trading_day
+
+    return previous_trading_day((datetime.now() - timedelta(days=1)).strftime("%Y%m%d"))
+
+
+def trading_day_range(start: str, end: str) -> list[str]:
+    """KRX trading days from start to end inclusive (YYYYMMDD); known holidays are skipped."""
+    from src.trading_calendar import trading_days
+
+    return trading_days(start, end)
+
+
+def weekday_range(start: str, end: str) -> list[str]:
+    """Weekdays from start to end inclusive (YYYYMMDD)."""
+    d = datetime.strptime(start, "%Y%m%d")
+    last = datetime.strptime(end, "%Y%m%d")
+    out = []
+    while d <= last:
+        if d.weekday() < 5:
+            out.append(d.strftime("%Y%m%d"))
+        d += timedelta(days=1)
+    return out
@@ -0,0 +1,156 @@
+"""
+스트리밍 Excel 출력: openpyxl write-only 통합문서로 행을 청크 단위로 기록해 메모리 사용을 일정하게 유지.
+열 타입(정수·실수·문자열·날짜) 유지, 헤더 행 고정, 종목코드는 텍스트 서식(@)으로 앞자리 0 보존.
+여러 일자 통합문서는 저장된 결과(output/{date}/)를 일자 순으로 읽어 시트별로 이어 쓴다.
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+CHUNK_ROWS = 5000
+TEXT_COLUMNS = ("ticker",)
+MAX_COL_WIDTH = 60
+
+# (시트 이름, 결과 키) — report.save_excel과 같은 순서
+SHEETS = [
+    ("Ranked", "ranked"),
+    ("Themes", "themes"),
+    ("Valuation", "valuation"),
+    ("Screened", "screened"),
+    ("News", "news"),
+]
+
+
+def _column_values(s: pd.Series) -> list:
+    """Python values for one column chunk (NaN -> None, numpy scalars -> int/float/datetime)."""
+    kind = s.dtype.kind
+    if kind in "iub":
+        return s.tolist()
+    if kind == "f":
+        return s.astype(object).where(s.notna(), None).tolist()
+    if kind == "M":
+        return [None if pd.isna(v) else v for v in s.dt.to_pydatetime()]
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+    return [
+        None if v is None or (isinstance(v, float) and np.isnan(v))
+        else ILLEGAL_CHARACTERS_RE.sub("", v) if isinstance(v, str)
+        else v
+        for v in s.tolist()
+    ]
+
+
+class _SheetWriter:
+    """Appends DataFrame chunks with the same columns to one write-only worksheet."""
+
+    def __init__(self, wb, title: str, columns: list[str], sample: pd.DataFrame):
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font
+        from openpyxl.utils import get_column_letter
+
+        self._cell = WriteOnlyCell
+        self.ws = wb.create_sheet(title=title)
+        self.columns = columns
+        self.text_cols = [i for i, c in enumerate(columns) if c in TEXT_COLUMNS]
+        # 열 너비·헤더 고정은 첫 행 기록 전에 설정해야 함 (write-only)
+        for i, col in enumerate(columns, start=1):
+            width = len(str(col))
+            if col in sample.columns and not sample.empty:
+                width = max(width, int(sample[col].astype(str).str.len().max()))
+            self.ws.column_dimensions[get_column_letter(i)].width = min(MAX_COL_WIDTH, width + 2)
+        self.ws.freeze_panes = "A2"
+        bold = Font(bold=True)
+        header = []
+        for col in columns:
+            c = WriteOnlyCell(self.ws, value=str(col))
+            c.font = bold
+            header.append(c)
+        self.ws.append(header)
+
+    def append(self, df: pd.DataFrame) -> int:
+        for start in range(0, len(df), CHUNK_ROWS):
+            chunk = df.iloc[start : start + CHUNK_ROWS]
+            cols = [_column_values(chunk[c]) if c in chunk.columns else [None] * len(chunk) for c in self.columns]
+            for i in self.text_cols:
+                cols[i] = [self._text_cell(v) for v in cols[i]]
+            for row in zip(*cols):
+                self.ws.append(row)
+        return len(df)
+
+    def _text_cell(self, value):
+        c = self._cell(self.ws, value=None if value is None else str(value))
+        c.number_format = "@"
+        return c
+
+
+def _new_workbook():
+    from openpyxl import Workbook
+
+    return Workbook(write_only=True)
+
+
+def write_frames(path: Path, sheets: list[tuple[str, pd.DataFrame]]) -> None:
+    """One sheet per (title, frame); rows are streamed, never the whole workbook in memory."""
+    wb = _new_workbook()
+    for title, df in sheets:
+        df = df if df is not None else pd.DataFrame()
+        _SheetWriter(wb, title, [str(c) for c in df.columns], df.head(200)).append(df)
+    tmp = path.with_name(path.name + ".tmp")
+    wb.save(tmp)
+    tmp.replace(path)
+
+
+def stored_dates(start: str, end: str, profile: str | None = None) -> list[str]:
+    """Dates in [start, end] (YYYYMMDD) with a stored ranked.csv."""
+    from src.results_store import OUTPUT_ROOT, RESULT_FILES, result_dir
+
+    if not OUTPUT_ROOT.exists():
+        return []
+    return [
+        d.name
+        for d in sorted(OUTPUT_ROOT.iterdir())
+        if d.is_dir() and d.name.isdigit() and len(d.name) == 8 and start <= d.name <= end
+        and (result_dir(d.name, profile) / RESULT_FILES["ranked"]).exists()
+    ]
+
+
+def _sample(path: Path) -> pd.DataFrame:
+    """Header and first rows of a stored CSV (for sheet columns and widths)."""
+    if not path.exists() or not path.stat().st_size:
+        return pd.DataFrame()
+    return pd.read_csv(path, nrows=200, dtype={"ticker": str}, encoding="utf-8-sig")
+
+
+def write_multi_day(path: Path, dates: list[str], profile: str | None = None) -> dict[str, int]:
+    """
+    One workbook over several stored days: each sheet holds every day's rows with a leading date column.
+    Stored CSVs are read one at a time, so memory stays at one day's table.
+    Returns rows written per sheet.
+    """
+    from datetime import datetime
+
+    from src.results_store import RESULT_FILES, read_result_csv, result_dir
+
+    wb = _new_workbook()
+    rows = {}
+    for title, key in SHEETS:
+        # 시트 열 구성은 일자별 CSV 헤더의 합집합 (첫 등장 순서)
+        samples = [_sample(result_dir(d, profile) / RESULT_FILES[key]) for d in dates]
+        columns = ["date"]
+        for df in samples:
+            columns += [str(c) for c in df.columns if c not in columns]
+        sample = next((df for df in samples if not df.empty), pd.DataFrame())
+        writer = _SheetWriter(wb, title, columns, sample)
+        n = 0
+        for date in dates:
+            df = read_result_csv(result_dir(date, profile) / RESULT_FILES[key])
+            if df is None or df.empty:
+                continue
+            df.insert(0, "date", datetime.strptime(date, "%Y%m%d").date())
+            n += writer.append(df)
+        rows[key] = n
+    tmp = path.with_name(path.name + ".tmp")
+    wb.save(tmp)
+    tmp.replace(path)
+    return rows
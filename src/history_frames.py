@@ -0,0 +1,265 @@
+"""
+다년간 이력 프레임의 압축 메모리 배치: 저장된 전종목 OHLCV 스냅샷과 일자별 결과(screened·ranked·valuation)를
+일자×종목 긴 형식 프레임으로 읽어 분석용으로 메모리에 둔다.
+종목코드는 모든 프레임이 공유하는 사전(TickerDictionary)의 int32 번호로, 종목명은 사전에만 한 번 보관하고,
+업종·시장·등급·밸류 라벨·일자는 범주형, 가격·거래량 등 숫자는 값을 잃지 않는 가장 좁은 형식으로 바꾼다.
+"""
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from src import ohlcv_store
+from src.results_store import RESULT_FILES, read_result_csv, result_dir
+from src.universe import normalize_tickers
+
+TABLES = ("ohlcv", "screened", "ranked", "valuation")
+GRADES = ["A", "B", "C", "D", "E", "F"]
+# 반복되는 문자열 열 → 범주형 (그 밖의 문자열 열도 범주형으로 보관)
+CATEGORY_COLUMNS = ("sector", "market", "grade", "valuation_label")
+# float32로 정수를 정확히 표현할 수 있는 상한 (결측이 있는 정수 열)
+FLOAT32_EXACT = 2**24
+TARGET_MB = 1024
+
+
+class TickerDictionary:
+    """
+    Shared ticker code <-> int32 id mapping. Ids are assigned in first-seen order and never change,
+    so frames loaded with the same dictionary join on plain integer columns. Names are kept once per id.
+    """
+
+    def __init__(self):
+        self._ids: dict[str, int] = {}
+        self._codes: list[str] = []
+        self.names: dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def encode(self, tickers) -> np.ndarray:
+        """int32 ids for ticker codes (new codes are added)."""
+        uniq, inverse = np.unique(np.asarray(normalize_tickers(tickers), dtype="U6"), return_inverse=True)
+        mapped = np.empty(len(uniq), dtype=np.int32)
+        for i, code in enumerate(uniq.tolist()):
+            tid = self._ids.get(code)
+            if tid is None:
+                tid = self._ids[code] = len(self._codes)
+                self._codes.append(code)
+            mapped[i] = tid
+        return mapped[inverse.reshape(-1)]
+
+    def decode(self, ids) -> np.ndarray:
+        """6-char ticker codes for ids."""
+        return np.asarray(self._codes, dtype="U6")[np.asarray(ids)]
+
+    def set_names(self, ids: np.ndarray, names) -> None:
+        """Remember stock names (the latest non-empty name per id wins)."""
+        for tid, name in zip(ids.tolist(), names):
+            if isinstance(name, str) and name:
+                self.names[tid] = name
+
+    def name_of(self, ids) -> np.ndarray:
+        return np.array([self.names.get(i, "") for i in np.asarray(ids).tolist()], dtype=object)
+
+    def nbytes(self) -> int:
+        return len(self._codes) * (np.dtype("U6").itemsize + 8) + sum(len(n) * 4 for n in self.names.values())
+
+
+def _int_dtype(lo, hi) -> np.dtype:
+    for dt in (np.int8, np.int16, np.int32, np.int64):
+        info = np.iinfo(dt)
+        if info.min <= lo and hi <= info.max:
+            return np.dtype(dt)
+    return np.dtype(np.float64)
+
+
+def narrow(values: np.ndarray) -> np.ndarray:
+    """
+    Narrowest dtype that keeps every value: whole numbers -> smallest signed int (float32 when there are
+    NaNs and all values fit in 2**24, else float64); fractional values -> float32 (stored ratios and
+    scores carry at most a few decimals).
+    """
+    values = np.asarray(values)
+    if values.dtype.kind in "iu":
+        return values.astype(_int_dtype(values.min(), values.max())) if len(values) else values
+    if values.dtype.kind != "f":
+        return values
+    finite = np.isfinite(values)
+    v = values[finite]
+    if not len(v):
+        return values.astype(np.float32)
+    if np.array_equal(v, np.round(v)):
+        lo, hi = v.min(), v.max()
+        if finite.all():
+            return values.astype(_int_dtype(lo, hi))
+        return values.astype(np.float32) if max(abs(lo), abs(hi)) <= FLOAT32_EXACT else values
+    return values.astype(np.float32)
+
+
+def _text(values) -> pd.Series:
+    """Values as object strings (NaN kept): a text column read as float on a day where it is all empty."""
+    s = pd.Series(values, dtype=object)
+    return s.where(s.isna(), s.astype(str))
+
+
+def _category(values) -> pd.Categorical:
+    if values.dtype != object:
+        values = _text(values.to_numpy()).rename(values.name)
+    return pd.Categorical(values, categories=GRADES, ordered=True) if values.name == "grade" else pd.Categorical(values)
+
+
+def compact_columns(df: pd.DataFrame, dictionary: TickerDictionary) -> dict:
+    """
+    Compact columns of one frame: ticker -> ticker_id (int32, names go to the dictionary), string columns ->
+    categoricals, numerics unchanged (narrowed once after concatenation so every day gets the same dtype).
+    """
+    out = {}
+    ids = None
+    if "ticker" in df.columns:
+        ids = out["ticker_id"] = dictionary.encode(df["ticker"])
+    for col in df.columns:
+        s = df[col]
+        if col in ("ticker", "date"):
+            continue
+        if col == "name":
+            if ids is not None:
+                dictionary.set_names(ids, s.tolist())
+            continue
+        if col in CATEGORY_COLUMNS or s.dtype == object:
+            out[col] = _category(s)
+        else:
+            out[col] = s.to_numpy()
+    return out
+
+
+def _as_category(values, n: int, sample: pd.Categorical) -> pd.Categorical:
+    """Categorical piece for a day whose column is missing (None) or was read as numbers (e.g. all NaN)."""
+    text = _text([None] * n if values is None else values)
+    if sample.ordered or not text.notna().any():
+        # 순서 있는 범주(등급)는 같은 범주로, 값이 없으면 같은 형식의 빈 범주로
+        categories = sample.categories if sample.ordered else sample.categories[:0]
+        return pd.Categorical(text, categories=categories, ordered=sample.ordered)
+    return pd.Categorical(text)
+
+
+def _combine(parts: list[dict], lengths: list[int], dates: list[str]) -> pd.DataFrame:
+    """Concatenate per-day column dicts; date becomes an ordered categorical, numerics are narrowed."""
+    out = {
+        "date": pd.Categorical.from_codes(
+            np.repeat(np.arange(len(dates)), lengths), categories=dates, ordered=True
+        )
+    }
+    columns = list(dict.fromkeys(c for p in parts for c in p))
+    for col in columns:
+        pieces = [p.pop(col, None) for p in parts]
+        sample = next((x for x in pieces if isinstance(x, pd.Categorical)), None)
+        if sample is not None:
+            # 텍스트 열이 어떤 일자에 모두 비어 있으면 read_csv가 float로 읽으므로 그 일자 조각도 범주형으로 맞춤
+            filled = [x if isinstance(x, pd.Categorical) else _as_category(x, n, sample) for x, n in zip(pieces, lengths)]
+            out[col] = union_categoricals(filled, sort_categories=not sample.ordered)
+        elif col == "ticker_id":
+            out[col] = np.concatenate(pieces).astype(np.int32)
+        else:
+            filled = [x if x is not None else np.full(n, np.nan) for x, n in zip(pieces, lengths)]
+            out[col] = narrow(np.concatenate(filled))
+    return pd.DataFrame(out, copy=False)
+
+
+def compact(df: pd.DataFrame, dictionary: TickerDictionary) -> pd.DataFrame:
+    """Compact a single long frame (e.g. in-memory pipeline results); a `date` column becomes an ordered categorical."""
+    frame = _combine([compact_columns(df, dictionary)], [len(df)], [""])
+    if "date" not in df.columns:
+        return frame.drop(columns="date")
+    keys = df["date"].astype(str)
+    frame["date"] = pd.Categorical(keys, categories=sorted(keys.unique()), ordered=True)
+    return frame
+
+
+def load_ohlcv(dictionary: TickerDictionary, start: str, end: str) -> pd.DataFrame:
+    """Every stored all-market OHLCV day in [start, end] as one long compact frame."""
+    dates = [d for d, trading in ohlcv_store.stored_days().items() if trading and start <= d <= end]
+    parts, lengths = [], []
+    for d in dates:
+        snap = ohlcv_store.load_snapshot(d)
+        cols = {"ticker_id": dictionary.encode(snap["tickers"])}
+        cols.update({f: snap[f] for f in ohlcv_store.FIELDS if f in snap})
+        parts.append(cols)
+        lengths.append(len(snap["tickers"]))
+    return _combine(parts, lengths, dates)
+
+
+def load_results(dictionary: TickerDictionary, table: str, start: str, end: str, profile: str | None = None) -> pd.DataFrame:
+    """Stored result table (screened/ranked/valuation/...) for every stored day in [start, end]."""
+    from src.excel_export import stored_dates
+
+    parts, lengths, dates = [], [], []
+    for d in stored_dates(start, end, profile):
+        df = read_result_csv(result_dir(d, profile) / RESULT_FILES[table])
+        if df is None or df.empty:
+            continue
+        parts.append(compact_columns(df, dictionary))
+        lengths.append(len(df))
+        dates.append(d)
+    return _combine(parts, lengths, dates)
+
+
+class History:
+    """Compact multi-day frames (ohlcv / screened / ranked / valuation) sharing one TickerDictionary."""
+
+    def __init__(self, dictionary: TickerDictionary, frames: dict[str, pd.DataFrame]):
+        self.dictionary = dictionary
+        self.frames = frames
+
+    def __getitem__(self, table: str) -> pd.DataFrame:
+        return self.frames[table]
+
+    def decode(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Copy of frame with ticker / name string columns in place of ticker_id (for display)."""
+        ids = frame["ticker_id"].to_numpy()
+        out = frame.drop(columns="ticker_id")
+        out.insert(1, "ticker", self.dictionary.decode(ids))
+        out.insert(2, "name", self.dictionary.name_of(ids))
+        return out
+
+    def memory_usage(self) -> pd.DataFrame:
+        """Bytes per (frame, column) with dtypes (deep, i.e. including categories)."""
+        rows = []
+        for table, df in self.frames.items():
+            usage = df.memory_usage(deep=True, index=True)
+            for col, nbytes in usage.items():
+                dtype = "index" if col == "Index" else str(df[col].dtype)
+                rows.append({"frame": table, "column": col, "dtype": dtype, "bytes": int(nbytes)})
+        rows.append({"frame": "dictionary", "column": "ticker/name", "dtype": "", "bytes": self.dictionary.nbytes()})
+        return pd.DataFrame(rows)
+
+    def report(self, target_mb: float = TARGET_MB, detail: bool = False) -> str:
+        """Footprint per frame (rows, MB, bytes/row), total vs target, and a 5y x 2,500-ticker OHLCV estimate."""
+        usage = self.memory_usage()
+        lines = [f"{'프레임':<12}{'행':>11}{'MB':>10}{'행당 B':>9}"]
+        for table, df in self.frames.items():
+            nbytes = usage.loc[usage["frame"] == table, "bytes"].sum()
+            per_row = nbytes / len(df) if len(df) else 0
+            lines.append(f"{table:<12}{len(df):>11,}{nbytes / 2**20:>10.1f}{per_row:>9.1f}")
+            if detail:
+                for _, r in usage[usage["frame"] == table].iterrows():
+                    lines.append(f"  {r['column']:<20}{r['dtype']:<12}{r['bytes'] / 2**20:>9.2f} MB")
+        total = usage["bytes"].sum() / 2**20
+        lines.append(f"{'종목 사전':<12}{len(self.dictionary):>11,}{self.dictionary.nbytes() / 2**20:>10.2f}")
+        lines.append(f"합계 {total:.1f} MB (목표 {target_mb:,.0f} MB {'이하' if total <= target_mb else '초과'})")
+        ohlcv = self.frames.get("ohlcv")
+        if ohlcv is not None and len(ohlcv):
+            per_row = usage.loc[usage["frame"] == "ohlcv", "bytes"].sum() / len(ohlcv)
+            est = per_row * 1250 * 2500 / 2**20
+            lines.append(f"OHLCV 5년×2,500종목(312.5만 행) 추정: {est:.0f} MB (행당 {per_row:.1f} B)")
+        return "\n".join(lines)
+
+
+def load_history(start: str, end: str, tables=TABLES, profile: str | None = None) -> History:
+    """Load the requested tables for [start, end] into compact frames with one shared ticker dictionary."""
+    dictionary = TickerDictionary()
+    frames = {}
+    for table in tables:
+        if table == "ohlcv":
+            frames[table] = load_ohlcv(dictionary, start, end)
+        else:
+            frames[table] = load_results(dictionary, table, start, end, profile)
+    return History(dictionary, frames)
@@ -0,0 +1,66 @@
+"""
+HTTP GET 공통 경로: 모든 외부 HTTP 호출을 cassette(녹화/재생)를 거쳐 수행.
+응답은 직렬화 가능한 HttpResponse로 돌려준다 (requests.Response 대체).
+"""
+import json
+from dataclasses import dataclass
+from functools import cached_property
+from urllib.parse import urlparse
+
+from src import cassette, metrics
+
+
+@dataclass
+class HttpResponse:
+    url: str
+    status_code: int
+    content: bytes
+    encoding: str | None = None
+
+    @cached_property
+    def apparent_encoding(self) -> str | None:
+        """Detected charset of content (same detector requests uses)."""
+        from charset_normalizer import from_bytes
+
+        best = from_bytes(self.content).best()
+        return best.encoding if best else None
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}: {self.url}")
+
+
+def get(
+    url: str,
+    headers: dict | None = None,
+    params: dict | None = None,
+    timeout: float = 10,
+    allow_redirects: bool = True,
+) -> HttpResponse:
+    """
+    GET url. Headers are not part of the cassette key (they carry API credentials),
+    so recorded archives never contain the Naver client id/secret.
+    Latency is recorded per host (external_call_duration_seconds{endpoint="http:<host>"}).
+    """
+    def fetch() -> HttpResponse:
+        import requests
+
+        r = requests.get(url, headers=headers, params=params, timeout=timeout, allow_redirects=allow_redirects)
+        return HttpResponse(
+            url=r.url,
+            status_code=r.status_code,
+            content=r.content,
+            encoding=r.encoding,
+        )
+
+    with metrics.track_call("http:" + urlparse(url).netloc) as call:
+        response = cassette.call("http", {"url": url, "params": params or {}}, fetch)
+        call.error = response.status_code >= 400
+    return response
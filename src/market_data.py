@@ -0,0 +1,342 @@
+"""
+시장 데이터 조회: 제공자(market_providers: pykrx 기본, FinanceDataReader 보조) 호출을 한곳에 모으고
+일자별로 메모리 캐시 (같은 프로세스에서 여러 프로필/단계가 동일 일자를 조회할 때 KRX 재호출 방지).
+호출마다 제한 시간을 두고, 주 제공자가 늦으면 보조 제공자에 동시 요청(hedge)하며, 모두 실패하면
+마지막 성공 스냅샷(cache/market_snapshots/)을 사용하고 리포트에 표시한다 (stale_notes).
+지난 일자 전종목 조회의 빈 응답도 실패로 보며, 제한 시간을 넘겨 계속 도는 호출 수는
+market_data.max_abandoned_calls로 제한한다 (넘으면 새 호출 없이 스냅샷 사용).
+"""
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+
+import pandas as pd
+
+from src import cassette, metrics
+from src.config_loader import CACHE_ROOT, load_config
+from src.market_providers import get_provider
+
+SNAPSHOT_DIR = CACHE_ROOT / "market_snapshots"
+
+# 장시간 실행(serve)에서도 메모리가 무한히 늘지 않도록 캐시별 최대 항목 수 제한 (LRU)
+MAX_CACHED_KEYS = 40
+
+_ohlcv_cache: OrderedDict = OrderedDict()
+_fundamental_cache: OrderedDict = OrderedDict()
+_sector_cache: OrderedDict = OrderedDict()
+_name_cache: dict[str, str] = {}
+_lock = threading.RLock()
+# (method, args) -> (served snapshot date, reason, time.monotonic() when served) for frames served
+# from an older snapshot. Cached stale frames are dropped after market_data.stale_retry_seconds
+_stale: dict[tuple, tuple[str, str, float]] = {}
+_executor: ThreadPoolExecutor | None = None
+POOL_WORKERS = 8
+# 전종목 조회 (첫 인자가 일자): 지난 일자의 빈 응답은 실패로 처리
+ALL_MARKET_METHODS = frozenset({"ohlcv", "fundamental", "sector_classifications"})
+# 제한 시간을 넘겨 아직 스레드에서 진행 중인 호출 수
+_abandoned = 0
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            # 제한 시간을 넘긴 호출은 스레드에서 계속 진행되므로 여유 있게 (개수는 max_abandoned_calls로 제한)
+            _executor = ThreadPoolExecutor(max_workers=POOL_WORKERS, thread_name_prefix="market-data")
+        return _executor
+
+
+def _submit(provider, method: str, args: tuple, max_abandoned: int):
+    """Run the provider call on the pool; None while max_abandoned timed-out calls still hold threads."""
+    with _lock:
+        if _abandoned >= max_abandoned:
+            return None
+    return _pool().submit(getattr(provider, method), *args)
+
+
+def _release(_fut) -> None:
+    global _abandoned
+    with _lock:
+        _abandoned -= 1
+
+
+def _abandon(futures) -> None:
+    """Count timed-out calls until their threads finish."""
+    global _abandoned
+    for fut in futures:
+        with _lock:
+            _abandoned += 1
+        fut.add_done_callback(_release)
+
+
+def _snapshot_path(method: str, args: tuple):
+    suffix = "_".join(str(a) for a in args[1:])  # 일자 제외 (예: 시장 구분)
+    return SNAPSHOT_DIR / f"{method}{'_' + suffix if suffix else ''}.pkl"
+
+
+def _save_snapshot(method: str, args: tuple, df: pd.DataFrame) -> None:
+    """Keep the newest successful non-empty frame per (method, non-date args)."""
+    if df is None or df.empty:
+        return
+    path = _snapshot_path(method, args)
+    try:
+        if path.exists():
+            with open(path, "rb") as f:
+                if pickle.load(f)["date"] > args[0]:
+                    return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump({"date": args[0], "frame": df}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(path)
+    except Exception as e:
+        print(f"[시장 데이터] 스냅샷 저장 실패 ({method}): {e}")
+
+
+def _load_snapshot(method: str, args: tuple) -> tuple[str, pd.DataFrame] | None:
+    """Last saved frame for the request, only if it is not newer than the requested date."""
+    path = _snapshot_path(method, args)
+    if not path.exists():
+        return None
+    with open(path, "rb") as f:
+        data = pickle.load(f)
+    return (data["date"], data["frame"]) if data["date"] <= args[0] else None
+
+
+def _fetch(method: str, *args):
+    """
+    Call method on the configured providers (market_data: primary, secondary, timeout_seconds,
+    hedge_after_seconds, stale_fallback). The secondary is asked only if it supports the method and
+    the primary has failed or not answered within hedge_after_seconds; the first successful answer wins.
+    An empty frame for a past date from an all-market method counts as a failure (KRX answers blocked or
+    throttled requests that way); only ohlcv returns it when no provider had data, so _fetch_ohlcv can
+    decide whether the day was a holiday. When every provider fails or times out, the last snapshot is
+    served and recorded in _stale. Calls that time out keep running on the pool; while
+    max_abandoned_calls of them are still running no new call is started (straight to the snapshot).
+    In cassette record/replay mode only the primary is called, inline (deterministic call order).
+    """
+    cfg = load_config().get("market_data", {})
+    primary = get_provider(cfg.get("primary", "pykrx"))
+    if cassette.mode() != "off":
+        return getattr(primary, method)(*args)
+    providers = [primary]
+    if cfg.get("secondary"):
+        secondary = get_provider(cfg["secondary"])
+        if secondary is not primary and method in secondary.supports:
+            providers.append(secondary)
+    timeout = float(cfg.get("timeout_seconds", 60))
+    hedge_after = float(cfg.get("hedge_after_seconds", 10))
+    max_abandoned = int(cfg.get("max_abandoned_calls", POOL_WORKERS // 2))
+    deadline = time.monotonic() + timeout
+    empty_is_failure = method in ALL_MARKET_METHODS and args[0] < datetime.now().strftime("%Y%m%d")
+    empty = None
+
+    pending = {}
+    errors = []
+    fut = _submit(primary, method, args, max_abandoned)
+    if fut is not None:
+        pending[fut] = primary.name
+    else:
+        errors.append(f"제한 시간 초과 호출 {_abandoned}건 진행 중")
+    waiting_hedge = len(providers) > 1 and fut is not None
+    while pending:
+        now = time.monotonic()
+        if now >= deadline:
+            break
+        wait_for = min(deadline, now + hedge_after) - now if waiting_hedge else deadline - now
+        done, _ = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+        for fut in done:
+            source = pending.pop(fut)
+            try:
+                result = fut.result()
+            except Exception as e:
+                errors.append(f"{source}: {e}")
+                continue
+            if empty_is_failure and isinstance(result, pd.DataFrame) and result.empty:
+                errors.append(f"{source}: 빈 응답")
+                empty = result
+                continue
+            metrics.market_data_source.inc(method=method, source=source)
+            if cfg.get("stale_fallback", True) and isinstance(result, pd.DataFrame):
+                _save_snapshot(method, args, result)
+            with _lock:
+                _stale.pop((method, args), None)
+            return result
+        if waiting_hedge and (not done or not pending):
+            # 주 제공자가 hedge_after 안에 응답하지 않았거나 실패: 보조 제공자에도 요청
+            waiting_hedge = False
+            fut = _submit(providers[1], method, args, max_abandoned)
+            if fut is not None:
+                pending[fut] = providers[1].name
+    if pending:
+        errors.append(f"{', '.join(pending.values())}: {timeout:g}초 초과")
+        _abandon(pending)
+    if empty is not None and method == "ohlcv":
+        # 휴장일 판단은 _fetch_ohlcv가 근거(이후 거래일·재조회)로 결정
+        metrics.market_data_source.inc(method=method, source="empty")
+        return empty
+    reason = "; ".join(errors) or "응답 없음"
+    if cfg.get("stale_fallback", True) and method != "ticker_name":
+        snap = _load_snapshot(method, args)
+        if snap is not None:
+            served, frame = snap
+            print(f"[시장 데이터] {method}{list(args)} 조회 실패 ({reason}) → {served} 스냅샷 사용")
+            metrics.market_data_source.inc(method=method, source="stale")
+            with _lock:
+                _stale[(method, args)] = (served, reason, time.monotonic())
+            return frame
+    metrics.market_data_source.inc(method=method, source="failed")
+    raise RuntimeError(f"시장 데이터 조회 실패 {method}{list(args)}: {reason}")
+
+
+def stale_notes(date: str | None = None) -> list[str]:
+    """Human-readable notes for frames served from an older snapshot (requests for `date`, or all)."""
+    names = {"ohlcv": "시세", "fundamental": "PER/PBR", "sector_classifications": "업종 분류"}
+    with _lock:
+        items = sorted(_stale.items())
+    return [
+        f"{names.get(method, method)}{'(' + args[1] + ')' if len(args) > 1 else ''}: "
+        f"{args[0]} 조회 실패 → {served} 자료 사용 ({reason})"
+        for (method, args), (served, reason, _) in items
+        if date is None or args[0] == date
+    ]
+
+
+def served_stale(method: str, *args) -> bool:
+    """True when the frame for (method, args) came from an older snapshot rather than a live answer."""
+    with _lock:
+        return (method, args) in _stale
+
+
+def _copy(df: pd.DataFrame | None) -> pd.DataFrame | None:
+    return df.copy() if df is not None else None
+
+
+def _cached(name: str, cache: OrderedDict, key, fetch, stale_key: tuple) -> pd.DataFrame | None:
+    """
+    LRU lookup. stale_key: (method, args) of the provider call; a frame that was served from an older
+    snapshot is kept only for market_data.stale_retry_seconds, then the providers are tried again.
+    """
+    retry_after = float(load_config().get("market_data", {}).get("stale_retry_seconds", 300))
+    with _lock:
+        if key in cache:
+            stale = _stale.get(stale_key)
+            if stale is None or time.monotonic() - stale[2] < retry_after:
+                cache.move_to_end(key)
+                metrics.cache_lookup(name, hit=True)
+                return _copy(cache[key])
+            del cache[key]
+            _stale.pop(stale_key, None)
+    metrics.cache_lookup(name, hit=False)
+    df = fetch()
+    with _lock:
+        cache[key] = df
+        while len(cache) > MAX_CACHED_KEYS:
+            cache.popitem(last=False)
+    return _copy(df)
+
+
+def drop_stale(date: str | None = None) -> int:
+    """Forget cached frames served from older snapshots (for `date`, or all) so the next request retries."""
+    caches = {"ohlcv": _ohlcv_cache, "fundamental": _fundamental_cache, "sector_classifications": _sector_cache}
+    with _lock:
+        keys = [k for k in _stale if date is None or k[1][0] == date]
+        for method, args in keys:
+            del _stale[(method, args)]
+            cache = caches.get(method)
+            if cache is not None:
+                cache.pop(args if method == "sector_classifications" else args[0], None)
+    return len(keys)
+
+
+def _empty(df) -> bool:
+    return df is None or df.empty
+
+
+def _fetch_ohlcv(date: str) -> pd.DataFrame:
+    """
+    All-market OHLCV with holiday detection. pykrx also answers with an empty frame when KRX blocks or
+    throttles, so an empty past date is recorded as closed only when a later trading day is already stored
+    or a second request after market_data.empty_retry_seconds is empty as well.
+    A day already in the local OHLCV store (finished, live answers only) is read from there instead of KRX.
+    """
+    if cassette.mode() == "off":
+        from src import ohlcv_store
+
+        stored = ohlcv_store.load_frame(date)
+        if stored is not None:
+            metrics.market_data_source.inc(method="ohlcv", source="store")
+            return stored
+    df = _fetch("ohlcv", date)
+    if not _empty(df) or date >= datetime.now().strftime("%Y%m%d"):
+        return df
+    from src import trading_calendar
+
+    if trading_calendar.has_later_trading_day(date):
+        evidence = "later_data"
+    else:
+        cassette.throttle(float(load_config().get("market_data", {}).get("empty_retry_seconds", 3)))
+        df = _fetch("ohlcv", date)
+        if not _empty(df):
+            return df
+        evidence = "retry"
+    trading_calendar.mark_closed(date, evidence)
+    return df
+
+
+def get_market_ohlcv(date: str) -> pd.DataFrame:
+    """
+    All-market OHLCV for date (raw pykrx frame, index = ticker). Cached per date; stored days come from
+    the local OHLCV store, empty past dates are recorded as holidays when confirmed (see _fetch_ohlcv).
+    """
+    return _cached("ohlcv", _ohlcv_cache, date, lambda: _fetch_ohlcv(date), ("ohlcv", (date,)))
+
+
+def get_market_fundamental(date: str) -> pd.DataFrame:
+    """All-market fundamental (BPS/PER/PBR/...) for date. Cached per date."""
+    return _cached(
+        "fundamental", _fundamental_cache, date, lambda: _fetch("fundamental", date), ("fundamental", (date,))
+    )
+
+
+def get_sector_classifications(date: str, market: str) -> pd.DataFrame:
+    """KRX sector classifications for (date, market). Cached per key."""
+    return _cached(
+        "sector", _sector_cache, (date, market), lambda: _fetch("sector_classifications", date, market),
+        ("sector_classifications", (date, market)),
+    )
+
+
+def get_ticker_name(ticker: str) -> str:
+    """Return stock name for ticker (cached; falls back to ticker on failure)."""
+    if ticker not in _name_cache:
+        try:
+            _name_cache[ticker] = _fetch("ticker_name", ticker) or ticker
+        except Exception:
+            return ticker
+    return _name_cache[ticker]
+
+
+def cache_info() -> dict[str, int]:
+    """Number of cached entries per cache, plus timed-out provider calls still running (for status endpoints)."""
+    with _lock:
+        return {
+            "ohlcv": len(_ohlcv_cache),
+            "fundamental": len(_fundamental_cache),
+            "sector": len(_sector_cache),
+            "name": len(_name_cache),
+            "abandoned_calls": _abandoned,
+        }
+
+
+def clear_cache() -> None:
+    """Drop every cached frame and name."""
+    with _lock:
+        _ohlcv_cache.clear()
+        _fundamental_cache.clear()
+        _sector_cache.clear()
+        _name_cache.clear()
+        _stale.clear()
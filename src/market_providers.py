@@ -0,0 +1,126 @@
+"""
+시장 데이터 제공자: pykrx(기본)와 FinanceDataReader(보조) 백엔드를 같은 형식(pykrx 프레임)으로 제공.
+모든 호출은 cassette(녹화/재생)와 외부 호출 지표를 거친다.
+FinanceDataReader는 일자 지정 전종목 조회가 없어 최근 거래일 시세·종목명만 제공 (PER/PBR·KRX 업종 없음).
+"""
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+from src import cassette, metrics
+from src.trading_calendar import previous_trading_day
+
+METHODS = ("ohlcv", "fundamental", "sector_classifications", "ticker_name")
+
+
+class ProviderUnavailable(RuntimeError):
+    """The provider cannot serve this request (unsupported data or date)."""
+
+
+class PykrxProvider:
+    name = "pykrx"
+    supports = frozenset(METHODS)
+
+    @staticmethod
+    def _stock():
+        """Import pykrx lazily: it is slow to import and logs to stdout on import."""
+        from pykrx import stock
+
+        return stock
+
+    def _krx(self, func_name: str, *args):
+        """Call pykrx.stock.<func_name>(*args) through the cassette (record/replay)."""
+        with metrics.track_call(f"pykrx.{func_name}"):
+            return cassette.call(f"pykrx.{func_name}", list(args), lambda: getattr(self._stock(), func_name)(*args))
+
+    def ohlcv(self, date: str) -> pd.DataFrame:
+        return self._krx("get_market_ohlcv_by_ticker", date, "ALL")
+
+    def fundamental(self, date: str) -> pd.DataFrame:
+        return self._krx("get_market_fundamental_by_ticker", date, "ALL")
+
+    def sector_classifications(self, date: str, market: str) -> pd.DataFrame:
+        return self._krx("get_market_sector_classifications", date, market)
+
+    def ticker_name(self, ticker: str) -> str:
+        return self._krx("get_market_ticker_name", ticker)
+
+
+# FinanceDataReader StockListing("KRX") 컬럼 -> pykrx 컬럼
+_FDR_COLUMNS = {
+    "Open": "시가", "High": "고가", "Low": "저가", "Close": "종가",
+    "Volume": "거래량", "Amount": "거래대금", "ChagesRatio": "등락률", "ChangesRatio": "등락률",
+}
+
+
+def listing_session(now: datetime | None = None) -> str:
+    """
+    Trading day reflected by a KRX listing fetched at `now`: today from the 09:00 open on trading days,
+    otherwise the previous trading day.
+    """
+    now = now or datetime.now()
+    return previous_trading_day(now.strftime("%Y%m%d"), inclusive=now.hour >= 9)
+
+
+class FdrProvider:
+    name = "fdr"
+    supports = frozenset({"ohlcv", "ticker_name"})
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._listing_cache: tuple[str, pd.DataFrame] | None = None
+        self._names: tuple[str, dict[str, str]] | None = None
+
+    def _listing(self) -> pd.DataFrame:
+        """Full KRX listing, downloaded once per listing_session (name lookups share it)."""
+
+        def fetch():
+            import FinanceDataReader as fdr
+
+            return fdr.StockListing("KRX")
+
+        session = listing_session()
+        with self._lock:
+            if self._listing_cache is None or self._listing_cache[0] != session:
+                with metrics.track_call("fdr.StockListing"):
+                    self._listing_cache = (session, cassette.call("fdr.StockListing", ["KRX", session], fetch))
+            return self._listing_cache[1]
+
+    def ohlcv(self, date: str) -> pd.DataFrame:
+        session = listing_session()
+        if date != session:
+            raise ProviderUnavailable(f"FinanceDataReader는 최근 거래일({session}) 전종목 시세만 제공: {date}")
+        df = self._listing()
+        df = df.set_index(df["Code"].astype(str).rename("티커"))
+        out = df[[c for c in _FDR_COLUMNS if c in df.columns]].rename(columns=_FDR_COLUMNS)
+        return out.loc[:, ~out.columns.duplicated()]
+
+    def fundamental(self, date: str) -> pd.DataFrame:
+        raise ProviderUnavailable("FinanceDataReader는 PER/PBR 미제공")
+
+    def sector_classifications(self, date: str, market: str) -> pd.DataFrame:
+        raise ProviderUnavailable("FinanceDataReader는 KRX 업종 분류 미제공")
+
+    def ticker_name(self, ticker: str) -> str:
+        df = self._listing()
+        session = self._listing_cache[0]
+        if self._names is None or self._names[0] != session:
+            self._names = (session, dict(zip(df["Code"].astype(str), df["Name"].astype(str))))
+        name = self._names[1].get(ticker)
+        if name is None:
+            raise ProviderUnavailable(f"종목코드 없음: {ticker}")
+        return name
+
+
+PROVIDERS = {"pykrx": PykrxProvider, "fdr": FdrProvider}
+_instances: dict[str, object] = {}
+
+
+def get_provider(name: str):
+    """Provider instance by config name (pykrx | fdr)."""
+    if name not in PROVIDERS:
+        raise ValueError(f"알 수 없는 시장 데이터 제공자: {name} (가능: {', '.join(PROVIDERS)})")
+    if name not in _instances:
+        _instances[name] = PROVIDERS[name]()
+    return _instances[name]
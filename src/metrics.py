@@ -0,0 +1,231 @@
+"""
+실행 지표: 단계별 소요 시간, 외부 호출 지연(엔드포인트별), 캐시 적중률, 단계별 행 수, 등급 분포.
+Prometheus 텍스트 형식(0.0.4)으로 node-exporter textfile(--metrics-file / metrics.textfile) 또는
+serve 모드의 GET /metrics로 내보낸다. 외부 라이브러리 없이 프로세스 내 레지스트리로 집계.
+"""
+import math
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+PREFIX = "kstock_"
+STAGE_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+CALL_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+_lock = threading.Lock()
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _num(v: float) -> str:
+    if math.isinf(v):
+        return "+Inf" if v > 0 else "-Inf"
+    return repr(float(v)) if not float(v).is_integer() else str(int(v))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = ()):
+        self.name = PREFIX + name
+        self.help = help_text
+        self.label_names = labels
+        self._values: dict[tuple, object] = {}
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(n, "")) for n in self.label_names)
+
+    def clear(self) -> None:
+        with _lock:
+            self._values.clear()
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with _lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._samples(key, value))
+        return lines
+
+    def _samples(self, key: tuple, value) -> list[str]:
+        return [f"{self.name}{_labels(self.label_names, key)} {_num(value)}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with _lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        with _lock:
+            self._values[self._key(labels)] = value
+
+    def value(self, **labels) -> float | None:
+        return self._values.get(self._key(labels))
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = (), buckets=CALL_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with _lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0, 0.0]
+            for i, b in enumerate(self.buckets):
+                if value <= b:
+                    state[0][i] += 1
+            state[1] += 1
+            state[2] += value
+
+    def count(self, **labels) -> int:
+        state = self._values.get(self._key(labels))
+        return state[1] if state else 0
+
+    def _samples(self, key: tuple, value) -> list[str]:
+        counts, total, total_sum = value
+        out = []  # 누적 버킷 (마지막 +Inf = 전체 건수)
+        for b, c in list(zip(self.buckets, counts)) + [(math.inf, total)]:
+            le = 'le="%s"' % _num(b)
+            out.append(f"{self.name}_bucket{_labels(self.label_names, key, le)} {c}")
+        out.append(f"{self.name}_sum{_labels(self.label_names, key)} {_num(round(total_sum, 6))}")
+        out.append(f"{self.name}_count{_labels(self.label_names, key)} {total}")
+        return out
+
+
+stage_duration = Histogram("stage_duration_seconds", "Pipeline stage wall time.", ("stage",), STAGE_BUCKETS)
+external_call_duration = Histogram(
+    "external_call_duration_seconds", "External call latency by endpoint and outcome.", ("endpoint", "outcome")
+)
+market_data_source = Counter(
+    "market_data_requests_total",
+    "Market data requests by method and the source that answered (provider name, stale, failed).",
+    ("method", "source"),
+)
+cache_requests = Counter("cache_requests_total", "Cache lookups by cache and result (hit/miss).", ("cache", "result"))
+stage_rows = Gauge("stage_rows", "Rows produced by each stage in the last run.", ("stage",))
+grade_count = Gauge("grade_count", "Ranked stocks per grade in the last run.", ("grade",))
+news_tickers = Gauge("news_tickers", "Screened stocks with / without collected news in the last run.", ("result",))
+runs = Counter("runs_total", "Pipeline runs by status.", ("status",))
+run_duration = Gauge("run_duration_seconds", "Wall time of the last pipeline run.")
+last_run = Gauge("last_run_timestamp_seconds", "Unix time of the last pipeline run by status.", ("status",))
+
+REGISTRY = [
+    stage_duration, external_call_duration, market_data_source, cache_requests, stage_rows, grade_count,
+    news_tickers, runs, run_duration, last_run,
+]
+
+
+@contextmanager
+def timed_stage(stage: str):
+    """Observe the block's wall time as stage_duration_seconds{stage}."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        stage_duration.observe(time.perf_counter() - t0, stage=stage)
+
+
+class _Call:
+    error = False
+
+
+@contextmanager
+def track_call(endpoint: str):
+    """
+    Observe an external call's latency. outcome is "error" when the block raises or the caller sets
+    call.error = True (e.g. HTTP status >= 400), else "ok".
+    """
+    call = _Call()
+    t0 = time.perf_counter()
+    try:
+        yield call
+    except BaseException:
+        call.error = True
+        raise
+    finally:
+        external_call_duration.observe(
+            time.perf_counter() - t0, endpoint=endpoint, outcome="error" if call.error else "ok"
+        )
+
+
+def cache_lookup(cache: str, hit: bool, count: int = 1) -> None:
+    if count:
+        cache_requests.inc(count, cache=cache, result="hit" if hit else "miss")
+
+
+def record_results(results: dict | None) -> None:
+    """Rows per stage, grade distribution and news coverage for a finished pipeline run."""
+    if not results:
+        stage_rows.set(0, stage="screened")
+        return
+    for stage, df in results.items():
+        stage_rows.set(0 if df is None else len(df), stage=stage)
+    ranked = results.get("ranked")
+    if ranked is not None and "grade" in ranked.columns:
+        counts = ranked["grade"].value_counts()
+        for grade in "ABCDEF":
+            grade_count.set(int(counts.get(grade, 0)), grade=grade)
+    screened, news = results.get("screened"), results.get("news")
+    if screened is not None:
+        with_news = 0 if news is None or news.empty else int(screened["ticker"].isin(news["ticker"]).sum())
+        news_tickers.set(with_news, result="with_news")
+        news_tickers.set(len(screened) - with_news, result="without_news")
+
+
+def record_run(status: str, seconds: float) -> None:
+    runs.inc(status=status)
+    run_duration.set(round(seconds, 3))
+    last_run.set(int(time.time()), status=status)
+
+
+def render() -> str:
+    """All metrics in Prometheus text exposition format."""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(path: str | Path) -> Path:
+    """
+    Write render() for node-exporter's textfile collector. The file is written next to the target
+    and renamed, so the collector never reads a partial file (path should end in .prom).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+    tmp.write_text(render(), encoding="utf-8")
+    tmp.replace(path)
+    return path
+
+
+def reset() -> None:
+    """Drop every recorded value (tests / benchmarks)."""
+    for metric in REGISTRY:
+        metric.clear()
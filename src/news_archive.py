@@ -0,0 +1,180 @@
+"""
+종목별 뉴스 아카이브: (종목, 기사 링크, 발행시각) 단위로 수집 기사·본문을 SQLite에 보관.
+연속 실행에서 겹치는 ±N일 뉴스 구간은 아카이브에서 제공하고, 외부 조회는 마지막 조회 이후가
+구간에 포함될 때만 수행하며 마지막으로 본 기사(last_seen)보다 새 기사까지만 받는다.
+본문은 기사당 한 번 수집하고, 실패한 본문은 MAX_BODY_ATTEMPTS회까지 다음 실행에서 다시 시도.
+파일: cache/news_archive.sqlite3
+"""
+import sqlite3
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+
+from src.config_loader import CACHE_ROOT
+
+ARCHIVE_PATH = CACHE_ROOT / "news_archive.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles(
+    ticker TEXT NOT NULL,
+    link TEXT NOT NULL,
+    pubdate TEXT NOT NULL,
+    pub_ts TEXT,
+    title TEXT,
+    description TEXT,
+    body TEXT,
+    body_failures INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (ticker, link, pubdate)
+);
+CREATE INDEX IF NOT EXISTS articles_ticker_ts ON articles(ticker, pub_ts);
+CREATE TABLE IF NOT EXISTS tickers(
+    ticker TEXT PRIMARY KEY,
+    last_seen TEXT,
+    fetched_at TEXT NOT NULL
+);
+"""
+
+_TS_FMT = "%Y%m%d%H%M%S"
+MAX_BODY_ATTEMPTS = 3
+
+
+def pub_timestamp(pub_date: str) -> str | None:
+    """Sortable YYYYMMDDHHMMSS (publisher's local time) for a pubDate string; None if unparseable."""
+    if not pub_date:
+        return None
+    try:
+        return parsedate_to_datetime(pub_date).strftime(_TS_FMT)
+    except (TypeError, ValueError, IndexError):
+        pass
+    from src.news_collector import _parse_pubdate_to_yyyymmdd
+
+    day = _parse_pubdate_to_yyyymmdd(pub_date)
+    return day + "000000" if day else None
+
+
+def date_window(target_date: str, tolerance_days: int) -> tuple[str, str]:
+    """(first, last) YYYYMMDD of the ±tolerance_days window around target_date."""
+    d = datetime.strptime(target_date, "%Y%m%d")
+    delta = timedelta(days=max(0, tolerance_days))
+    return (d - delta).strftime("%Y%m%d"), (d + delta).strftime("%Y%m%d")
+
+
+class NewsArchive:
+    """One connection per collector run; every write is committed immediately."""
+
+    def __init__(self, path: Path | None = None):
+        path = path or ARCHIVE_PATH
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+        self._migrate()
+
+    def _migrate(self) -> None:
+        """Older archives stored failed bodies as "" for good; make them retryable."""
+        columns = {r["name"] for r in self.conn.execute("PRAGMA table_info(articles)")}
+        if "body_failures" not in columns:
+            with self.conn:
+                self.conn.execute("ALTER TABLE articles ADD COLUMN body_failures INTEGER NOT NULL DEFAULT 0")
+                self.conn.execute("UPDATE articles SET body = NULL, body_failures = 1 WHERE body = ''")
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def needs_fetch(self, ticker: str, window_end: str | None, min_refresh_minutes: float, now: datetime) -> bool:
+        """
+        True unless the archive already covers the request: the ticker was fetched after the
+        window's last day ended, or less than min_refresh_minutes ago.
+        """
+        row = self.conn.execute("SELECT fetched_at FROM tickers WHERE ticker = ?", (ticker,)).fetchone()
+        if row is None:
+            return True
+        fetched_at = datetime.strptime(row["fetched_at"], _TS_FMT)
+        if window_end and row["fetched_at"][:8] > window_end:
+            return False
+        return now - fetched_at >= timedelta(minutes=min_refresh_minutes)
+
+    def last_seen(self, ticker: str) -> str | None:
+        """Newest archived pubDate (YYYYMMDDHHMMSS) for the ticker; fetches can stop once they reach it."""
+        row = self.conn.execute("SELECT last_seen FROM tickers WHERE ticker = ?", (ticker,)).fetchone()
+        return (row["last_seen"] or None) if row is not None else None
+
+    def add_items(self, ticker: str, items: list[dict], now: datetime) -> int:
+        """Archive fetched items (title/link/description/pubDate); returns how many were new."""
+        new = 0
+        last_seen = None
+        with self.conn:
+            for it in items:
+                link = it.get("link") or it.get("news_link") or ""
+                if not link:
+                    continue
+                pubdate = it.get("pubDate") or it.get("date") or ""
+                ts = pub_timestamp(pubdate)
+                cur = self.conn.execute(
+                    "INSERT OR IGNORE INTO articles(ticker, link, pubdate, pub_ts, title, description) VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        ticker, link, pubdate, ts,
+                        it.get("title") or it.get("news_title") or "",
+                        it.get("description") or it.get("summary") or "",
+                    ),
+                )
+                new += cur.rowcount
+                if ts and (last_seen is None or ts > last_seen):
+                    last_seen = ts
+            self.conn.execute(
+                """
+                INSERT INTO tickers(ticker, last_seen, fetched_at) VALUES (?, ?, ?)
+                ON CONFLICT(ticker) DO UPDATE SET
+                    last_seen=MAX(COALESCE(tickers.last_seen, ''), COALESCE(excluded.last_seen, '')),
+                    fetched_at=excluded.fetched_at
+                """,
+                (ticker, last_seen, now.strftime(_TS_FMT)),
+            )
+        return new
+
+    def window(
+        self,
+        ticker: str,
+        window: tuple[str, str] | None,
+        limit: int,
+        keep_unparsed: bool = True,
+    ) -> list[dict]:
+        """
+        Archived items for the ticker (newest first, at most limit) in the same shape as API items,
+        plus "body" (None = not fetched yet or a failed fetch to retry, "" = gave up after MAX_BODY_ATTEMPTS).
+        window: (first, last) YYYYMMDD or None for the latest items.
+        """
+        sql = "SELECT link, pubdate, title, description, body, body_failures FROM articles WHERE ticker = ?"
+        args: list = [ticker]
+        if window:
+            cond = "(pub_ts >= ? AND pub_ts <= ?)"
+            if keep_unparsed:
+                cond = f"({cond} OR pub_ts IS NULL)"
+            sql += f" AND {cond}"
+            args += [window[0] + "000000", window[1] + "235959"]
+        sql += " ORDER BY pub_ts IS NULL, pub_ts DESC LIMIT ?"
+        args.append(limit)
+        items = []
+        for r in self.conn.execute(sql, args):
+            body = r["body"]
+            if body is None and r["body_failures"] >= MAX_BODY_ATTEMPTS:
+                body = ""
+            items.append(
+                {"title": r["title"], "link": r["link"], "description": r["description"], "pubDate": r["pubdate"], "body": body}
+            )
+        return items
+
+    def set_body(self, ticker: str, link: str, pubdate: str, body: str) -> None:
+        """Store a fetched body; "" counts a failed fetch and leaves the body to be retried on a later run."""
+        with self.conn:
+            if body:
+                self.conn.execute(
+                    "UPDATE articles SET body = ? WHERE ticker = ? AND link = ? AND pubdate = ?",
+                    (body, ticker, link, pubdate),
+                )
+            else:
+                self.conn.execute(
+                    "UPDATE articles SET body_failures = body_failures + 1 WHERE ticker = ? AND link = ? AND pubdate = ?",
+                    (ticker, link, pubdate),
+                )
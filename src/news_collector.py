@@ -1,19 +1,29 @@
 """
 2. 뉴스 수집: 선별 종목별 뉴스 - 네이버 API 또는 검색 결과 스크래핑, 본문 수집·요약
+다운로드(이 모듈)와 HTML 파싱(news_parse, news.parse_workers 프로세스)을 단계로 분리
 """
 import re
-import time
+from collections import deque
+from concurrent.futures import Future
 from datetime import datetime
+from typing import Callable
 from urllib.parse import quote
 
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
 
+from src import cassette, http_client, metrics, news_parse
 from src.config_loader import get_naver_credentials, load_config
 
 _news_fallback_warned = False
 
+NAVER_API_BASE_URL = "https://openapi.naver.com"
+NAVER_SEARCH_BASE_URL = "https://search.naver.com"
+
+
+def _base_url(key: str, default: str) -> str:
+    """news.api_base_url / news.search_base_url (e.g. a local mock server for load tests)."""
+    return (load_config().get("news", {}).get(key) or default).rstrip("/")
+
 
 def _parse_pubdate_to_yyyymmdd(pub_date: str) -> str | None:
     """Parse RFC 2822, ISO 8601, or similar to YYYYMMDD. Returns None if unparseable."""
@@ -60,148 +70,175 @@ def _days_diff_yyyymmdd(a: str, b: str) -> int:
         return 999
 
 
-def _fetch_article_body(url: str, timeout: int = 8) -> str:
-    """Fetch news article URL and extract body text. Returns empty string on failure."""
+_BROWSER_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept-Language": "ko-KR,ko;q=0.9,en;q=0.8",
+}
+
+
+def _download_article(url: str, timeout: int = 8) -> bytes | None:
+    """Download stage: raw article HTML bytes, or None on failure."""
     cfg = load_config()
     delay = cfg.get("news", {}).get("article_request_delay_seconds", 0.5)
-    time.sleep(delay)
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Accept-Language": "ko-KR,ko;q=0.9,en;q=0.8",
-    }
+    cassette.throttle(delay)
     try:
-        r = requests.get(url, headers=headers, timeout=timeout, allow_redirects=True)
+        r = http_client.get(url, headers=_BROWSER_HEADERS, timeout=timeout, allow_redirects=True)
         r.raise_for_status()
-        r.encoding = r.apparent_encoding or "utf-8"
-        soup = BeautifulSoup(r.text, "html.parser")
-        # Remove script/style
-        for tag in soup(["script", "style"]):
-            tag.decompose()
-        # Common article body selectors (multiple sites)
-        selectors = [
-            "#news_body", ".news_body", "#articleBody", ".article_body", ".article-body",
-            "div[itemprop='articleBody']", "article", ".article_view", "#articeBody",
-            ".content_body", ".news_view", "#newsct_article", "main article",
-        ]
-        text_parts = []
-        for sel in selectors:
-            for el in soup.select(sel):
-                t = el.get_text(separator=" ", strip=True)
-                if t and len(t) > 100:
-                    text_parts.append(t)
-                    break
-            if text_parts:
-                break
-        if not text_parts:
-            # Fallback: first main or div with many p
-            for main in soup.select("main, #main, .main, #content"):
-                t = main.get_text(separator=" ", strip=True)
-                if t and len(t) > 80:
-                    text_parts.append(t)
-                    break
-        return " ".join(text_parts) if text_parts else ""
+        return r.content
+    except cassette.CassetteMiss:
+        raise  # 재생 중 없는 호출은 실패로 (다른 결과를 조용히 만들지 않음)
     except Exception:
-        return ""
+        return None
+
+
+def _fetch_article_body(url: str, timeout: int = 8) -> str:
+    """Fetch news article URL and extract body text. Returns empty string on failure."""
+    content = _download_article(url, timeout)
+    return news_parse.article_body(content) if content else ""
 
 
 def _fetch_naver_api(query: str, display: int = 10, start: int = 1) -> list[dict]:
-    """Naver search API news. Returns list of items with title, link, description, pubDate."""
+    """
+    Naver search API news. Returns list of items with title, link, description, pubDate.
+    In replay the recorded answer is served without credentials (they are not part of the cassette key).
+    """
     cred = get_naver_credentials()
-    if not cred["client_id"] or not cred["client_secret"]:
+    if not cassette.is_replay() and (not cred["client_id"] or not cred["client_secret"]):
         return []
-    url = "https://openapi.naver.com/v1/search/news.json"
+    url = _base_url("api_base_url", NAVER_API_BASE_URL) + "/v1/search/news.json"
     headers = {
         "X-Naver-Client-Id": cred["client_id"],
         "X-Naver-Client-Secret": cred["client_secret"],
     }
     params = {"query": query, "display": min(display, 100), "start": start, "sort": "date"}
     try:
-        r = requests.get(url, headers=headers, params=params, timeout=10)
+        r = http_client.get(url, headers=headers, params=params, timeout=10)
         r.raise_for_status()
         data = r.json()
         return data.get("items", [])
+    except cassette.CassetteMiss:
+        raise
     except Exception:
         return []
 
 
-def _fetch_naver_news_search_scrape(query: str, max_articles: int = 20) -> list[dict]:
-    """Scrape Naver news search results. Returns list of {title, link, description, pubDate}.
-    Note: Naver search often loads news via JavaScript, so this may return [] without browser automation.
-    For reliable news, set NAVER_CLIENT_ID and NAVER_CLIENT_SECRET in .env (use_api=true)."""
+def _fetch_naver_api_since(query: str, max_items: int, since: str, page_size: int) -> list[dict]:
+    """
+    Newest API items down to `since` (YYYYMMDDHHMMSS of the newest archived article): pages of page_size
+    (sort=date) until a page reaches an already-seen article or max_items are collected.
+    """
+    from src.news_archive import pub_timestamp
+
+    items: list[dict] = []
+    while len(items) < max_items:
+        display = min(page_size, max_items - len(items))
+        page = _fetch_naver_api(query, display=display, start=len(items) + 1)
+        items.extend(page)
+        stamps = (pub_timestamp(it.get("pubDate") or "") for it in page)
+        if len(page) < display or any(ts and ts <= since for ts in stamps):
+            break
+    return items
+
+
+def _download_search_page(query: str) -> bytes | None:
+    """Download stage: raw Naver news search page bytes, or None on failure."""
     cfg = load_config()
     delay = cfg.get("news", {}).get("request_delay_seconds", 0.3)
-    time.sleep(delay)
-    url = "https://search.naver.com/search.naver?where=news&query=" + quote(query)
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Accept-Language": "ko-KR,ko;q=0.9,en;q=0.8",
-    }
+    cassette.throttle(delay)
+    url = _base_url("search_base_url", NAVER_SEARCH_BASE_URL) + "/search.naver?where=news&query=" + quote(query)
     try:
-        r = requests.get(url, headers=headers, timeout=12)
+        r = http_client.get(url, headers=_BROWSER_HEADERS, timeout=12)
         r.raise_for_status()
-        r.encoding = "utf-8"
-        soup = BeautifulSoup(r.text, "html.parser")
-        rows = []
-        seen_links = set()
-        # 1) news_area > news_tit (최신 구조)
-        for group in soup.select("div.news_area")[:max_articles * 2]:
-            tit = group.select_one("a.news_tit")
-            if not tit:
-                tit = group.select_one("a[href*='news'], a[href*='article']")
-            if not tit:
-                continue
-            link = tit.get("href", "").split("?")[0]
-            if link in seen_links:
-                continue
-            seen_links.add(link)
-            title = tit.get_text(strip=True)
-            dsc = group.select_one("div.news_dsc, a.dsc_wrap, span.news_dsc, a.link_tit")
-            summary = dsc.get_text(strip=True) if dsc else ""
-            info = group.select_one("span.info, span.info_group")
-            pub_date = info.get_text(strip=True) if info else ""
-            rows.append({"title": title, "link": tit.get("href", ""), "description": summary, "pubDate": pub_date})
-            if len(rows) >= max_articles:
-                break
-        # 2) a.news_tit 단독
-        if len(rows) < max_articles:
-            for a in soup.select("a.news_tit"):
-                if len(rows) >= max_articles:
-                    break
-                href = a.get("href", "")
-                if not href or href in seen_links:
-                    continue
-                seen_links.add(href)
-                title = a.get_text(strip=True)
-                if title and len(title) > 5:
-                    rows.append({"title": title, "link": href, "description": "", "pubDate": ""})
-        # 3) 뉴스 링크 패턴 (list_news, bx 등)
-        if len(rows) < max_articles:
-            for a in soup.select("ul.list_news a[href*='article'], div.bx a[href*='news'], div.bx a[href*='article']"):
-                if len(rows) >= max_articles:
-                    break
-                href = a.get("href", "")
-                if not href or href in seen_links:
-                    continue
-                title = a.get_text(strip=True)
-                if not title or len(title) < 5:
-                    continue
-                seen_links.add(href)
-                rows.append({"title": title, "link": href, "description": "", "pubDate": ""})
-        return rows[:max_articles]
+        return r.content
+    except cassette.CassetteMiss:
+        raise
     except Exception:
-        return []
+        return None
+
+
+def _fetch_naver_news_search_scrape(query: str, max_articles: int = 20) -> list[dict]:
+    """Scrape Naver news search results. Returns list of {title, link, description, pubDate}.
+    Note: Naver search often loads news via JavaScript, so this may return [] without browser automation.
+    For reliable news, set NAVER_CLIENT_ID and NAVER_CLIENT_SECRET in .env (use_api=true)."""
+    content = _download_search_page(query)
+    return news_parse.search_results(content, max_articles) if content else []
+
+
+def _has_credentials() -> bool:
+    cred = get_naver_credentials()
+    return bool(cred.get("client_id") and cred.get("client_secret"))
+
+
+def _submit_items(
+    query: str,
+    use_api: bool,
+    has_cred: bool,
+    max_per: int,
+    stage: news_parse.ParseStage,
+    since: str | None = None,
+    page_size: int = 10,
+) -> Future:
+    """
+    Download stage for one stock's news list: Naver API first (when credentials exist), search
+    scraping as fallback. A scraped page is parsed on `stage`; the future resolves to the item list.
+    since: newest archived pubDate (YYYYMMDDHHMMSS); the API is then paged only until it reaches it.
+    """
+    global _news_fallback_warned
+    items = []
+    if use_api and has_cred:
+        if since:
+            items = _fetch_naver_api_since(query, max_per, since, page_size)
+        else:
+            items = _fetch_naver_api(query, display=max_per)
+    if items:
+        return news_parse.completed(items)
+    if use_api and has_cred is False and not _news_fallback_warned:
+        print("[뉴스] API 키 없음. 검색 스크래핑으로 시도합니다.")
+        _news_fallback_warned = True
+    content = _download_search_page(query)
+    if not content:
+        return news_parse.completed([])
+    return stage.submit(news_parse.search_results, content, max_per)
+
+
+def _fetch_items(query: str, use_api: bool, has_cred: bool, max_per: int) -> list[dict]:
+    """Naver API first (when credentials exist), search scraping as fallback."""
+    with news_parse.ParseStage() as stage:
+        return _submit_items(query, use_api, has_cred, max_per, stage).result()
+
+
+def _news_row(ticker: str, name: str, it: dict, news_date: str, body: str | None, summary_max: int) -> dict:
+    """Output row for one kept news item (body: extracted article text, or None/"" to use the description)."""
+    body_summary = ""
+    if body:
+        body_summary = body[:summary_max] + ("..." if len(body) > summary_max else "")
+    if not body_summary:
+        body_summary = (it.get("description") or it.get("summary") or "")[:summary_max]
+    return {
+        "ticker": ticker,
+        "name": name,
+        "news_title": (it.get("title") or it.get("news_title") or "").replace("<b>", "").replace("</b>", ""),
+        "news_link": it.get("link") or it.get("news_link") or "",
+        "news_summary": it.get("description") or it.get("summary") or "",
+        "news_date": news_date,
+        "news_body_summary": body_summary or "(요약 없음)",
+    }
 
 
 def run_news_collector(
     screened_df: pd.DataFrame,
     target_date: str | None = None,
+    on_ticker: Callable[[str, int], None] | None = None,
 ) -> pd.DataFrame:
     """
     screened_df: must have columns ticker, name.
     target_date: YYYYMMDD. When filter_by_target_date=true, only news on this date are kept.
+    on_ticker: called with (ticker, kept article count) as soon as each ticker is done
+      (e.g. ranker.ProgressiveRanker.update for intermediate rankings).
     Returns DataFrame: ticker, name, news_title, news_link, news_summary, news_date, news_body_summary.
+    With news.archive_enabled, a ticker whose window is already covered by the archive is served
+    from it without external calls, and article bodies are fetched once per article.
     """
-    global _news_fallback_warned
     cfg = load_config()
     news_cfg = cfg.get("news", {})
     use_api = news_cfg.get("use_api", True)
@@ -211,27 +248,62 @@ def run_news_collector(
     parse_fail_keep = news_cfg.get("parse_fail_keep", True)
     fetch_body = news_cfg.get("fetch_article_body", True)
     summary_max = news_cfg.get("summary_max_chars", 300)
+    summary_method = news_cfg.get("summary_method", "extractive")
     max_fetch_body = news_cfg.get("max_articles_fetch_body", 5)
     debug = news_cfg.get("debug", False)
-    cred = get_naver_credentials()
-    has_cred = bool(cred.get("client_id") and cred.get("client_secret"))
+    # API/스크래핑 분기는 녹화 시 자격 증명 유무로 정해지므로 cassette에 기록하고 재생 때는 기록값을 사용
+    has_cred = cassette.call("news.api_credentials", {}, _has_credentials)
+    # 녹화/재생 중에는 아카이브 미사용 (외부 호출 순서를 실행마다 동일하게 유지)
+    archive = None
+    if news_cfg.get("archive_enabled", True) and cassette.mode() == "off":
+        from src import news_archive
+
+        archive = news_archive.NewsArchive()
+        window = news_archive.date_window(target_date, tolerance_days) if filter_by_date and target_date else None
+        refresh_minutes = news_cfg.get("archive_refresh_minutes", 30)
+        page_size = max(1, int(news_cfg.get("archive_page_size", 10)))
+        now = datetime.now()
+    _archive_fetched = _archive_reused = _body_reused = _body_fetched = 0
 
     rows = []
+    bodies: list[str] = []  # 행별 전체 본문 (추출 요약용)
     _debug_total = 0
     _debug_parse_fail = 0
     _debug_filtered_date = 0
-    for _, row in screened_df.iterrows():
-        ticker = str(row["ticker"]).zfill(6)
-        name = row.get("name", ticker)
-        query = f"{name} 주가" if name else ticker
-        items = []
-        if use_api and has_cred:
-            items = _fetch_naver_api(query, display=max_per)
-        if not items:
-            if use_api and has_cred is False and not _news_fallback_warned:
-                print("[뉴스] API 키 없음. 검색 스크래핑으로 시도합니다.")
-                _news_fallback_warned = True
-            items = _fetch_naver_news_search_scrape(query, max_articles=max_per)
+    # 다운로드(이 스레드)와 파싱(news.parse_workers 프로세스)을 분리: 본문 파싱이 끝나기를 기다리지 않고
+    # 다음 다운로드를 진행하고, 종목 결과는 본문 파싱이 모두 끝난 순서대로(입력 순서 유지) 확정
+    stage = news_parse.ParseStage(news_cfg.get("parse_workers", 0), news_cfg.get("parse_queue_size", 32))
+    pending: deque[tuple[str, str, list]] = deque()
+
+    def finish_ready(block: bool = False) -> None:
+        while pending and (block or all(e[3].done() for e in pending[0][2] if isinstance(e[3], Future))):
+            ticker, name, entries = pending.popleft()
+            for it, news_date, link, body, downloaded in entries:
+                if isinstance(body, Future):
+                    try:
+                        body = body.result()
+                    except Exception:
+                        body = ""
+                if downloaded and archive is not None:
+                    archive.set_body(ticker, link, news_date, body)
+                rows.append(_news_row(ticker, name, it, news_date, body, summary_max))
+                bodies.append(body or "")
+            if on_ticker is not None:
+                on_ticker(ticker, len(entries))
+
+    def collect(ticker: str, name: str, items_future: Future | None) -> None:
+        """Filter one stock's items by date, download kept bodies (parsed on the stage) and queue the stock."""
+        nonlocal _debug_total, _debug_parse_fail, _debug_filtered_date, _body_fetched, _body_reused
+        if items_future is not None:
+            try:
+                items = items_future.result()
+            except Exception:
+                items = []
+            if archive is not None:
+                archive.add_items(ticker, items, now)
+        if archive is not None:
+            items = archive.window(ticker, window, limit=max_per, keep_unparsed=parse_fail_keep)
+        entries = []
         for idx, it in enumerate(items):
             news_date = it.get("pubDate") or it.get("date") or ""
             if filter_by_date and target_date:
@@ -251,24 +323,62 @@ def run_news_collector(
                         if diff > tolerance_days:
                             _debug_filtered_date += 1
                             continue
-            body_summary = ""
-            if fetch_body and idx < max_fetch_body:
-                link = it.get("link") or it.get("news_link") or ""
-                if link:
-                    body = _fetch_article_body(link)
-                    if body:
-                        body_summary = body[:summary_max] + ("..." if len(body) > summary_max else "")
-            if not body_summary:
-                body_summary = (it.get("description") or it.get("summary") or "")[:summary_max]
-            rows.append({
-                "ticker": ticker,
-                "name": name,
-                "news_title": (it.get("title") or it.get("news_title") or "").replace("<b>", "").replace("</b>", ""),
-                "news_link": it.get("link") or it.get("news_link") or "",
-                "news_summary": it.get("description") or it.get("summary") or "",
-                "news_date": news_date,
-                "news_body_summary": body_summary or "(요약 없음)",
-            })
+            body, downloaded = None, False
+            link = it.get("link") or it.get("news_link") or ""
+            if fetch_body and idx < max_fetch_body and link:
+                body = it.get("body")
+                if body is None:
+                    content = _download_article(link)
+                    body = stage.submit(news_parse.article_body, content) if content else ""
+                    downloaded = True
+                    _body_fetched += 1
+                else:
+                    _body_reused += 1
+            entries.append((it, news_date, link, body, downloaded))
+        pending.append((ticker, name, entries))
+        finish_ready()
+
+    # 파싱 작업자가 있으면 검색 결과 파싱을 기다리는 동안 다음 종목(작업자 수만큼)의 검색 페이지를 먼저 내려받음
+    lookahead: deque[tuple[str, str, Future | None]] = deque()
+    with stage:
+        for _, row in screened_df.iterrows():
+            ticker = str(row["ticker"]).zfill(6)
+            name = row.get("name", ticker)
+            query = f"{name} 주가" if name else ticker
+            items_future = None
+            if archive is None or archive.needs_fetch(ticker, window[1] if window else None, refresh_minutes, now):
+                if archive is None:
+                    items_future = _submit_items(query, use_api, has_cred, max_per, stage)
+                else:
+                    since = archive.last_seen(ticker)
+                    items_future = _submit_items(query, use_api, has_cred, max_per, stage, since, page_size)
+                    _archive_fetched += 1
+            else:
+                _archive_reused += 1
+            lookahead.append((ticker, name, items_future))
+            if len(lookahead) > stage.workers:
+                collect(*lookahead.popleft())
+        while lookahead:
+            collect(*lookahead.popleft())
+        finish_ready(block=True)
+
+    if summary_method == "extractive" and any(bodies):
+        # 본문 앞 N자 대신 당일 전체 기사 기준 핵심 문장을 글자 수 한도 안에서 추출 (한 번의 일괄 계산)
+        from src import news_summarizer
+
+        with metrics.timed_stage("news_summary"):
+            summaries = news_summarizer.summarize(bodies, [r["news_title"] for r in rows], summary_max)
+        for row, summary in zip(rows, summaries):
+            if summary:
+                row["news_body_summary"] = summary
+
+    if archive is not None:
+        archive.close()
+        print(f"[뉴스] 아카이브: 외부 조회 {_archive_fetched}종목, 아카이브 재사용 {_archive_reused}종목, 본문 재사용 {_body_reused}건")
+        metrics.cache_lookup("news_archive", hit=True, count=_archive_reused)
+        metrics.cache_lookup("news_archive", hit=False, count=_archive_fetched)
+        metrics.cache_lookup("article_body", hit=True, count=_body_reused)
+        metrics.cache_lookup("article_body", hit=False, count=_body_fetched)
 
     df = pd.DataFrame(rows)
     if debug and filter_by_date and target_date:
@@ -277,6 +387,14 @@ def run_news_collector(
         df["news_body_summary"] = []
     elif "news_body_summary" not in df.columns:
         df["news_body_summary"] = ""
+    if news_cfg.get("index_enabled", True) and not df.empty:
+        # 전문 검색 색인에 누적 (색인 실패는 수집 결과에 영향 없음)
+        from src import news_index
+
+        try:
+            news_index.add_news(df, target_date)
+        except Exception as e:
+            print(f"[뉴스] 검색 색인 저장 실패: {e}")
     return df
 
 
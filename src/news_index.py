@@ -0,0 +1,229 @@
+"""
+뉴스 전문 검색 색인: 수집한 뉴스 제목·요약·본문 요약을 SQLite FTS5(trigram 토크나이저)에 누적.
+trigram은 형태소 분석 없이 3글자 단위로 색인하므로 한국어 복합어("유상증자를")의 부분 일치도 검색된다.
+2글자 검색어(실적·수주·급등)는 trigram으로 찾을 수 없어 2글자 단위 보조 색인(article_bigrams)을 쓰고,
+1글자 검색어만 전체 스캔한다. (ticker, date) 컬럼으로 종목·기간을 걸러 bm25 순으로 반환.
+색인 파일: cache/news_index.sqlite3
+"""
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+
+import pandas as pd
+
+from src.config_loader import CACHE_ROOT
+
+INDEX_PATH = CACHE_ROOT / "news_index.sqlite3"
+MIN_TERM_CHARS = 3  # trigram 색인으로 찾을 수 있는 최소 검색어 길이 (2글자는 bigram 보조 색인, 1글자는 LIKE 스캔)
+SCHEMA_VERSION = 1  # 1: article_bigrams 추가 (기존 색인은 열 때 한 번 채움)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles(
+    id INTEGER PRIMARY KEY,
+    ticker TEXT NOT NULL,
+    name TEXT,
+    date TEXT NOT NULL,
+    link TEXT NOT NULL,
+    title TEXT,
+    summary TEXT,
+    body TEXT,
+    UNIQUE(ticker, link)
+);
+CREATE INDEX IF NOT EXISTS articles_date ON articles(date);
+CREATE INDEX IF NOT EXISTS articles_ticker_date ON articles(ticker, date);
+CREATE TABLE IF NOT EXISTS article_bigrams(
+    gram TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    PRIMARY KEY (gram, id)
+) WITHOUT ROWID;
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, summary, body, content='articles', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts(rowid, title, summary, body) VALUES (new.id, new.title, new.summary, new.body);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, summary, body)
+    VALUES ('delete', old.id, old.title, old.summary, old.body);
+    DELETE FROM article_bigrams WHERE id = old.id;
+END;
+CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, summary, body)
+    VALUES ('delete', old.id, old.title, old.summary, old.body);
+    INSERT INTO articles_fts(rowid, title, summary, body) VALUES (new.id, new.title, new.summary, new.body);
+END;
+"""
+
+
+def _connect(path: Path | None = None) -> sqlite3.Connection:
+    path = path or INDEX_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+        with conn:
+            _index_bigrams(conn, [r["id"] for r in conn.execute("SELECT id FROM articles")])
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return conn
+
+
+def _bigrams(*texts: str) -> set[str]:
+    """Every 2-character substring within whitespace-separated words (lowercased like the trigram index)."""
+    grams = set()
+    for text in texts:
+        for word in (text or "").lower().split():
+            grams.update(word[i:i + 2] for i in range(len(word) - 1))
+    return grams
+
+
+def _index_bigrams(conn: sqlite3.Connection, ids: list[int]) -> None:
+    """(Re)build the bigram rows of the given articles from their stored title/summary/body."""
+    for i in range(0, len(ids), 500):
+        chunk = ids[i:i + 500]
+        marks = ",".join("?" * len(chunk))
+        conn.execute(f"DELETE FROM article_bigrams WHERE id IN ({marks})", chunk)
+        rows = conn.execute(f"SELECT id, title, summary, body FROM articles WHERE id IN ({marks})", chunk)
+        conn.executemany(
+            "INSERT INTO article_bigrams(gram, id) VALUES (?, ?)",
+            [(g, r["id"]) for r in rows for g in _bigrams(r["title"], r["summary"], r["body"])],
+        )
+
+
+def add_news(news_df: pd.DataFrame, target_date: str | None = None, path: Path | None = None) -> int:
+    """
+    Index run_news_collector output. Article date comes from news_date (API pubDate or YYYYMMDD),
+    falling back to target_date when it cannot be parsed. Re-indexing the same (ticker, link)
+    updates the row; a fallback date never replaces a parsed one. Returns number of rows written.
+    """
+    if news_df is None or news_df.empty:
+        return 0
+    from src.news_archive import pub_timestamp
+
+    rows = []
+    for r in news_df.itertuples(index=False):
+        title = str(getattr(r, "news_title", "") or "")
+        link = str(getattr(r, "news_link", "") or "") or f"#{title}"
+        ts = pub_timestamp(str(getattr(r, "news_date", "") or ""))
+        body = str(getattr(r, "news_body_summary", "") or "")
+        rows.append((
+            str(r.ticker).zfill(6),
+            str(getattr(r, "name", "") or ""),
+            ts[:8] if ts else target_date or "",
+            link,
+            title,
+            str(getattr(r, "news_summary", "") or ""),
+            "" if body == "(요약 없음)" else body,
+            ts is not None,
+        ))
+    with closing(_connect(path)) as conn, conn:
+        conn.executemany(
+            """
+            INSERT INTO articles(ticker, name, date, link, title, summary, body) VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(ticker, link) DO UPDATE SET
+                name=excluded.name, date=CASE WHEN ? THEN excluded.date ELSE articles.date END,
+                title=excluded.title, summary=excluded.summary,
+                body=CASE WHEN excluded.body != '' THEN excluded.body ELSE articles.body END
+            """,
+            rows,
+        )
+        ids = [
+            r[0] for key in {(row[0], row[3]) for row in rows}
+            for r in conn.execute("SELECT id FROM articles WHERE ticker = ? AND link = ?", key)
+        ]
+        _index_bigrams(conn, ids)
+    return len(rows)
+
+
+def _fts_query(terms: list[str]) -> str:
+    """All terms must match (implicit AND); each is a quoted phrase so FTS syntax chars are literal."""
+    return " ".join('"' + t.replace('"', '""') + '"' for t in terms)
+
+
+def search(
+    query: str,
+    start: str | None = None,
+    end: str | None = None,
+    tickers: list[str] | None = None,
+    limit: int = 20,
+    path: Path | None = None,
+) -> list[dict]:
+    """
+    Ranked matches for query (whitespace-separated terms, all required) within [start, end] (YYYYMMDD).
+    Terms of 3+ characters use the FTS5 trigram index ranked by bm25 (title weighted highest).
+    A query with shorter terms is ordered by date: 2-character terms go through the bigram table,
+    longer ones through the trigram index, and only 1-character terms fall back to a substring scan.
+    Returns dicts: ticker, name, date, title, link, snippet, score.
+    """
+    terms = query.split()
+    if not terms:
+        return []
+    where, args = [], []
+    if start:
+        where.append("a.date >= ?")
+        args.append(start)
+    if end:
+        where.append("a.date <= ?")
+        args.append(end)
+    if tickers:
+        where.append(f"a.ticker IN ({','.join('?' * len(tickers))})")
+        args.extend(str(t).zfill(6) for t in tickers)
+
+    if all(len(t) >= MIN_TERM_CHARS for t in terms):
+        sql = f"""
+            SELECT a.ticker, a.name, a.date, a.title, a.link,
+                   snippet(articles_fts, -1, '[', ']', '…', 16) AS snippet,
+                   bm25(articles_fts, 5.0, 2.0, 1.0) AS score
+            FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid
+            WHERE articles_fts MATCH ? {''.join(' AND ' + w for w in where)}
+            ORDER BY score LIMIT ?
+        """
+        args = [_fts_query(terms), *args, limit]
+    else:
+        long_terms = [t for t in terms if len(t) >= MIN_TERM_CHARS]
+        if long_terms:
+            where.append("a.id IN (SELECT rowid FROM articles_fts WHERE articles_fts MATCH ?)")
+            args.append(_fts_query(long_terms))
+        for t in terms:
+            if len(t) == 2:
+                where.append("a.id IN (SELECT id FROM article_bigrams WHERE gram = ?)")
+                args.append(t.lower())
+            elif len(t) == 1:
+                where.append("(a.title || ' ' || a.summary || ' ' || a.body) LIKE ?")
+                args.append(f"%{t}%")
+        sql = f"""
+            SELECT a.ticker, a.name, a.date, a.title, a.link, substr(a.body, 1, 80) AS snippet, NULL AS score
+            FROM articles a WHERE {' AND '.join(where)}
+            ORDER BY a.date DESC LIMIT ?
+        """
+        args.append(limit)
+    with closing(_connect(path)) as conn:
+        return [dict(r) for r in conn.execute(sql, args)]
+
+
+def index_stored_outputs(output_root: Path | None = None, path: Path | None = None) -> int:
+    """Index every stored output/{date}[/{profile}]/news.csv (e.g. after enabling the index). Returns rows."""
+    from src.results_store import OUTPUT_ROOT, read_result_csv
+
+    root = output_root or OUTPUT_ROOT
+    total = 0
+    for csv_path in sorted(root.glob("*/news.csv")) + sorted(root.glob("*/*/news.csv")):
+        date_dir = csv_path.parent if csv_path.parent.parent == root else csv_path.parent.parent
+        df = read_result_csv(csv_path)
+        total += add_news(df, target_date=date_dir.name, path=path)
+    return total
+
+
+def stats(path: Path | None = None) -> dict:
+    with closing(_connect(path)) as conn:
+        n, lo, hi = conn.execute("SELECT COUNT(*), MIN(date), MAX(date) FROM articles").fetchone()
+    return {"articles": n, "first_date": lo, "last_date": hi}
+
+
+def timed_search(query: str, **kwargs) -> tuple[list[dict], float]:
+    """search() plus elapsed milliseconds (for CLI/API output)."""
+    t0 = time.perf_counter()
+    rows = search(query, **kwargs)
+    return rows, (time.perf_counter() - t0) * 1000
@@ -0,0 +1,163 @@
+"""
+뉴스 HTML 파싱 단계: 내려받은 원본 바이트에서 기사 본문·검색 결과를 추출하는 순수 함수와 파싱 실행기.
+다운로드(네트워크 I/O)와 분리되어 있어, ParseStage가 프로세스 풀에서 실행하면 파싱이 GIL을 벗어나
+다운로드와 겹쳐 진행되고 코어 수만큼 늘어난다. 함수는 모두 모듈 수준이라 pickle로 작업자에 전달된다.
+"""
+import multiprocessing
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+
+# 기사 본문 선택자 (여러 언론사 공통)
+ARTICLE_SELECTORS = [
+    "#news_body", ".news_body", "#articleBody", ".article_body", ".article-body",
+    "div[itemprop='articleBody']", "article", ".article_view", "#articeBody",
+    ".content_body", ".news_view", "#newsct_article", "main article",
+]
+
+
+def decode(content: bytes, encoding: str | None = None) -> str:
+    """Decode response bytes; without an encoding, detect it (same detector requests uses)."""
+    if encoding is None:
+        from charset_normalizer import from_bytes
+
+        best = from_bytes(content).best()
+        encoding = best.encoding if best else None
+    return content.decode(encoding or "utf-8", errors="replace")
+
+
+def article_body(content: bytes) -> str:
+    """Extract article body text from raw HTML bytes. Returns empty string on failure."""
+    from bs4 import BeautifulSoup
+
+    try:
+        soup = BeautifulSoup(decode(content), "html.parser")
+        # Remove script/style
+        for tag in soup(["script", "style"]):
+            tag.decompose()
+        text_parts = []
+        for sel in ARTICLE_SELECTORS:
+            for el in soup.select(sel):
+                t = el.get_text(separator=" ", strip=True)
+                if t and len(t) > 100:
+                    text_parts.append(t)
+                    break
+            if text_parts:
+                break
+        if not text_parts:
+            # Fallback: first main or div with many p
+            for main in soup.select("main, #main, .main, #content"):
+                t = main.get_text(separator=" ", strip=True)
+                if t and len(t) > 80:
+                    text_parts.append(t)
+                    break
+        return " ".join(text_parts) if text_parts else ""
+    except Exception:
+        return ""
+
+
+def search_results(content: bytes, max_articles: int = 20) -> list[dict]:
+    """Naver news search page (UTF-8 bytes) -> list of {title, link, description, pubDate}."""
+    from bs4 import BeautifulSoup
+
+    try:
+        soup = BeautifulSoup(decode(content, "utf-8"), "html.parser")
+        rows = []
+        seen_links = set()
+        # 1) news_area > news_tit (최신 구조)
+        for group in soup.select("div.news_area")[:max_articles * 2]:
+            tit = group.select_one("a.news_tit")
+            if not tit:
+                tit = group.select_one("a[href*='news'], a[href*='article']")
+            if not tit:
+                continue
+            link = tit.get("href", "").split("?")[0]
+            if link in seen_links:
+                continue
+            seen_links.add(link)
+            title = tit.get_text(strip=True)
+            dsc = group.select_one("div.news_dsc, a.dsc_wrap, span.news_dsc, a.link_tit")
+            summary = dsc.get_text(strip=True) if dsc else ""
+            info = group.select_one("span.info, span.info_group")
+            pub_date = info.get_text(strip=True) if info else ""
+            rows.append({"title": title, "link": tit.get("href", ""), "description": summary, "pubDate": pub_date})
+            if len(rows) >= max_articles:
+                break
+        # 2) a.news_tit 단독
+        if len(rows) < max_articles:
+            for a in soup.select("a.news_tit"):
+                if len(rows) >= max_articles:
+                    break
+                href = a.get("href", "")
+                if not href or href in seen_links:
+                    continue
+                seen_links.add(href)
+                title = a.get_text(strip=True)
+                if title and len(title) > 5:
+                    rows.append({"title": title, "link": href, "description": "", "pubDate": ""})
+        # 3) 뉴스 링크 패턴 (list_news, bx 등)
+        if len(rows) < max_articles:
+            for a in soup.select("ul.list_news a[href*='article'], div.bx a[href*='news'], div.bx a[href*='article']"):
+                if len(rows) >= max_articles:
+                    break
+                href = a.get("href", "")
+                if not href or href in seen_links:
+                    continue
+                title = a.get_text(strip=True)
+                if not title or len(title) < 5:
+                    continue
+                seen_links.add(href)
+                rows.append({"title": title, "link": href, "description": "", "pubDate": ""})
+        return rows[:max_articles]
+    except Exception:
+        return []
+
+
+def completed(value) -> Future:
+    """Already-resolved future (results that need no parsing)."""
+    fut: Future = Future()
+    fut.set_result(value)
+    return fut
+
+
+class ParseStage:
+    """
+    Runs parse functions on raw bytes. workers=0 parses inline (returns completed futures);
+    workers>0 uses a process pool fed by a bounded queue: at most max_pending raw pages are in flight,
+    and submit() blocks the downloader until a slot frees up.
+    """
+
+    def __init__(self, workers: int = 0, max_pending: int = 32):
+        self.workers = max(0, int(workers))
+        self.max_pending = max(1, int(max_pending))
+        self._pool = None
+        self._in_flight: deque[Future] = deque()
+        if self.workers:
+            # spawn: 작업자는 이 모듈만 다시 import (부모의 스레드·연결 상태를 fork로 복제하지 않음)
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def submit(self, fn, *args) -> Future:
+        if self._pool is None:
+            fut: Future = Future()
+            try:
+                fut.set_result(fn(*args))
+            except Exception as e:
+                fut.set_exception(e)
+            return fut
+        while len(self._in_flight) >= self.max_pending:
+            wait(self._in_flight, return_when=FIRST_COMPLETED)
+            self._in_flight = deque(f for f in self._in_flight if not f.done())
+        fut = self._pool.submit(fn, *args)
+        self._in_flight.append(fut)
+        return fut
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        self._in_flight.clear()
+
+    def __enter__(self) -> "ParseStage":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,133 @@
+"""
+뉴스 감성 점수: 한국어 금융 감성 사전(config/sentiment_lexicon.yaml)으로 기사 제목·본문 요약을 일괄 채점.
+전체 기사를 한 번에 단어 단위로 나눠 문서×단어 희소 행렬(COO)로 만들고, 고유 단어별 사전 가중치를
+한 번만 찾은 뒤 bincount로 기사별 호재/악재 합을 구한다 (기사 수천 건도 한 번의 벡터 연산).
+기사 점수 = (호재 - 악재) / (호재 + 악재 + 1), -1 ~ 1. 종목 점수 = 기사 점수 평균.
+"""
+import re
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.config_loader import PROJECT_ROOT
+
+TOKEN_PATTERN = r"[0-9A-Za-z가-힣]+"
+_TAG_RE = re.compile(r"<[^>]+>")
+
+_lock = threading.Lock()
+_cache: dict[Path, tuple[float, "Lexicon"]] = {}
+
+
+class Lexicon:
+    """Term -> weight (positive = good news); a token matches the longest term it starts with."""
+
+    def __init__(self, weights: dict[str, float], negations: list[str] | None = None):
+        self.weights = {str(k).replace(" ", ""): float(v) for k, v in weights.items() if str(k).strip()}
+        self.negations = tuple(str(n) for n in (negations or []))
+        self.max_len = max((len(k) for k in self.weights), default=0)
+
+    @classmethod
+    def read(cls, path: Path) -> "Lexicon":
+        """YAML with positive / negative term maps (or a flat term: weight map) and an optional negations list."""
+        import yaml
+
+        data = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+        weights: dict[str, float] = {}
+        for key in ("positive", "negative"):
+            weights.update(data.pop(key, None) or {})
+        negations = data.pop("negations", None) or []
+        weights.update({k: v for k, v in data.items() if isinstance(v, (int, float))})
+        return cls(weights, negations)
+
+    def token_weights(self, vocab: np.ndarray) -> np.ndarray:
+        """Weight per unique token (longest matching term prefix, 0 when none)."""
+        out = np.zeros(len(vocab))
+        get = self.weights.get
+        for i, tok in enumerate(vocab):
+            for n in range(min(len(tok), self.max_len), 0, -1):
+                w = get(tok[:n])
+                if w is not None:
+                    out[i] = w
+                    break
+        return out
+
+    def is_negation(self, vocab: np.ndarray) -> np.ndarray:
+        if not self.negations:
+            return np.zeros(len(vocab), dtype=bool)
+        return np.array([tok.startswith(self.negations) for tok in vocab], dtype=bool)
+
+
+def _resolve(path: str | Path) -> Path:
+    p = Path(path)
+    if not p.is_absolute() and not p.exists():
+        p = PROJECT_ROOT / p
+    if not p.exists():
+        raise FileNotFoundError(f"감성 사전 파일 없음: {path}")
+    return p
+
+
+def load_lexicon(path: str | Path) -> Lexicon:
+    """Load (and cache by modification time) a sentiment lexicon file."""
+    p = _resolve(path)
+    mtime = p.stat().st_mtime
+    with _lock:
+        hit = _cache.get(p)
+        if hit is not None and hit[0] == mtime:
+            return hit[1]
+    lexicon = Lexicon.read(p)
+    with _lock:
+        _cache[p] = (mtime, lexicon)
+    return lexicon
+
+
+def polarity(texts, lexicon: Lexicon) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (positive, negative) weight sums per text. Texts are tokenized together into a document x token
+    COO matrix (doc ids, vocabulary codes); tokens followed by a negation token are dropped.
+    """
+    n = len(texts)
+    tokens = pd.Series(texts, dtype=object).fillna("").astype(str).str.findall(TOKEN_PATTERN).explode().dropna()
+    if tokens.empty:
+        return np.zeros(n), np.zeros(n)
+    doc = tokens.index.to_numpy(dtype=np.int64)
+    codes, vocab = pd.factorize(tokens.to_numpy(dtype=object))
+    vocab = np.asarray(vocab, dtype=object)
+    w = lexicon.token_weights(vocab)[codes]
+    neg = lexicon.is_negation(vocab)[codes]
+    negated = np.zeros(len(w), dtype=bool)
+    negated[:-1] = neg[1:] & (doc[1:] == doc[:-1])  # 같은 문서에서 바로 다음 단어가 부정어
+    w[negated] = 0
+    pos = np.bincount(doc, weights=np.clip(w, 0, None), minlength=n)
+    negw = np.bincount(doc, weights=np.clip(-w, 0, None), minlength=n)
+    return pos, negw
+
+
+def score_articles(news_df: pd.DataFrame, lexicon: Lexicon, title_weight: float = 2.0) -> np.ndarray:
+    """Sentiment in [-1, 1] per news row (title counted title_weight times, plus body summary or description)."""
+    if news_df.empty:
+        return np.zeros(0)
+    title = news_df["news_title"] if "news_title" in news_df.columns else pd.Series("", index=news_df.index)
+    body = news_df.get("news_body_summary", pd.Series("", index=news_df.index)).fillna("").astype(str)
+    summary = news_df.get("news_summary", pd.Series("", index=news_df.index)).fillna("").astype(str)
+    body = body.where(body.str.len().gt(0) & body.ne("(요약 없음)"), summary).str.replace(_TAG_RE, " ", regex=True)
+    tp, tn = polarity(title.to_numpy(dtype=object), lexicon)
+    bp, bn = polarity(body.to_numpy(dtype=object), lexicon)
+    pos, neg = title_weight * tp + bp, title_weight * tn + bn
+    return (pos - neg) / (pos + neg + 1.0)
+
+
+def add_sentiment(news_df: pd.DataFrame, cfg: dict) -> pd.DataFrame:
+    """news_df with a "sentiment" column (news.sentiment: lexicon_file, title_weight)."""
+    lexicon = load_lexicon(cfg.get("lexicon_file", "config/sentiment_lexicon.yaml"))
+    out = news_df.copy()
+    out["sentiment"] = np.round(score_articles(out, lexicon, cfg.get("title_weight", 2.0)), 4)
+    return out
+
+
+def sentiment_by_ticker(news_df: pd.DataFrame) -> pd.Series:
+    """ticker -> mean article sentiment (for ranker)."""
+    if news_df is None or news_df.empty or "sentiment" not in news_df.columns:
+        return pd.Series(dtype=float)
+    return news_df.groupby("ticker")["sentiment"].mean().round(4)
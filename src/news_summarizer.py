@@ -0,0 +1,114 @@
+"""
+기사 본문 추출 요약: 당일 수집한 전체 기사 본문을 한 번에 문장 단위로 나누고 문장×단어 TF-IDF 희소 행렬(COO)을
+만들어, 기사마다 문장이 기사 중심(같은 기사 문장들 + 제목 가중)과 얼마나 가까운지로 점수를 매긴다.
+점수 높은 문장을 글자 수 한도(news.summary_max_chars) 안에서 골라 원문 순서로 잇는다.
+IDF는 당일 전체 기사 기준이라 모든 기사에 흔한 상투어보다 기사 고유 내용이 높게 평가된다.
+모델·네트워크 없이 numpy 벡터 연산만 쓰며, 기자명·이메일·저작권 문구는 후보에서 뺀다.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+from src.news_sentiment import TOKEN_PATTERN
+
+MIN_SENTENCE_CHARS = 15
+LEAD_CHARS = 100  # 기자명·출처 표기를 찾는 본문 앞부분 길이
+# 문장 경계: 마침표·물음표·느낌표 뒤 공백, 또는 줄바꿈
+_SENTENCE_RE = re.compile(r"(?<=[.?!])\s+|\n+")
+# 본문 첫머리의 기자명·출처 표기 (예: "[서울=뉴시스] 홍길동 기자 =", "(서울=연합뉴스) 홍길동 기자 =")
+_BYLINE_RE = re.compile(r"[\[(][^\])]{0,20}=[^\])]{0,20}[\])]|[가-힣]{2,4}\s*(?:기자|특파원)\s*=")
+# 포함되면 후보에서 제외하는 문구 (이메일이 붙은 기자 서명 문장 포함)
+_BOILERPLATE_RE = re.compile(r"@|무단\s*전재|재배포\s*금지|저작권자|ⓒ|©|▶|☞|구독|제보는|기사\s*원문|[가-힣]{2,4}\s*기자\s*$")
+
+
+def split_sentences(bodies) -> pd.Series:
+    """
+    Candidate sentences of every body (index = body position, original order): bylines, boilerplate and
+    repeated sentences of the same body (captions, duplicated blocks) removed.
+    """
+    text = pd.Series(bodies, dtype=object).fillna("").astype(str)
+    text = text.str[:LEAD_CHARS].str.replace(_BYLINE_RE, " ", regex=True) + text.str[LEAD_CHARS:]
+    sentences = text.str.split(_SENTENCE_RE).explode().dropna().str.strip()
+    keep = sentences.str.len().ge(MIN_SENTENCE_CHARS) & ~sentences.str.contains(_BOILERPLATE_RE)
+    sentences = sentences[keep]
+    return sentences[~pd.MultiIndex.from_arrays([sentences.index, sentences.to_numpy()]).duplicated()]
+
+
+def sentence_scores(unit_doc: np.ndarray, unit_text: np.ndarray, is_title: np.ndarray, n_docs: int, title_weight: float) -> np.ndarray:
+    """
+    Centrality per unit (sentence or title): cosine-like similarity of its TF-IDF vector to the rest of its
+    article (other sentences + title x title_weight), from one tokenization over all units.
+    """
+    n_units = len(unit_text)
+    tokens = pd.Series(unit_text, dtype=object).str.findall(TOKEN_PATTERN).explode().dropna()
+    if tokens.empty:
+        return np.zeros(n_units)
+    unit = tokens.index.to_numpy(dtype=np.int64)
+    codes, vocab = pd.factorize(tokens.str.lower().to_numpy(dtype=object))
+    n_vocab = len(vocab)
+    # 단위×단어 빈도 (COO: 고유 키 = unit * V + code)
+    keys, tf = np.unique(unit * n_vocab + codes, return_counts=True)
+    unit_of, tok_of = keys // n_vocab, keys % n_vocab
+    doc_of = unit_doc[unit_of]
+    # IDF: 당일 기사 수 기준 문서 빈도
+    df = np.bincount(np.unique(doc_of * n_vocab + tok_of) % n_vocab, minlength=n_vocab)
+    idf = np.log((1.0 + n_docs) / (1.0 + df)) + 1.0
+    w = (1.0 + np.log(tf)) * idf[tok_of]
+    norm = np.sqrt(np.bincount(unit_of, weights=w * w, minlength=n_units))
+    w /= norm[unit_of]
+    # 기사 중심 벡터 (기사×단어): 문장 벡터 합 + 제목 벡터 × title_weight
+    scale = np.where(is_title[unit_of], title_weight, 1.0)
+    centroid_keys, inverse = np.unique(doc_of * n_vocab + tok_of, return_inverse=True)
+    centroid = np.bincount(inverse, weights=w * scale)
+    centroid_norm = np.sqrt(np.bincount(centroid_keys // n_vocab, weights=centroid**2, minlength=n_docs))
+    # 자기 자신의 기여를 뺀 내적 / 중심 크기
+    dot = np.bincount(unit_of, weights=w * (centroid[inverse] - w * scale), minlength=n_units)
+    denom = centroid_norm[unit_doc]
+    return np.divide(dot, denom, out=np.zeros(n_units), where=denom > 0)
+
+
+def summarize(bodies, titles=None, max_chars: int = 300, title_weight: float = 2.0) -> list[str]:
+    """
+    Extractive summary per body within max_chars: top-scoring sentences (see sentence_scores) taken in score
+    order while they fit, joined in original order. When even the best sentence is too long it is cut with "...".
+    Bodies without usable sentences give "" (callers fall back to the description).
+    """
+    n = len(bodies)
+    sentences = split_sentences(bodies)
+    if sentences.empty:
+        return [""] * n
+    sent_doc = sentences.index.to_numpy(dtype=np.int64)
+    sent_text = sentences.to_numpy(dtype=object)
+    if titles is not None:
+        title_text = pd.Series(titles, dtype=object).fillna("").astype(str).str.replace(r"<[^>]+>", " ", regex=True)
+        title_doc = np.arange(n, dtype=np.int64)
+    else:
+        title_text, title_doc = pd.Series([], dtype=object), np.zeros(0, dtype=np.int64)
+    unit_doc = np.concatenate([sent_doc, title_doc])
+    unit_text = np.concatenate([sent_text, title_text.to_numpy(dtype=object)])
+    is_title = np.r_[np.zeros(len(sent_doc), dtype=bool), np.ones(len(title_doc), dtype=bool)]
+    scores = sentence_scores(unit_doc, unit_text, is_title, n, title_weight)[: len(sent_doc)]
+
+    # 기사별 점수 내림차순으로 정렬 → 기사 안 누적 길이(구분 공백 포함)가 한도 안인 문장 선택
+    position = np.arange(len(sent_doc))
+    order = np.lexsort((position, -scores, sent_doc))
+    doc_sorted = sent_doc[order]
+    lengths = np.fromiter((len(s) + 1 for s in sent_text[order]), dtype=np.int64, count=len(order))
+    cum = np.cumsum(lengths)
+    starts = np.r_[0, np.flatnonzero(doc_sorted[1:] != doc_sorted[:-1]) + 1]
+    group_start = np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+    within = cum - np.r_[0, cum][group_start]
+    taken = order[within <= max_chars + 1]
+
+    out = [""] * n
+    chosen = pd.Series(sent_text[taken], index=sent_doc[taken]).iloc[np.argsort(position[taken], kind="stable")]
+    for doc, text in chosen.groupby(level=0).agg(" ".join).items():
+        out[doc] = text
+    # 가장 높은 문장도 한도를 넘는 기사: 그 문장을 잘라서 사용
+    for i in starts:
+        doc = doc_sorted[i]
+        if not out[doc]:
+            best = sent_text[order[i]]
+            out[doc] = best[:max_chars] + ("..." if len(best) > max_chars else "")
+    return out
@@ -0,0 +1,340 @@
+"""
+로컬 OHLCV 저장소: 일자별 전종목 스냅샷(cache/ohlcv/days/{date}.npz)과
+이를 모은 일자×종목 패널(cache/ohlcv/panel/g{세대}/{field}.npy, 메모리 매핑)을 관리.
+패널은 여유 행·열을 두고 만들어 새 거래일은 제자리에 행만 추가하고, 과거 일자가 들어오거나 여유가 모자라면
+새 세대 디렉터리를 만든 뒤 manifest.json을 바꾼다 (이미 매핑된 파일은 교체하지 않음).
+휴장일은 표식 파일(days/{date}.closed, 내용 = 판단 근거)로 기록해 다시 조회하지 않는다.
+표식은 CLOSED_MARKER_DAYS가 지나면 무시되어 한 번 더 확인한다 (일시적 조회 실패가 휴장으로 굳지 않도록).
+"""
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.config_loader import CACHE_ROOT
+from src.universe import normalize_tickers
+
+STORE_ROOT = CACHE_ROOT / "ohlcv"
+FIELDS = ("open", "high", "low", "close", "volume", "trading_value", "change_pct")
+_KRX_COLUMNS = {
+    "시가": "open", "고가": "high", "저가": "low", "종가": "close",
+    "거래량": "volume", "거래대금": "trading_value", "등락률": "change_pct",
+}
+_KRX_NAMES = {v: k for k, v in _KRX_COLUMNS.items()}
+
+# 휴장 표식 유효 기간 (일). 지나면 그 일자를 다시 조회해 확인
+CLOSED_MARKER_DAYS = 30
+
+_lock = threading.Lock()
+_panel = None
+
+
+def _days_dir() -> Path:
+    return STORE_ROOT / "days"
+
+
+def _panel_dir() -> Path:
+    return STORE_ROOT / "panel"
+
+
+def snapshot_path(date: str) -> Path:
+    return _days_dir() / f"{date}.npz"
+
+
+def _closed_path(date: str) -> Path:
+    return _days_dir() / f"{date}.closed"
+
+
+def _marker_fresh(path: Path, closed_marker_days: float) -> bool:
+    try:
+        return time.time() - path.stat().st_mtime < closed_marker_days * 86400
+    except FileNotFoundError:
+        return False
+
+
+def mark_closed(date: str, evidence: str) -> None:
+    """Write (or refresh) the closed-day marker; evidence is kept in the file for inspection."""
+    _days_dir().mkdir(parents=True, exist_ok=True)
+    _closed_path(date).write_text(evidence, encoding="utf-8")
+
+
+def clear_closed(dates) -> int:
+    """Remove closed-day markers for dates (e.g. a trading day recorded as closed after a KRX failure)."""
+    removed = 0
+    for d in dates:
+        try:
+            _closed_path(d).unlink()
+            removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
+
+
+def save_snapshot(date: str, df: pd.DataFrame) -> None:
+    """Store one day's raw all-market OHLCV frame (pykrx columns). Closed days go through mark_closed."""
+    if df is None or df.empty:
+        raise ValueError(f"빈 OHLCV는 저장하지 않음: {date}")
+    df = df.rename(columns=_KRX_COLUMNS)
+    arrays = {"tickers": normalize_tickers(df.index).to_numpy(dtype="U6")}
+    for f in FIELDS:
+        arrays[f] = (
+            pd.to_numeric(df[f], errors="coerce").to_numpy(dtype=np.float64) if f in df.columns
+            else np.full(len(df), np.nan)
+        )
+    path = snapshot_path(date)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.stem + ".tmp.npz")
+    np.savez(tmp, **arrays)
+    tmp.replace(path)
+    _closed_path(date).unlink(missing_ok=True)
+
+
+def load_snapshot(date: str) -> dict[str, np.ndarray] | None:
+    """Arrays (tickers + FIELDS) for a stored day, or None if not stored."""
+    path = snapshot_path(date)
+    if not path.exists():
+        return None
+    with np.load(path) as z:
+        return {k: z[k] for k in z.files}
+
+
+def load_frame(date: str) -> pd.DataFrame | None:
+    """A stored day as the raw all-market frame (pykrx columns, index = 티커), or None if not stored."""
+    arrays = load_snapshot(date)
+    if arrays is None:
+        return None
+    columns = {}
+    for f in FIELDS:
+        v = arrays[f]
+        if np.isnan(v).all():
+            continue
+        if f != "change_pct" and np.isfinite(v).all() and (v == np.round(v)).all():
+            v = v.astype(np.int64)
+        columns[_KRX_NAMES[f]] = v
+    return pd.DataFrame(columns, index=pd.Index(arrays["tickers"].astype(object), name="티커"))
+
+
+def stored_days(closed_marker_days: float = CLOSED_MARKER_DAYS) -> dict[str, bool]:
+    """Stored dates -> True for trading days, False for closed days (expired markers are left out)."""
+    days = _days_dir()
+    out = {p.stem: False for p in days.glob("*.closed") if _marker_fresh(p, closed_marker_days)}
+    out.update({p.stem: True for p in days.glob("*.npz") if p.stem.isdigit()})
+    return dict(sorted(out.items()))
+
+
+def ensure_snapshots(dates: list[str], fetch: bool = True) -> list[str]:
+    """
+    Make sure every date has a snapshot, fetching missing ones through market_data (cached, cassette-aware).
+    Only dates before today are stored (today's frame may be intraday or not yet published), and only
+    non-empty frames fetched for that date: holidays are recorded by market_data/trading_calendar, and a frame
+    served from an older stale snapshot is not stored under this date.
+    Dates the trading calendar already knows to be holidays (unexpired closed markers) are not fetched.
+    Returns the trading dates among `dates` (sorted) that are stored.
+    """
+    from src import trading_calendar
+
+    calendar = trading_calendar.get_calendar()
+    today = datetime.now().strftime("%Y%m%d")
+    missing = [d for d in dates if d < today and not snapshot_path(d).exists() and calendar.is_trading_day(d)]
+    if missing and fetch:
+        from src import market_data
+
+        print(f"[OHLCV 저장소] {len(missing)}일 조회")
+        for d in missing:
+            try:
+                df = market_data.get_market_ohlcv(d)
+            except Exception as e:
+                print(f"[{d}] OHLCV 조회 실패: {e}")
+                continue
+            if df is None or df.empty or market_data.served_stale("ohlcv", d):
+                continue
+            save_snapshot(d, df)
+    return [d for d in sorted(dates) if snapshot_path(d).exists()]
+
+
+def calendar_window(end_date: str, trading_days: int) -> list[str]:
+    """Weekdays ending at end_date, enough to cover `trading_days` sessions plus KRX holidays."""
+    end = datetime.strptime(end_date, "%Y%m%d")
+    span = int(trading_days * 7 / 5) + 15 + trading_days // 20
+    out, d = [], end - timedelta(days=span)
+    while d <= end:
+        if d.weekday() < 5:
+            out.append(d.strftime("%Y%m%d"))
+        d += timedelta(days=1)
+    return out
+
+
+class Panel:
+    """
+    Date×ticker arrays over every stored trading day.
+    dates: sorted YYYYMMDD array; tickers: pd.Index of 6-char codes (codes first seen in appended days
+    come after the others, so column order is not sorted);
+    fields[name]: read-only np.memmap of shape (len(dates), len(tickers)), NaN where a stock had no row.
+    """
+
+    def __init__(self, dates: np.ndarray, tickers: pd.Index, fields: dict[str, np.ndarray]):
+        self.dates = dates
+        self.tickers = tickers
+        self.fields = fields
+
+    def row(self, date: str) -> int:
+        """Row index of date (-1 when not a stored trading day)."""
+        i = int(np.searchsorted(self.dates, date))
+        return i if i < len(self.dates) and self.dates[i] == date else -1
+
+    def window(self, field: str, end_date: str, n: int, tickers=None) -> np.ndarray:
+        """Last n rows up to end_date (inclusive) for field, columns ordered like tickers (NaN if absent)."""
+        end = self.row(end_date)
+        if end < 0:
+            raise KeyError(f"저장소에 없는 거래일: {end_date}")
+        block = self.fields[field][max(0, end - n + 1) : end + 1]
+        if tickers is None:
+            return np.asarray(block)
+        cols = self.tickers.get_indexer(normalize_tickers(tickers))
+        out = np.asarray(block)[:, np.where(cols >= 0, cols, 0)]
+        out[:, cols < 0] = np.nan
+        return out
+
+
+def _capacity(n: int) -> int:
+    """Preallocated rows/columns: room for a quarter more (at least 64) so most new days are appended in place."""
+    return n + max(64, n // 4)
+
+
+def _gen_dir(generation: int) -> Path:
+    return _panel_dir() / f"g{generation}"
+
+
+def _read_manifest() -> dict | None:
+    path = _panel_dir() / "manifest.json"
+    if not path.exists():
+        return None
+    manifest = json.loads(path.read_text(encoding="utf-8"))
+    return manifest if "generation" in manifest else None  # 이전 형식(세대 없음)은 새로 생성
+
+
+def _write_manifest(manifest: dict) -> None:
+    path = _panel_dir() / "manifest.json"
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(manifest), encoding="utf-8")
+    tmp.replace(path)
+
+
+def _save_tickers(gen_dir: Path, codes: pd.Index) -> None:
+    tmp = gen_dir / "tickers.tmp.npy"
+    np.save(tmp, codes.to_numpy(dtype="U6"))
+    tmp.replace(gen_dir / "tickers.npy")
+
+
+def _write_rows(outs: dict[str, np.memmap], codes: pd.Index, dates: list[str], start: int) -> None:
+    """Fill rows start.. from snapshots, one day at a time (spare columns stay NaN)."""
+    width = next(iter(outs.values())).shape[1]
+    for i, d in enumerate(dates, start):
+        snap = load_snapshot(d)
+        cols = codes.get_indexer(snap["tickers"])
+        for f in FIELDS:
+            row = np.full(width, np.nan)
+            row[cols] = snap[f]
+            outs[f][i] = row
+    for arr in outs.values():
+        arr.flush()
+
+
+def _build_panel(dates: list[str], generation: int) -> dict:
+    """Write a new panel generation (g{n}/) from snapshots with spare rows/columns; returns its manifest."""
+    tickers = set()
+    for d in dates:
+        with np.load(snapshot_path(d)) as z:
+            tickers.update(z["tickers"].tolist())
+    codes = pd.Index(sorted(tickers), name="ticker")
+    out_dir = _gen_dir(generation)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    shape = (_capacity(len(dates)), _capacity(len(codes)))
+    outs = {
+        f: np.lib.format.open_memmap(out_dir / f"{f}.npy", mode="w+", dtype=np.float64, shape=shape)
+        for f in FIELDS
+    }
+    _write_rows(outs, codes, dates, 0)
+    outs.clear()
+    _save_tickers(out_dir, codes)
+    return {"generation": generation, "dates": dates, "tickers": len(codes), "shape": list(shape)}
+
+
+def _append_panel(manifest: dict, new_dates: list[str]) -> dict | None:
+    """
+    Write rows for days after the last built one into the spare rows of the current generation
+    (new tickers take spare columns). None when they do not fit; the caller then builds a new generation.
+    """
+    out_dir = _gen_dir(manifest["generation"])
+    codes = pd.Index(np.load(out_dir / "tickers.npy")[: manifest["tickers"]], name="ticker")
+    added = set()
+    for d in new_dates:
+        with np.load(snapshot_path(d)) as z:
+            added.update(z["tickers"].tolist())
+    added = sorted(added.difference(codes))
+    rows, cols = manifest["shape"]
+    n_rows = len(manifest["dates"])
+    if n_rows + len(new_dates) > rows or len(codes) + len(added) > cols:
+        return None
+    codes = codes.append(pd.Index(added, name="ticker"))
+    outs = {f: np.load(out_dir / f"{f}.npy", mmap_mode="r+") for f in FIELDS}
+    _write_rows(outs, codes, new_dates, n_rows)
+    outs.clear()
+    _save_tickers(out_dir, codes)
+    return {**manifest, "dates": manifest["dates"] + new_dates, "tickers": len(codes)}
+
+
+def _remove_old_generations(current: int) -> None:
+    """Best-effort removal of superseded panel files (a Panel still mapping them keeps them alive on Windows)."""
+    import shutil
+
+    for path in _panel_dir().iterdir():
+        if path.is_dir() and path.name.startswith("g") and path.name != f"g{current}":
+            shutil.rmtree(path, ignore_errors=True)
+        elif path.suffix == ".npy":  # 세대 도입 전 형식
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+def load_panel() -> Panel:
+    """
+    Memory-mapped panel over all stored trading days. New days after the last built one are appended in
+    place; older days (backfill) or running out of spare rows/columns write a new generation directory and
+    switch the manifest to it, so files a Panel already maps are never replaced.
+    """
+    global _panel
+    with _lock:
+        dates = [d for d, trading in stored_days().items() if trading]
+        if _panel is not None and list(_panel.dates) == dates:
+            return _panel
+        if not dates:
+            _panel = Panel(np.array([], dtype="U8"), pd.Index([], name="ticker"), {})
+            return _panel
+        manifest = _read_manifest()
+        built = manifest["dates"] if manifest else None
+        if built != dates:
+            _panel = None
+            updated = None
+            if built and dates[: len(built)] == built:
+                updated = _append_panel(manifest, dates[len(built):])
+                if updated is not None:
+                    print(f"[OHLCV 저장소] 패널에 {len(dates) - len(built)}일 추가")
+            if updated is None:
+                print(f"[OHLCV 저장소] 패널 생성: {len(dates)}일")
+                updated = _build_panel(dates, manifest["generation"] + 1 if manifest else 1)
+            _write_manifest(updated)
+            _remove_old_generations(updated["generation"])
+            manifest = updated
+        out_dir, n_tickers = _gen_dir(manifest["generation"]), manifest["tickers"]
+        _panel = Panel(
+            np.array(dates),
+            pd.Index(np.load(out_dir / "tickers.npy")[:n_tickers], name="ticker"),
+            {f: np.load(out_dir / f"{f}.npy", mmap_mode="r")[: len(dates), :n_tickers] for f in FIELDS},
+        )
+        return _panel
@@ -0,0 +1,90 @@
+"""
+다일 조건 선별: 로컬 OHLCV 패널(일자×종목, 메모리 매핑)의 최근 구간으로 전종목 조건을 한 번에 계산.
+  - 거래량 급증: 당일 거래량 >= 최근 N일 평균의 K배
+  - 거래대금 연속: 최근 N거래일 연속 거래대금 >= 기준
+  - 신고가: 당일 고가 >= 직전 N거래일 최고가 (250 ≈ 52주)
+"""
+import numpy as np
+import pandas as pd
+
+from src import ohlcv_store
+
+FLAG_COLUMNS = ["vol_ratio", "value_streak", "new_high"]
+
+
+def _lookback(cfg: dict) -> int:
+    return max(
+        cfg.get("volume_avg_days", 20) + 1,
+        cfg.get("consecutive_days", 0),
+        cfg.get("new_high_days", 0) + 1,
+        2,
+    )
+
+
+def compute_flags(
+    volume: np.ndarray,
+    trading_value: np.ndarray,
+    high: np.ndarray,
+    avg_days: int,
+    min_trading_value: float,
+    high_days: int,
+) -> dict[str, np.ndarray]:
+    """
+    Window arrays (rows = trading days, last row = target day; columns = tickers) -> per-ticker flags:
+      vol_ratio:    today's volume / mean of the previous avg_days (NaN without full history)
+      value_streak: trailing consecutive days with trading_value >= min_trading_value
+      new_high:     today's high >= max high of the previous high_days (False without 90% history)
+    """
+    n_rows, n_cols = volume.shape
+    prev_vol = volume[max(0, n_rows - 1 - avg_days) : n_rows - 1]
+    count = np.isfinite(prev_vol).sum(axis=0)
+    avg = np.where(count >= avg_days, np.nansum(prev_vol, axis=0) / np.maximum(count, 1), np.nan)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        vol_ratio = np.where(avg > 0, volume[-1] / avg, np.nan)
+
+    ok = trading_value[::-1] >= min_trading_value  # NaN -> False
+    streak = np.where(ok.all(axis=0), n_rows, ok.argmin(axis=0))
+
+    new_high = np.zeros(n_cols, dtype=bool)
+    prev_high = high[max(0, n_rows - 1 - high_days) : n_rows - 1]
+    if high_days > 0 and len(prev_high):
+        enough = np.isfinite(prev_high).sum(axis=0) >= int(high_days * 0.9)
+        prior_max = np.fmax.reduce(prev_high, axis=0)  # NaN 무시
+        with np.errstate(invalid="ignore"):
+            new_high = enough & (high[-1] >= prior_max)
+    return {"vol_ratio": vol_ratio, "value_streak": streak.astype(np.int32), "new_high": new_high}
+
+
+def panel_conditions(target_date: str, tickers: np.ndarray, cfg: dict) -> tuple[pd.DataFrame, np.ndarray | None]:
+    """
+    Multi-day flags for tickers (aligned with the input order) and whether each ticker passes every
+    enabled condition (screener.panel: volume_surge_ratio, consecutive_days, new_high_days; 0 = off).
+    The pass mask is None when the store has no data for target_date (conditions not applied).
+    Missing store days are fetched once and kept in cache/ohlcv/.
+    """
+    lookback = _lookback(cfg)
+    ohlcv_store.ensure_snapshots(ohlcv_store.calendar_window(target_date, lookback))
+    panel = ohlcv_store.load_panel()
+    n = len(tickers)
+    if panel.row(target_date) < 0:
+        print(f"[{target_date}] OHLCV 저장소에 거래일 없음: 다일 조건 미적용")
+        flags = pd.DataFrame({"vol_ratio": np.full(n, np.nan), "value_streak": np.zeros(n, dtype=np.int32), "new_high": np.zeros(n, dtype=bool)})
+        return flags, None
+
+    flags = compute_flags(
+        panel.window("volume", target_date, lookback, tickers),
+        panel.window("trading_value", target_date, lookback, tickers),
+        panel.window("high", target_date, lookback, tickers),
+        avg_days=cfg.get("volume_avg_days", 20),
+        min_trading_value=float(str(cfg.get("consecutive_min_trading_value", 10_000_000_000)).replace("_", "")),
+        high_days=cfg.get("new_high_days", 0),
+    )
+    passed = np.ones(n, dtype=bool)
+    surge = cfg.get("volume_surge_ratio", 0)
+    if surge:
+        passed &= np.nan_to_num(flags["vol_ratio"], nan=0) >= surge
+    if cfg.get("consecutive_days", 0):
+        passed &= flags["value_streak"] >= cfg["consecutive_days"]
+    if cfg.get("new_high_days", 0):
+        passed &= flags["new_high"]
+    return pd.DataFrame({c: flags[c] for c in FLAG_COLUMNS}), passed
@@ -1,74 +1,188 @@
 """
 Pipeline: Screener -> News -> Theme -> Valuation -> Ranker -> Report
+(단계 모듈은 실행 시점에 import: pykrx·requests·bs4는 실제로 조회하는 단계에서만 로드)
 """
 from pathlib import Path
 
-from src import news_collector, ranker, report, screener, theme_analyzer, valuation
-from src.config_loader import load_config
+import numpy as np
+import pandas as pd
 
+from src import daily_diff, dashboard, market_data, metrics, trading_calendar
+from src.config_loader import load_config, load_profile, resolve_profile_path, use_config
+from src.results_store import result_dir
+from src.universe import TickerUniverse
 
-def run_pipeline(target_date: str, save_output: bool = True):
+
+def _recommend(ranked_df: pd.DataFrame, cfg: dict) -> pd.DataFrame | None:
+    """추천 종목 (랭크 기반): grades >= recommend.min_grade, top recommend.max_count."""
+    if ranked_df.empty or "grade" not in ranked_df.columns:
+        return None
+    rec_cfg = cfg.get("recommend", {})
+    min_grade = rec_cfg.get("min_grade", "B")
+    max_count = rec_cfg.get("max_count", 20)
+    grade_order = ["A", "B", "C", "D", "E", "F"]
+    try:
+        min_idx = grade_order.index(min_grade)
+        allowed = set(grade_order[: min_idx + 1])
+    except ValueError:
+        allowed = {"A", "B"}
+    return (
+        ranked_df[ranked_df["grade"].isin(allowed)]
+        .sort_values("score_total", ascending=False)
+        .head(max_count)
+    )
+
+
+def _print_snapshot(snap: pd.DataFrame, progress: dict) -> None:
+    """Console line per intermediate ranking (ranker.progressive.print)."""
+    head = ", ".join(f"{t} {g}" for t, g in zip(snap["ticker"].head(5), snap["grade"].head(5)))
+    state = "최종" if progress["complete"] else "중간"
+    print(f"[랭킹 {state}] 뉴스 {progress['reported']}/{progress['total']}종목 반영 · 상위: {head}")
+
+
+def _market_closed(target_date: str) -> bool:
+    """True (with a console note) when the trading calendar knows target_date is not a trading day."""
+    if trading_calendar.is_trading_day(target_date):
+        return False
+    prev = trading_calendar.previous_trading_day(target_date)
+    print(f"[{target_date}] 휴장일 (직전 거래일 {prev}). 시장 데이터 조회 생략.")
+    return True
+
+
+def run_pipeline(
+    target_date: str,
+    save_output: bool = True,
+    out_dir: Path | None = None,
+    screened: pd.DataFrame | None = None,
+    news_df: pd.DataFrame | None = None,
+    universe: TickerUniverse | None = None,
+) -> dict | None:
     """
     target_date: YYYYMMDD
-    save_output: if True, write CSV/HTML to output/{date}/
+    save_output: if True, write CSV/HTML to out_dir (default output/{date}/)
+    screened, news_df: precomputed stage results (e.g. shared across profiles); computed when None.
+    universe: TickerUniverse for target_date (built once here when None and passed to every stage).
+      A precomputed screened frame must come from the same universe (index = universe positions).
+    Returns dict of result frames, or None when no stock passed the screener.
     """
+    from src import news_collector, ranker, screener, theme_analyzer, valuation
+
     cfg = load_config()
-    out_cfg = cfg.get("output", {})
-    save_csv = save_output and out_cfg.get("save_csv", True)
-    save_html = save_output and out_cfg.get("save_html", True)
-    save_excel = save_output and out_cfg.get("save_excel", False)
+
+    if screened is None and _market_closed(target_date):
+        metrics.record_results(None)
+        return None
+
+    # 0. Ticker universe (canonical codes/names/sectors for the date)
+    if universe is None:
+        with metrics.timed_stage("universe"):
+            universe = TickerUniverse.build(target_date)
 
     # 1. Screener
-    screened = screener.run_screener(target_date)
+    if screened is None:
+        with metrics.timed_stage("screener"):
+            screened = screener.run_screener(target_date, universe=universe)
     if screened.empty:
         print(f"[{target_date}] 조건 충족 종목 없음.")
-        return
+        metrics.record_results(None)
+        return None
 
     # 2. Theme (need sector for valuation and ranker)
-    themes_df, ticker_to_sector = theme_analyzer.run_theme_analyzer(screened, target_date=target_date)
-    sector_rank = {}
-    for i, sec in enumerate(themes_df["sector"].tolist(), start=1):
-        sector_rank[sec] = i
+    with metrics.timed_stage("theme"):
+        themes_df, ticker_to_sector = theme_analyzer.run_theme_analyzer(
+            screened, target_date=target_date, universe=universe
+        )
+        sector_rank = {}
+        for i, sec in enumerate(themes_df["sector"].tolist(), start=1):
+            sector_rank[sec] = i
 
     # 3. Valuation (with sector for relative PER/PBR)
-    valuation_df = valuation.run_valuation(
-        screened["ticker"].astype(str).str.zfill(6).tolist(),
-        target_date,
-        sector_series=ticker_to_sector,
-    )
+    with metrics.timed_stage("valuation"):
+        valuation_df = valuation.run_valuation(
+            screened["ticker"].tolist(),
+            target_date,
+            sector_series=ticker_to_sector,
+            universe=universe,
+            positions=screened.index.to_numpy(),
+        )
+
+    best_rank = theme_analyzer.best_theme_rank(screened, sector_rank, target_date)
+
+    # 4. News (ranker.progressive: 수집 중 종목마다 중간 랭킹 갱신)
+    progressive = None
+    prog_cfg = cfg.get("ranker", {}).get("progressive", {})
+    if news_df is None and prog_cfg.get("enabled", False):
+        progressive = ranker.ProgressiveRanker(
+            screened,
+            ticker_to_sector,
+            sector_rank,
+            valuation_df,
+            universe=universe,
+            best_theme_rank=best_rank,
+            top_n=prog_cfg.get("top_n", 20),
+            every=prog_cfg.get("every", 10),
+            on_snapshot=_print_snapshot if prog_cfg.get("print", True) else None,
+            partial_path=(out_dir or result_dir(target_date)) / "ranked_partial.json" if save_output else None,
+        )
+    if news_df is None:
+        with metrics.timed_stage("news"):
+            news_df = news_collector.run_news_collector(
+                screened, target_date, on_ticker=progressive.update if progressive else None
+            )
+
+    # 4b. News sentiment (news.sentiment.enabled: 감성 사전으로 기사별 점수)
+    news_sentiment = None
+    sent_cfg = cfg.get("news", {}).get("sentiment", {})
+    if sent_cfg.get("enabled", False) and not news_df.empty:
+        from src import news_sentiment as sentiment
 
-    # 4. News
-    news_df = news_collector.run_news_collector(screened, target_date)
-    news_count = news_collector.news_count_by_ticker(news_df)
+        with metrics.timed_stage("sentiment"):
+            if "sentiment" not in news_df.columns:
+                news_df = sentiment.add_sentiment(news_df, sent_cfg)
+            news_sentiment = sentiment.sentiment_by_ticker(news_df)
 
     # 5. Ranker
-    ranked_df = ranker.run_ranker(
-        screened,
-        news_count,
-        ticker_to_sector,
-        sector_rank,
-        valuation_df,
-    )
+    with metrics.timed_stage("ranker"):
+        if progressive is not None:
+            ranked_df = progressive.result(news_sentiment)
+        else:
+            ranked_df = ranker.run_ranker(
+                screened,
+                news_collector.news_count_by_ticker(news_df),
+                ticker_to_sector,
+                sector_rank,
+                valuation_df,
+                universe=universe,
+                best_theme_rank=best_rank,
+                news_sentiment=news_sentiment,
+            )
 
     # 5b. 추천 종목 (랭크 기반)
-    recommended_df = None
-    if not ranked_df.empty and "grade" in ranked_df.columns:
-        rec_cfg = cfg.get("recommend", {})
-        min_grade = rec_cfg.get("min_grade", "B")
-        max_count = rec_cfg.get("max_count", 20)
-        grade_order = ["A", "B", "C", "D", "E", "F"]
-        try:
-            min_idx = grade_order.index(min_grade)
-            allowed = set(grade_order[: min_idx + 1])
-        except ValueError:
-            allowed = {"A", "B"}
-        recommended_df = (
-            ranked_df[ranked_df["grade"].isin(allowed)]
-            .sort_values("score_total", ascending=False)
-            .head(max_count)
-        )
+    recommended_df = _recommend(ranked_df, cfg)
 
     # 6. Report
+    results = {
+        "screened": screened,
+        "themes": themes_df,
+        "valuation": valuation_df,
+        "news": news_df,
+        "ranked": ranked_df,
+        "recommended": recommended_df,
+    }
+    with metrics.timed_stage("report"):
+        _report(target_date, results, cfg, out_dir or result_dir(target_date) if save_output else None)
+    metrics.record_results(results)
+    return results
+
+
+def _report(target_date: str, results: dict, cfg: dict, out_dir: Path | None) -> None:
+    """Console summary, then CSV/HTML/Excel files in out_dir per the output settings (None = console only)."""
+    from src import report
+
+    out_cfg = cfg.get("output", {})
+    screened, themes_df, valuation_df = results["screened"], results["themes"], results["valuation"]
+    news_df, ranked_df, recommended_df = results["news"], results["ranked"], results["recommended"]
+    data_notes = market_data.stale_notes(target_date)
     report.print_console(
         target_date=target_date,
         screened=screened,
@@ -76,24 +190,203 @@ def run_pipeline(target_date: str, save_output: bool = True):
         valuation_df=valuation_df,
         news_df=news_df,
         ranked_df=ranked_df,
+        data_notes=data_notes,
     )
+    if out_dir is None:
+        return
+    out_dir.mkdir(parents=True, exist_ok=True)
+    diff = None
+    if out_cfg.get("diff", True):
+        previous = daily_diff.find_previous(target_date, out_dir)
+        if previous is not None:
+            diff = daily_diff.compute_diff(target_date, results, *previous)
+            daily_diff.write_diff(out_dir, diff)
+            print(daily_diff.summary_line(diff))
+    if out_cfg.get("save_csv", True):
+        report.save_csv(out_dir, screened, themes_df, valuation_df, news_df, ranked_df, recommended_df=recommended_df)
+    if out_cfg.get("dashboard", True):
+        dashboard.update_day(target_date, results, out_dir, diff)
+    if out_cfg.get("save_html", True):
+        report.save_html(
+            out_dir,
+            target_date=target_date,
+            screened=screened,
+            themes_df=themes_df,
+            valuation_df=valuation_df,
+            news_df=news_df,
+            ranked_df=ranked_df,
+            recommended_df=recommended_df,
+            data_notes=data_notes,
+            diff=diff,
+        )
+    if out_cfg.get("save_excel", False):
+        report.save_excel(out_dir, screened, themes_df, valuation_df, news_df, ranked_df)
+
+
+def run_profiles(target_date: str, profile_paths: list[str], save_output: bool = True) -> dict[str, dict | None]:
+    """
+    Run the pipeline once per config profile, sharing one market-data and news fetch.
+    Market data is cached per date in src.market_data, so every profile screens the same frame;
+    news is collected once (with the base config.yaml news settings) for the union of screened tickers.
+    Outputs go to output/{date}/{profile}/ where profile is the file stem.
+    """
+    from src import news_collector, screener
+
+    profiles: dict[str, dict] = {}
+    for path in profile_paths:
+        name = resolve_profile_path(path).stem
+        if name in profiles:
+            raise ValueError(f"프로필 이름 중복: {name}")
+        profiles[name] = load_profile(path)
+    if _market_closed(target_date):
+        metrics.record_results(None)
+        return {name: None for name in profiles}
 
-    if save_output:
-        out_dir = Path(__file__).resolve().parent.parent / "output" / target_date
-        out_dir.mkdir(parents=True, exist_ok=True)
-        if save_csv:
-            report.save_csv(out_dir, screened, themes_df, valuation_df, news_df, ranked_df, recommended_df=recommended_df)
-        if save_html:
-            report.save_html(
-                out_dir,
-                target_date=target_date,
+    # 1. Screener per profile (OHLCV fetched and ticker universe built once)
+    with metrics.timed_stage("universe"):
+        universe = TickerUniverse.build(target_date)
+    screened_by_profile: dict[str, pd.DataFrame] = {}
+    for name, cfg in profiles.items():
+        with use_config(cfg), metrics.timed_stage("screener"):
+            screened_by_profile[name] = screener.run_screener(target_date, universe=universe)
+    non_empty = [df for df in screened_by_profile.values() if not df.empty]
+    if not non_empty:
+        print(f"[{target_date}] 모든 프로필에서 조건 충족 종목 없음.")
+        return {name: None for name in profiles}
+
+    # 2. News once for the union of screened tickers
+    union = pd.concat(non_empty, ignore_index=True).drop_duplicates(subset=["ticker"], keep="first")
+    print(f"[프로필 {len(profiles)}개] 선별 종목 합집합 {len(union)}건 뉴스 수집")
+    with metrics.timed_stage("news"):
+        news_all = news_collector.run_news_collector(union, target_date)
+
+    # 3. Theme / valuation / ranking / report per profile
+    results: dict[str, dict | None] = {}
+    for name, cfg in profiles.items():
+        screened = screened_by_profile[name]
+        if news_all.empty:
+            news_df = news_all
+        else:
+            news_df = news_all[news_all["ticker"].isin(screened["ticker"])].reset_index(drop=True)
+        print(f"\n##### 프로필: {name} #####")
+        with use_config(cfg):
+            results[name] = run_pipeline(
+                target_date,
+                save_output=save_output,
+                out_dir=result_dir(target_date, name),
                 screened=screened,
-                themes_df=themes_df,
-                valuation_df=valuation_df,
                 news_df=news_df,
-                ranked_df=ranked_df,
-                recommended_df=recommended_df,
+                universe=universe,
             )
-        if save_excel:
-            report.save_excel(out_dir, screened, themes_df, valuation_df, news_df, ranked_df)
+    return results
+
+
+def read_watchlist(path: str | Path) -> list[str]:
+    """Ticker codes from a watchlist file: one or more per line (comma/space separated), # comments."""
+    p = Path(path)
+    if not p.exists():
+        raise FileNotFoundError(f"관심 종목 파일 없음: {path}")
+    tickers = []
+    for line in p.read_text(encoding="utf-8-sig").splitlines():
+        tickers.extend(t for t in line.split("#", 1)[0].replace(",", " ").split() if t)
+    return tickers
+
+
+def run_watchlist(
+    target_date: str,
+    tickers: list[str],
+    save_output: bool = True,
+    out_dir: Path | None = None,
+) -> dict | None:
+    """
+    Analyze only `tickers` (e.g. holdings) without market-wide news collection.
+    The market-wide stages run on the date's cached all-market frames (the local OHLCV store when the day
+    is stored) without news: the full screener result sets the theme ranks, the trading-score range and
+    the sector PER/PBR medians, so a screened ticker gets the same label and grade as in the full run. News is collected for the watchlist only; its news-score range comes from the
+    day's stored full run (output/{date}/ranked.csv) when present, else from the watchlist itself.
+    Output goes to output/{date}/watchlist/. Returns dict of result frames, or None when no ticker has data.
+    """
+    from src import news_collector, ranker, screener, theme_analyzer, valuation
+    from src.results_store import read_result_csv
+
+    cfg = load_config()
+    if _market_closed(target_date):
+        metrics.record_results(None)
+        return None
+
+    with metrics.timed_stage("universe"):
+        universe = TickerUniverse.build(target_date)
+    with metrics.timed_stage("screener"):
+        screened_all = screener.run_screener(target_date, universe=universe)
+        watch = screener.select_tickers(target_date, tickers, universe)
+    if watch.empty:
+        print(f"[{target_date}] 관심 종목 시세 없음.")
+        metrics.record_results(None)
+        return None
+
+    # 시장 전체 집계: 당일 선별 종목 기준 주도 테마 (선별 종목이 없으면 관심 종목 기준)
+    with metrics.timed_stage("theme"):
+        themes_df, ticker_to_sector = theme_analyzer.run_theme_analyzer(
+            screened_all if not screened_all.empty else watch, target_date=target_date, universe=universe
+        )
+        sector_rank = {sec: i for i, sec in enumerate(themes_df["sector"].tolist(), start=1)}
+
+    # 업종 PER/PBR 중앙값은 전체 실행과 같게 당일 선별 종목으로만 계산 (선별 종목이 없으면 관심 종목)
+    with metrics.timed_stage("valuation"):
+        valuation_df = valuation.run_valuation(
+            watch["ticker"].tolist(),
+            target_date,
+            sector_series=ticker_to_sector,
+            universe=universe,
+            positions=watch.index.to_numpy(dtype=np.int64),
+            median_positions=(screened_all if not screened_all.empty else watch).index.to_numpy(dtype=np.int64),
+        )
+
+    best_rank = theme_analyzer.best_theme_rank(watch, sector_rank, target_date)
+
+    with metrics.timed_stage("news"):
+        news_df = news_collector.run_news_collector(watch, target_date)
+    news_sentiment = None
+    sent_cfg = cfg.get("news", {}).get("sentiment", {})
+    if sent_cfg.get("enabled", False) and not news_df.empty:
+        from src import news_sentiment as sentiment
+
+        with metrics.timed_stage("sentiment"):
+            news_df = sentiment.add_sentiment(news_df, sent_cfg)
+            news_sentiment = sentiment.sentiment_by_ticker(news_df)
 
+    # 점수 정규화 범위: 당일 전체 선별 분포 (뉴스 건수는 저장된 전체 실행 결과가 있을 때)
+    day_ranked = read_result_csv(result_dir(target_date) / "ranked.csv")
+    day_news = None
+    if day_ranked is not None and "news_count" in day_ranked.columns:
+        day_news = day_ranked.set_index("ticker")["news_count"]
+    bounds = ranker.reference_bounds(screened_all, day_news)
+    print(
+        f"[관심 종목] {len(watch)}종목 · 당일 선별 {len(screened_all)}종목 분포 기준 정규화"
+        f" (뉴스: {'저장된 당일 결과' if 'news' in bounds else '관심 종목 내'})"
+    )
+
+    with metrics.timed_stage("ranker"):
+        ranked_df = ranker.run_ranker(
+            watch,
+            news_collector.news_count_by_ticker(news_df),
+            ticker_to_sector,
+            sector_rank,
+            valuation_df,
+            universe=universe,
+            best_theme_rank=best_rank,
+            news_sentiment=news_sentiment,
+            bounds=bounds,
+        )
+    results = {
+        "screened": watch,
+        "themes": themes_df,
+        "valuation": valuation_df,
+        "news": news_df,
+        "ranked": ranked_df,
+        "recommended": _recommend(ranked_df, cfg),
+    }
+    with metrics.timed_stage("report"):
+        _report(target_date, results, cfg, out_dir or result_dir(target_date, "watchlist") if save_output else None)
+    metrics.record_results(results)
+    return results
@@ -0,0 +1,84 @@
+"""
+병합 가능한 스트리밍 분위수 스케치 (DDSketch 방식 로그 버킷).
+양수 값만 다루며, 분위수 추정의 상대 오차는 alpha 이하. 버킷 카운트 합산으로 병합.
+"""
+import math
+
+import numpy as np
+
+
+class QuantileSketch:
+    """
+    Log-bucketed quantile sketch for positive values (relative accuracy alpha).
+    Memory is O(log(max/min) / alpha) buckets regardless of how many values were added.
+    """
+
+    def __init__(self, alpha: float = 0.01):
+        self.alpha = alpha
+        self._gamma_log = math.log((1 + alpha) / (1 - alpha))
+        self.bins: dict[int, int] = {}
+        self.count = 0
+
+    def _index(self, values: np.ndarray) -> np.ndarray:
+        return np.ceil(np.log(values) / self._gamma_log).astype(np.int64)
+
+    def add_many(self, values) -> None:
+        """Add every finite positive value (others are ignored)."""
+        v = np.asarray(values, dtype=float)
+        v = v[np.isfinite(v) & (v > 0)]
+        if not len(v):
+            return
+        idx, cnt = np.unique(self._index(v), return_counts=True)
+        for i, c in zip(idx.tolist(), cnt.tolist()):
+            self.bins[i] = self.bins.get(i, 0) + c
+        self.count += int(len(v))
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        if other.alpha != self.alpha:
+            raise ValueError("alpha가 다른 스케치는 병합할 수 없습니다.")
+        for i, c in other.bins.items():
+            self.bins[i] = self.bins.get(i, 0) + c
+        self.count += other.count
+        return self
+
+    def _sorted(self) -> tuple[np.ndarray, np.ndarray]:
+        keys = np.fromiter(sorted(self.bins), dtype=np.int64, count=len(self.bins))
+        counts = np.array([self.bins[k] for k in keys.tolist()], dtype=np.int64)
+        return keys, counts
+
+    def percentile_of(self, values) -> np.ndarray:
+        """Percentile rank (0~100) of each value; NaN for non-positive values or an empty sketch."""
+        v = np.asarray(values, dtype=float)
+        out = np.full(v.shape, np.nan)
+        ok = np.isfinite(v) & (v > 0)
+        if not self.count or not ok.any():
+            return out
+        keys, counts = self._sorted()
+        cum = np.concatenate([[0], np.cumsum(counts)])
+        idx = self._index(v[ok])
+        lo = np.searchsorted(keys, idx, side="left")
+        hi = np.searchsorted(keys, idx, side="right")
+        # values in the same bucket count half (midpoint rank)
+        out[ok] = (cum[lo] + (cum[hi] - cum[lo]) / 2) / self.count * 100
+        return out
+
+    def quantile(self, q: float) -> float:
+        """Approximate value at quantile q (0~1)."""
+        if not self.count:
+            return float("nan")
+        keys, counts = self._sorted()
+        rank = q * (self.count - 1)
+        i = int(np.searchsorted(np.cumsum(counts), rank, side="right"))
+        i = min(i, len(keys) - 1)
+        return 2 * math.exp(keys[i] * self._gamma_log) / (1 + math.exp(self._gamma_log))
+
+    def to_dict(self) -> dict:
+        keys, counts = self._sorted()
+        return {"alpha": self.alpha, "count": self.count, "keys": keys.tolist(), "counts": counts.tolist()}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "QuantileSketch":
+        sk = cls(alpha=data.get("alpha", 0.01))
+        sk.bins = dict(zip(data.get("keys", []), data.get("counts", [])))
+        sk.count = int(data.get("count", sum(sk.bins.values())))
+        return sk
@@ -1,6 +1,13 @@
 """
 5. A~F 랭킹: 거래대금/뉴스/테마/밸류 점수 가중 합산 후 6등급
+   (ProgressiveRanker: 뉴스 수집 중 종목별 뉴스 건수를 받아 중간 상위 N·등급 스냅샷 제공)
 """
+import json
+import time
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
 import pandas as pd
 
 from src.config_loader import load_config
@@ -21,6 +28,35 @@ def _normalize_series(s: pd.Series, min_val: float | None = None, max_val: float
     return (s - lo) / (hi - lo) * 100
 
 
+def _scale(s: pd.Series, lo: float, hi: float) -> pd.Series:
+    """Scale to 0~100 against a reference range [lo, hi] (values outside are clipped). 50 when hi <= lo."""
+    s = pd.to_numeric(s, errors="coerce").fillna(0)
+    if hi <= lo:
+        return pd.Series(50.0, index=s.index)
+    return ((s - lo) / (hi - lo) * 100).clip(0, 100)
+
+
+def _trading_value(df: pd.DataFrame) -> pd.Series:
+    """Raw trading activity behind score_trading (trading value in 10억 units + volume in millions)."""
+    return df["trading_value"].fillna(0) / 1e9 + df["volume"].fillna(0) / 1e6
+
+
+def reference_bounds(screened_df: pd.DataFrame, news_count: pd.Series | None = None) -> dict[str, tuple[float, float]]:
+    """
+    (min, max) of the raw trading and news values over a reference set (e.g. the full day's screened
+    stocks), for run_ranker(bounds=...) on a subset such as a watchlist. news_count: ticker -> count
+    over the same stocks (stocks without news count as 0); omitted = no news bound.
+    """
+    bounds = {}
+    if not screened_df.empty:
+        raw = _trading_value(screened_df)
+        bounds["trading"] = (float(raw.min()), float(raw.max()))
+        if news_count is not None:
+            counts = screened_df["ticker"].map(news_count).fillna(0)
+            bounds["news"] = (float(counts.min()), float(counts.max()))
+    return bounds
+
+
 def score_to_grade(score: float) -> str:
     """Map 0~100 score to A~F. A: 83.33~100, B: 66.67~83.33, C: 50~66.67, D: 33.33~50, E: 16.67~33.33, F: 0~16.67."""
     if score >= 100 * 5 / 6:
@@ -42,6 +78,10 @@ def run_ranker(
     ticker_to_sector: pd.Series,
     sector_rank: dict[str, int],
     valuation_df: pd.DataFrame,
+    universe=None,
+    best_theme_rank=None,
+    news_sentiment: pd.Series | None = None,
+    bounds: dict[str, tuple[float, float]] | None = None,
 ) -> pd.DataFrame:
     """
     screened_df: ticker, name, volume, trading_value, change_pct, ...
@@ -49,8 +89,53 @@ def run_ranker(
     ticker_to_sector: ticker -> sector name
     sector_rank: sector name -> rank (1 = top theme)
     valuation_df: ticker, valuation_label (저평가/적정/고평가)
+    universe: TickerUniverse; when given, screened_df/valuation_df are indexed by universe positions and
+      sector/valuation lookups are position takes instead of ticker-string maps.
+    best_theme_rank: per-row best rank among each stock's user-defined themes (aligned with screened_df,
+      NaN = none ranked); when given it replaces the sector rank and adds a "theme" column.
+    news_sentiment: ticker -> mean news sentiment (-1~1); adds a "news_sentiment" column, and with
+      ranker.news_mode: sentiment score_news uses news_count × (1 + sentiment_weight × sentiment).
+    bounds: reference ranges from reference_bounds(); "trading" / "news" scores are scaled against them
+      instead of the min/max of screened_df itself (watchlist ranking against the full day's distribution).
     Returns DataFrame with ticker, name, score_total, grade, score_trading, score_news, score_theme, score_valuation, ...
     """
+    df, weights = _score_frame(
+        screened_df, ticker_to_sector, sector_rank, valuation_df, universe, best_theme_rank, bounds
+    )
+    _set_news_scores(df, news_count, news_sentiment, bounds)
+    return _finish(df, weights)
+
+
+def _set_news_scores(
+    df: pd.DataFrame, news_count: pd.Series, news_sentiment: pd.Series | None, bounds: dict | None = None
+) -> None:
+    """Fill news_count / score_news (and news_sentiment when given) in place."""
+    df["news_count"] = df["ticker"].map(news_count).fillna(0)
+    value = df["news_count"]
+    if news_sentiment is not None:
+        sentiment = df["ticker"].map(news_sentiment)
+        df.insert(df.columns.get_loc("news_count") + 1, "news_sentiment", sentiment)
+        w = load_config().get("ranker", {})
+        if w.get("news_mode", "count") == "sentiment":
+            # 호재 기사는 1건 이상, 악재 기사는 1건 미만으로 계산 (sentiment_weight 1: -1 → 0건, +1 → 2건)
+            factor = (1 + w.get("sentiment_weight", 1.0) * sentiment.fillna(0)).clip(lower=0)
+            value = value * factor
+    df["score_news"] = _scale(value, *bounds["news"]) if bounds and "news" in bounds else _normalize_series(value)
+
+
+def _score_frame(
+    screened_df: pd.DataFrame,
+    ticker_to_sector: pd.Series,
+    sector_rank: dict[str, int],
+    valuation_df: pd.DataFrame,
+    universe=None,
+    best_theme_rank=None,
+    bounds: dict | None = None,
+) -> tuple[pd.DataFrame, dict[str, float]]:
+    """
+    Every score that does not depend on news (news_count / score_news are placeholders, kept in
+    column order) and the ranker weights.
+    """
     cfg = load_config()
     w = cfg.get("ranker", {})
     w_trading = w.get("weight_trading", 0.25)
@@ -65,23 +150,32 @@ def run_ranker(
     theme_top_bonus_3 = w.get("theme_top_bonus_3")
 
     df = screened_df[["ticker", "name", "volume", "trading_value"]].copy()
-    df["ticker"] = df["ticker"].astype(str).str.zfill(6)
+    if universe is None:
+        df["ticker"] = df["ticker"].astype(str).str.zfill(6)
     if "change_pct" in screened_df.columns:
         df["change_pct"] = screened_df["change_pct"].values
 
     # Trading score: higher trading_value + volume -> higher score
-    df["score_trading"] = _normalize_series(
-        df["trading_value"].fillna(0) / 1e9 + df["volume"].fillna(0) / 1e6
-    )
+    raw = _trading_value(df)
+    df["score_trading"] = _scale(raw, *bounds["trading"]) if bounds and "trading" in bounds else _normalize_series(raw)
 
-    # News score
-    df["news_count"] = df["ticker"].map(news_count).fillna(0)
-    df["score_news"] = _normalize_series(df["news_count"])
+    # News score (run_ranker / ProgressiveRanker에서 채움)
+    df["news_count"] = 0
+    df["score_news"] = 0.0
 
     # Theme score: rank 1 (top theme) -> 100, higher rank -> lower score
-    df["sector"] = df["ticker"].map(ticker_to_sector)
+    if universe is not None:
+        df["sector"] = universe.sectors_at(df.index.to_numpy())
+    else:
+        df["sector"] = df["ticker"].map(ticker_to_sector)
     max_rank = max(sector_rank.values()) if sector_rank else 1
-    df["theme_rank"] = df["sector"].map(sector_rank).fillna(max_rank + 1).astype(int)
+    if best_theme_rank is not None:
+        # 사용자 정의 테마: 종목이 속한 테마 중 가장 높은 순위
+        best = pd.Series(best_theme_rank, index=df.index, dtype=float)
+        df["theme"] = best.map({r: name for name, r in sector_rank.items()})
+        df["theme_rank"] = best.fillna(max_rank + 1).astype(int)
+    else:
+        df["theme_rank"] = df["sector"].map(sector_rank).fillna(max_rank + 1).astype(int)
     if theme_weight_top1_only:
         # 테마 가중치를 1위 테마에만: 1위=100, 나머지=0
         df["score_theme"] = (df["theme_rank"] == 1).astype(int) * 100.0
@@ -107,17 +201,165 @@ def run_ranker(
 
     # Valuation score: 저평가=high, 적정=mid, 고평가=low
     val_map = {"저평가": 100, "적정": 50, "고평가": 0, "N/A": 50}
-    if valuation_df is not None and not valuation_df.empty:
+    if valuation_df is not None and not valuation_df.empty and universe is not None:
+        val_label = universe.scatter(valuation_df.index.to_numpy(), valuation_df["valuation_label"].to_numpy(dtype=object))
+        df["score_valuation"] = pd.Series(val_label[df.index.to_numpy()], index=df.index).map(val_map).fillna(50)
+    elif valuation_df is not None and not valuation_df.empty:
         val_label = valuation_df.set_index("ticker")["valuation_label"]
         df["score_valuation"] = df["ticker"].map(val_label).map(val_map).fillna(50)
     else:
         df["score_valuation"] = 50.0
 
+    weights = {"trading": w_trading, "news": w_news, "theme": w_theme, "valuation": w_valuation}
+    return df, weights
+
+
+def _finish(df: pd.DataFrame, weights: dict[str, float]) -> pd.DataFrame:
+    """Weighted total, grade and final ordering."""
     df["score_total"] = (
-        df["score_trading"] * w_trading
-        + df["score_news"] * w_news
-        + df["score_theme"] * w_theme
-        + df["score_valuation"] * w_valuation
+        df["score_trading"] * weights["trading"]
+        + df["score_news"] * weights["news"]
+        + df["score_theme"] * weights["theme"]
+        + df["score_valuation"] * weights["valuation"]
     )
     df["grade"] = df["score_total"].map(score_to_grade)
     return df.sort_values("score_total", ascending=False).reset_index(drop=True)
+
+
+SNAPSHOT_COLUMNS = ["ticker", "name", "score_total", "grade", "news_count", "news_pending", "theme_rank"]
+
+
+class ProgressiveRanker:
+    """
+    Incremental ranking while news is being collected.
+
+    Scores that do not depend on news are computed once; update(ticker, count) records one ticker's
+    news count, keeps the running min/max used to normalize news_count, and every `every` updates
+    emits a top-N snapshot (on_snapshot(snapshot_df, progress) and/or a JSON file at partial_path).
+    Tickers not reported yet count as 0 news and are marked news_pending. Once every ticker has been
+    reported, result() equals run_ranker() with the same news counts.
+    """
+
+    def __init__(
+        self,
+        screened_df: pd.DataFrame,
+        ticker_to_sector: pd.Series,
+        sector_rank: dict[str, int],
+        valuation_df: pd.DataFrame,
+        universe=None,
+        best_theme_rank=None,
+        top_n: int = 20,
+        every: int = 10,
+        on_snapshot: Callable[[pd.DataFrame, dict], None] | None = None,
+        partial_path: Path | None = None,
+    ):
+        self._df, self._weights = _score_frame(
+            screened_df, ticker_to_sector, sector_rank, valuation_df, universe, best_theme_rank
+        )
+        self._base_total = (
+            self._df["score_trading"] * self._weights["trading"]
+            + self._df["score_theme"] * self._weights["theme"]
+            + self._df["score_valuation"] * self._weights["valuation"]
+        ).to_numpy(dtype=np.float64)
+        self._row = {t: i for i, t in enumerate(self._df["ticker"].tolist())}
+        n = len(self._df)
+        self._counts = np.zeros(n, dtype=np.float64)
+        self._reported = np.zeros(n, dtype=bool)
+        self._lo = self._hi = None
+        self.top_n = top_n
+        self.every = max(1, every)
+        self.on_snapshot = on_snapshot
+        self.partial_path = partial_path
+        self._since_snapshot = 0
+        self._started = time.perf_counter()
+
+    @property
+    def bounds(self) -> tuple[float, float] | None:
+        """Running (min, max) news count over reported tickers."""
+        return None if self._lo is None else (self._lo, self._hi)
+
+    def update(self, ticker: str, count: int) -> None:
+        """Record (or replace) one ticker's news count; unknown tickers are ignored."""
+        i = self._row.get(ticker)
+        if i is None:
+            return
+        count = float(count)
+        old, was_reported = self._counts[i], self._reported[i]
+        self._counts[i] = count
+        self._reported[i] = True
+        if self._lo is None:
+            self._lo = self._hi = count
+        elif was_reported and (old == self._lo or old == self._hi) and count != old:
+            # 경계값이 바뀐 종목: 보고된 값 전체에서 다시 계산
+            reported = self._counts[self._reported]
+            self._lo, self._hi = float(reported.min()), float(reported.max())
+        else:
+            self._lo, self._hi = min(self._lo, count), max(self._hi, count)
+        self._since_snapshot += 1
+        if self._since_snapshot >= self.every:
+            self.snapshot()
+
+    def _news_scores(self) -> np.ndarray:
+        """score_news for every row: reported counts scaled by the running bounds, pending rows as 0 news."""
+        if self._lo is None:
+            return np.full(len(self._counts), 50.0)
+        lo = min(self._lo, 0.0) if not self._reported.all() else self._lo
+        if self._hi <= lo:
+            return np.full(len(self._counts), 50.0)
+        return (np.clip(self._counts, lo, self._hi) - lo) / (self._hi - lo) * 100
+
+    def snapshot(self) -> pd.DataFrame:
+        """Current top N (columns: SNAPSHOT_COLUMNS); also sent to on_snapshot / partial_path."""
+        self._since_snapshot = 0
+        total = self._base_total + self._news_scores() * self._weights["news"]
+        n = min(self.top_n, len(total))
+        top = np.argpartition(-total, n - 1)[:n] if 0 < n < len(total) else np.arange(len(total))
+        top = top[np.argsort(-total[top], kind="stable")]
+        snap = pd.DataFrame({
+            "ticker": self._df["ticker"].to_numpy()[top],
+            "name": self._df["name"].to_numpy()[top],
+            "score_total": total[top],
+            "grade": [score_to_grade(v) for v in total[top]],
+            "news_count": self._counts[top].astype(int),
+            "news_pending": ~self._reported[top],
+            "theme_rank": self._df["theme_rank"].to_numpy()[top],
+        })
+        progress = {
+            "reported": int(self._reported.sum()),
+            "total": len(self._reported),
+            "complete": bool(self._reported.all()),
+            "news_bounds": list(self.bounds) if self.bounds else None,
+            "elapsed_s": round(time.perf_counter() - self._started, 3),
+        }
+        if self.on_snapshot is not None:
+            self.on_snapshot(snap, progress)
+        if self.partial_path is not None:
+            self._write_partial(snap, progress)
+        return snap
+
+    def _write_partial(self, snap: pd.DataFrame, progress: dict) -> None:
+        payload = dict(progress)
+        payload["top"] = [
+            {**r, "score_total": round(r["score_total"], 2), "news_pending": bool(r["news_pending"])}
+            for r in snap.astype(object).to_dict(orient="records")
+        ]
+        path = Path(self.partial_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(payload, ensure_ascii=False, default=int), encoding="utf-8")
+        tmp.replace(path)
+
+    def result(self, news_sentiment: pd.Series | None = None) -> pd.DataFrame:
+        """
+        Full ranking as run_ranker returns it (pending tickers count as 0 news); emits a final snapshot.
+        news_sentiment is applied here only (intermediate snapshots rank by news count).
+        """
+        self._reported[:] = True
+        if self._lo is not None:
+            self._lo, self._hi = float(self._counts.min()), float(self._counts.max())
+        self.snapshot()
+        df = self._df.copy()
+        counts = pd.Series(self._counts, index=self._df["ticker"].to_numpy())
+        news_count = counts[counts > 0].astype(int)  # news_count_by_ticker와 같은 형태 (0건 종목 없음)
+        _set_news_scores(df, news_count, news_sentiment)
+        return _finish(df, self._weights)
@@ -153,6 +153,16 @@ def _console_fmt_df(df: pd.DataFrame) -> pd.DataFrame:
     return out
 
 
+def print_rankings(ranked_df: pd.DataFrame, top_n: int = 20) -> None:
+    """Print the A~F rank table (top_n rows)."""
+    if ranked_df.empty:
+        return
+    print(f"--- A~F 랭크 (상위 {top_n}) ---")
+    cols = ["ticker", "name", "grade", "score_total", "score_trading", "score_news", "news_sentiment", "score_theme", "score_valuation"]
+    cols = [c for c in cols if c in ranked_df.columns]
+    print(_console_fmt_df(ranked_df.head(top_n)[cols]).to_string(index=False))
+
+
 def print_console(
     target_date: str,
     screened: pd.DataFrame,
@@ -160,14 +170,16 @@ def print_console(
     valuation_df: pd.DataFrame,
     news_df: pd.DataFrame,
     ranked_df: pd.DataFrame,
+    top_n: int = 20,
+    data_notes: list[str] | None = None,
 ) -> None:
     print(f"\n=== 한국 주식 분석 결과 ({target_date}) ===\n")
+    for note in data_notes or []:
+        print(f"[주의] 이전 시장 데이터 사용 - {note}")
+    if data_notes:
+        print()
     print(f"[선별 종목] 거래량 100만·거래대금 100억 이상 또는 상한가: {len(screened)}건\n")
-    if not ranked_df.empty:
-        print("--- A~F 랭크 (상위 20) ---")
-        cols = ["ticker", "name", "grade", "score_total", "score_trading", "score_news", "score_theme", "score_valuation"]
-        cols = [c for c in cols if c in ranked_df.columns]
-        print(_console_fmt_df(ranked_df.head(20)[cols]).to_string(index=False))
+    print_rankings(ranked_df, top_n=top_n)
     print("\n--- 주도 테마 (상위 10) ---")
     print(_console_fmt_df(themes_df.head(10)).to_string(index=False))
     if not valuation_df.empty:
@@ -210,6 +222,8 @@ def save_html(
     news_df: pd.DataFrame,
     ranked_df: pd.DataFrame,
     recommended_df: pd.DataFrame | None = None,
+    data_notes: list[str] | None = None,
+    diff: dict | None = None,
 ) -> None:
     html = []
     html.append("<!DOCTYPE html><html><head><meta charset='utf-8'><title>한국 주식 분석 " + target_date + "</title>")
@@ -234,9 +248,15 @@ def save_html(
     html.append(".scroll-wrap{max-height:400px;overflow-y:auto}")
     html.append(".theme-top{font-size:1.05em;font-weight:bold;background:#e3f2fd !important;border-left:3px solid #1976d2}")
     html.append(".recommend-disclaimer{font-size:0.85em;color:#666;margin-top:8px;font-style:italic}")
+    if data_notes:
+        html.append(".stale-notice{background:#fff8e1;border:1px solid #ffb300;border-radius:6px;padding:10px 14px;margin:10px 0;color:#6d4c00}")
     html.append("</style></head><body>")
 
     html.append(f"<h1>한국 주식 분석 결과 ({target_date})</h1>")
+    if data_notes:
+        html.append("<div class='stale-notice'><strong>이전 시장 데이터 사용</strong> (조회 실패로 마지막 스냅샷 대체)<ul>")
+        html.extend(f"<li>{html_lib.escape(note)}</li>" for note in data_notes)
+        html.append("</ul></div>")
 
     # Summary cards
     n_screened = len(screened)
@@ -250,6 +270,27 @@ def save_html(
     html.append(f"<div class='card'>A등급 <strong>{n_a}</strong>건</div>")
     html.append("</div>")
 
+    # 0) 전일 대비 변화 (diff.json이 있을 때만)
+    if diff:
+        ds = diff["summary"]
+        html.append(f"<div class='section'><h2>전일 대비 변화 ({html_lib.escape(diff['previous_date'])} → {target_date})</h2>")
+        html.append(
+            f"<p>신규 {ds['entries']} · 제외 {ds['exits']} · 상향 {ds['upgrades']} · 하향 {ds['downgrades']} · "
+            f"신규 A {ds['new_a']} · 테마 순위 변동 {ds['sector_moves']} · 밸류 라벨 변경 {ds['valuation_flips']}</p>"
+        )
+        for key, title, change_cols in (
+            ("grade_changes", "등급 변경", ["score_change"]),
+            ("entries", "신규 진입", None),
+            ("exits", "제외", None),
+            ("sectors", "주도 테마 순위 변동", ["change"]),
+            ("valuation_flips", "밸류에이션 라벨 변경", None),
+        ):
+            if diff.get(key):
+                html.append(f"<h3>{title}</h3><div class='scroll-wrap'>")
+                html.append(_df_to_html_with_change_color(pd.DataFrame(diff[key]), change_pct_columns=change_cols))
+                html.append("</div>")
+        html.append("</div>")
+
     # 1) 추천 종목 (recommended_df or filter from ranked_df)
     rec_df = recommended_df
     if rec_df is None and not ranked_df.empty and "grade" in ranked_df.columns:
@@ -347,7 +388,7 @@ def save_html(
     html.append("<div class='section'><h2>종목별 뉴스</h2>")
     if news_df.empty:
         for _, row in screened.iterrows():
-            ticker = str(row.get("ticker", "")).zfill(6)
+            ticker = row.get("ticker", "")
             name = row.get("name", ticker)
             html.append(f"<div class='news-block'><h4>{strip_html_then_escape(str(name))} ({ticker})</h4>")
             html.append("<p class='news-item'>해당 종목의 뉴스가 수집되지 않았습니다. (선택일자 필터 사용 시 해당일 뉴스만 표시됩니다.)</p>")
@@ -393,10 +434,7 @@ def save_html(
     html.append("<div class='section'><h2>밸류에이션 (PER/PBR)</h2>")
     if not screened.empty and "ticker" in screened.columns and "name" in screened.columns and not valuation_df.empty:
         name_df = screened[["ticker", "name"]].drop_duplicates("ticker")
-        name_df["ticker"] = name_df["ticker"].astype(str).str.zfill(6)
-        val_copy = valuation_df.copy()
-        val_copy["ticker"] = val_copy["ticker"].astype(str).str.zfill(6)
-        val_display = val_copy.merge(name_df, on="ticker", how="left")
+        val_display = valuation_df.merge(name_df, on="ticker", how="left")
         rest = [c for c in val_display.columns if c not in ("ticker", "name")]
         val_display = val_display[["ticker", "name"] + rest]
         val_display["name"] = val_display["name"].fillna("")
@@ -418,11 +456,15 @@ def save_excel(
     news_df: pd.DataFrame,
     ranked_df: pd.DataFrame,
 ) -> None:
+    """Streaming (write-only) workbook: typed columns, frozen header, ticker as text."""
+    from src.excel_export import write_frames
+
     path = out_dir / "report.xlsx"
-    with pd.ExcelWriter(path, engine="openpyxl") as w:
-        ranked_df.to_excel(w, sheet_name="Ranked", index=False)
-        themes_df.to_excel(w, sheet_name="Themes", index=False)
-        valuation_df.to_excel(w, sheet_name="Valuation", index=False)
-        screened.to_excel(w, sheet_name="Screened", index=False)
-        news_df.to_excel(w, sheet_name="News", index=False)
+    write_frames(path, [
+        ("Ranked", ranked_df),
+        ("Themes", themes_df),
+        ("Valuation", valuation_df),
+        ("Screened", screened),
+        ("News", news_df),
+    ])
     print(f"Excel 저장: {path}")
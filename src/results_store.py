@@ -0,0 +1,65 @@
+"""
+저장된 결과(output/{date}[/{profile}]/*.csv) 조회: 캐시 전용 경로(render 등)에서 사용.
+pandas 외의 무거운 의존성(pykrx·requests·bs4)을 import하지 않는다.
+"""
+from pathlib import Path
+
+import pandas as pd
+
+OUTPUT_ROOT = Path(__file__).resolve().parent.parent / "output"
+
+RESULT_FILES = {
+    "screened": "screened.csv",
+    "themes": "themes.csv",
+    "valuation": "valuation.csv",
+    "news": "news.csv",
+    "ranked": "ranked.csv",
+    "recommended": "recommended.csv",
+}
+
+
+def result_dir(target_date: str, profile: str | None = None) -> Path:
+    """output/{date}/ or output/{date}/{profile}/."""
+    out = OUTPUT_ROOT / target_date
+    return out / profile if profile else out
+
+
+def result_slot(target_date: str, out_dir: Path) -> Path | None:
+    """out_dir relative to output/{date}/ ("." for the day, a profile name, "watchlist"); None when outside it."""
+    try:
+        return Path(out_dir).resolve().relative_to((OUTPUT_ROOT / target_date).resolve())
+    except ValueError:
+        return None
+
+
+def read_result_csv(path: Path, columns: list[str] | None = None) -> pd.DataFrame | None:
+    """
+    Read one stored CSV keeping ticker codes as 6-digit strings. None if the file is missing.
+    columns: read only these (missing ones are skipped).
+    """
+    if not path.exists():
+        return None
+    usecols = (lambda c: c in columns) if columns else None
+    try:
+        df = pd.read_csv(path, dtype={"ticker": str}, encoding="utf-8-sig", usecols=usecols)
+    except pd.errors.EmptyDataError:
+        return pd.DataFrame()
+    if "ticker" in df.columns:
+        df["ticker"] = df["ticker"].str.zfill(6)
+    return df
+
+
+def load_results(out_dir: Path) -> dict[str, pd.DataFrame | None]:
+    """
+    Load every stored result frame in out_dir. Missing files give an empty DataFrame
+    (recommended: None). Raises FileNotFoundError when ranked.csv is absent.
+    """
+    if not (out_dir / RESULT_FILES["ranked"]).exists():
+        raise FileNotFoundError(f"저장된 결과 없음: {out_dir / RESULT_FILES['ranked']}")
+    results: dict[str, pd.DataFrame | None] = {}
+    for key, fname in RESULT_FILES.items():
+        df = read_result_csv(out_dir / fname)
+        if df is None and key != "recommended":
+            df = pd.DataFrame()
+        results[key] = df
+    return results
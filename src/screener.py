@@ -2,43 +2,33 @@
 1. 종목 선별: (거래량>=100만 & 거래대금>=100억) 또는 상한가
 """
 import pandas as pd
-from pykrx import stock
 
+from src import market_data
 from src.config_loader import load_config
+from src.universe import normalize_tickers
 
 
 def get_ticker_name(ticker: str) -> str:
     """Return stock name for ticker."""
-    try:
-        return stock.get_market_ticker_name(ticker) or ticker
-    except Exception:
-        return ticker
+    return market_data.get_ticker_name(ticker)
+
+
+_EMPTY_COLUMNS = ["ticker", "name", "volume", "trading_value", "close", "change_pct", "open", "high", "low"]
 
 
-def run_screener(target_date: str) -> pd.DataFrame:
+def load_market_frame(target_date: str, universe=None) -> pd.DataFrame | None:
     """
-    Run screener for a single date (YYYYMMDD).
-    Returns DataFrame with columns: ticker, name, volume, trading_value, close, change_pct, etc.
+    All-market OHLCV for target_date with English columns and a ticker column.
+    With a universe the index holds universe positions. None when there is no usable data.
     """
-    cfg = load_config()
-    min_vol = cfg["screener"]["min_volume"]
-    min_val = cfg["screener"]["min_trading_value"]
-    include_limit_up = cfg["screener"].get("include_limit_up", False)
-    limit_up_pct = cfg["screener"].get("limit_up_change_pct", 29.5)
-
     # Single-date all-stock OHLCV (index = ticker)
     try:
-        df = stock.get_market_ohlcv_by_ticker(target_date, market="ALL")
+        df = market_data.get_market_ohlcv(target_date)
     except Exception as e:
         raise RuntimeError(f"pykrx 조회 실패 (날짜={target_date}): {e}") from e
 
     if df is None or df.empty:
-        return pd.DataFrame(
-            columns=[
-                "ticker", "name", "volume", "trading_value", "close",
-                "change_pct", "open", "high", "low"
-            ]
-        )
+        return None
 
     # Column names from pykrx (Korean): 시가, 고가, 저가, 종가, 거래량, 거래대금, 등락률
     # Handle both possible column naming (KRX may return different names in some versions)
@@ -59,34 +49,104 @@ def run_screener(target_date: str) -> pd.DataFrame:
     if "종가" in df.columns and "close" not in df.columns:
         df = df.rename(columns={"종가": "close"})
 
-    df = df.reset_index()
-    # First column after reset_index is ticker (pykrx index name may be "티커")
-    first_col = df.columns[0]
-    if first_col != "ticker":
-        df = df.rename(columns={first_col: "ticker"})
+    if universe is not None:
+        pos = universe.align(df.index)
+        df = df.reset_index(drop=True)
+        df.insert(0, "ticker", universe.tickers_at(pos))
+        df.index = pos
+    else:
+        df = df.reset_index()
+        # First column after reset_index is ticker (pykrx index name may be "티커")
+        first_col = df.columns[0]
+        if first_col != "ticker":
+            df = df.rename(columns={first_col: "ticker"})
 
     # Ensure numeric
     for col in ("volume", "trading_value", "close", "change_pct"):
         if col in df.columns:
             df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
 
-    # Filter: (거래량·거래대금 조건) OR (상한가)
     if "volume" not in df.columns or "trading_value" not in df.columns:
-        return pd.DataFrame(
-            columns=[
-                "ticker", "name", "volume", "trading_value", "close",
-                "change_pct", "open", "high", "low"
-            ]
-        )
+        return None
+    return df
+
+
+def run_screener(target_date: str, universe=None) -> pd.DataFrame:
+    """
+    Run screener for a single date (YYYYMMDD).
+    universe: TickerUniverse for target_date. When given, tickers/names come from it and the
+    returned frame's index holds universe positions (used by later stages for position joins).
+    With screener.panel.enabled, multi-day conditions (volume surge, consecutive trading-value days,
+    new N-day high) from the local OHLCV store are combined with the single-day filter.
+    Returns DataFrame with columns: ticker, name, volume, trading_value, close, change_pct, etc.
+    """
+    cfg = load_config()
+    min_vol = cfg["screener"]["min_volume"]
+    min_val = cfg["screener"]["min_trading_value"]
+    include_limit_up = cfg["screener"].get("include_limit_up", False)
+    limit_up_pct = cfg["screener"].get("limit_up_change_pct", 29.5)
+    panel_cfg = cfg["screener"].get("panel", {})
+
+    df = load_market_frame(target_date, universe)
+    if df is None:
+        return pd.DataFrame(columns=_EMPTY_COLUMNS)
+
+    # Filter: (거래량·거래대금 조건) OR (상한가)
     condition_vol_val = (df["volume"] >= min_vol) & (df["trading_value"] >= min_val)
     condition_limit_up = (df["change_pct"] >= limit_up_pct) if include_limit_up else pd.Series(False, index=df.index)
-    filtered = df[condition_vol_val | condition_limit_up].copy()
-    filtered["ticker"] = filtered["ticker"].astype(str).str.zfill(6)
-    filtered["name"] = filtered["ticker"].map(get_ticker_name)
+    mask = condition_vol_val | condition_limit_up
+    panel_cols = []
+    if panel_cfg.get("enabled", False):
+        from src.panel_screener import panel_conditions
+
+        flags, passed = panel_conditions(target_date, df["ticker"].to_numpy(), panel_cfg)
+        for col in flags.columns:
+            df[col] = flags[col].to_numpy()
+        panel_cols = list(flags.columns)
+        if passed is not None:
+            passed = pd.Series(passed, index=df.index)
+            mask = (mask | passed) if panel_cfg.get("combine", "and") == "or" else (mask & passed)
+    return _output_frame(df[mask].copy(), universe, panel_cols)
+
+
+def _output_frame(filtered: pd.DataFrame, universe, panel_cols: list[str]) -> pd.DataFrame:
+    """Names, column order and trading-value ordering shared by run_screener and select_tickers."""
+    if universe is not None:
+        filtered["name"] = universe.names_at(filtered.index.to_numpy())
+    else:
+        filtered["ticker"] = filtered["ticker"].astype(str).str.zfill(6)
+        filtered["name"] = filtered["ticker"].map(get_ticker_name)
     # Reorder columns
     out_cols = ["ticker", "name", "volume", "trading_value", "close", "change_pct"]
     for c in ("open", "high", "low"):
         if c in filtered.columns:
             out_cols.append(c)
-    filtered = filtered[[c for c in out_cols if c in filtered.columns]]
-    return filtered.sort_values("trading_value", ascending=False).reset_index(drop=True)
+    filtered = filtered[[c for c in out_cols + panel_cols if c in filtered.columns]]
+    filtered = filtered.sort_values("trading_value", ascending=False)
+    return filtered if universe is not None else filtered.reset_index(drop=True)
+
+
+def select_tickers(target_date: str, tickers, universe) -> pd.DataFrame:
+    """
+    Watchlist rows: the given tickers' rows from the date's all-market frame whether or not they pass
+    the screening conditions (same columns as run_screener, index = universe positions).
+    Tickers without a row for the date are reported and skipped.
+    """
+    df = load_market_frame(target_date, universe)
+    if df is None:
+        return pd.DataFrame(columns=_EMPTY_COLUMNS)
+    wanted = normalize_tickers(tickers).unique()
+    rows = df.index.get_indexer(universe.positions(wanted))
+    if (rows < 0).any():
+        print(f"[관심 종목] {target_date} 시세 없음: {', '.join(wanted[rows < 0])}")
+    selected = df.iloc[rows[rows >= 0]].copy()
+    panel_cols = []
+    panel_cfg = load_config()["screener"].get("panel", {})
+    if panel_cfg.get("enabled", False) and not selected.empty:
+        from src.panel_screener import panel_conditions
+
+        flags, _ = panel_conditions(target_date, selected["ticker"].to_numpy(), panel_cfg)
+        for col in flags.columns:
+            selected[col] = flags[col].to_numpy()
+        panel_cols = list(flags.columns)
+    return _output_frame(selected, universe, panel_cols)
@@ -0,0 +1,151 @@
+"""
+업종 폭(breadth): 일자별 전종목 OHLCV를 KRX 업종별로 한 번에 집계한 표.
+상승/하락/보합 종목 수, 상승 비율, 거래대금 합계, 등락률 중앙값, 시가총액 가중 등락률.
+선별 종목만 보는 테마 강도를 업종 전체의 움직임으로 보정할 때 사용 (theme.breadth_weight).
+결과는 cache/breadth/{date}.csv에 저장해 같은 일자는 다시 계산하지 않는다.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from src.config_loader import CACHE_ROOT
+
+BREADTH_DIR = CACHE_ROOT / "breadth"
+COLUMNS = [
+    "sector", "members", "advancers", "decliners", "unchanged", "advance_ratio",
+    "trading_value", "median_change", "cap_weighted_change",
+]
+
+_lock = threading.Lock()
+_memory: dict[str, pd.DataFrame] = {}
+
+
+def grouped_median(codes: np.ndarray, values: np.ndarray, n_groups: int) -> np.ndarray:
+    """Median of values per group code in [0, n_groups) (NaN values ignored; NaN for empty groups)."""
+    ok = np.isfinite(values) & (codes >= 0)
+    codes, values = codes[ok], values[ok]
+    order = np.lexsort((values, codes))
+    values = values[order]
+    counts = np.bincount(codes, minlength=n_groups)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    out = np.full(n_groups, np.nan)
+    has = counts > 0
+    lo = starts[has] + (counts[has] - 1) // 2
+    hi = starts[has] + counts[has] // 2
+    out[has] = (values[lo] + values[hi]) / 2
+    return out
+
+
+def compute_breadth(
+    sector_codes: np.ndarray,
+    sectors: pd.Index,
+    change: np.ndarray,
+    trading_value: np.ndarray,
+    market_cap: np.ndarray,
+) -> pd.DataFrame:
+    """
+    One grouped pass over every listed stock. sector_codes: int codes into sectors (-1 = unclassified,
+    skipped); change, trading_value, market_cap: aligned float arrays (NaN allowed).
+    """
+    n = len(sectors)
+    codes = sector_codes.astype(np.int64)
+    keep = codes >= 0
+    codes, change = codes[keep], change[keep]
+    value, cap = np.nan_to_num(trading_value[keep]), market_cap[keep]
+
+    def count(mask):
+        return np.bincount(codes[mask], minlength=n)
+
+    members = np.bincount(codes, minlength=n)
+    advancers = count(change > 0)
+    decliners = count(change < 0)
+    weighted = np.isfinite(change) & np.isfinite(cap) & (cap > 0)
+    cap_sum = np.bincount(codes[weighted], weights=cap[weighted], minlength=n)
+    cap_chg = np.bincount(codes[weighted], weights=(cap * change)[weighted], minlength=n)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cap_weighted = np.where(cap_sum > 0, cap_chg / cap_sum, np.nan)
+    df = pd.DataFrame({
+        "sector": sectors.to_numpy(dtype=object),
+        "members": members,
+        "advancers": advancers,
+        "decliners": decliners,
+        "unchanged": members - advancers - decliners,
+        "advance_ratio": np.round(advancers / np.maximum(members, 1), 4),
+        "trading_value": np.bincount(codes, weights=value, minlength=n).astype(np.int64),
+        "median_change": np.round(grouped_median(codes, change, n), 2),
+        "cap_weighted_change": np.round(cap_weighted, 2),
+    })
+    return df[df["members"] > 0].sort_values("trading_value", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def _market_caps(target_date: str, universe) -> np.ndarray:
+    """Market cap per universe position from the (cached) KRX sector classification frames."""
+    from src import market_data
+    from src.universe import normalize_tickers
+
+    cap = np.full(len(universe), np.nan)
+    for market in ("KOSPI", "KOSDAQ"):
+        try:
+            df = market_data.get_sector_classifications(target_date, market)
+        except Exception:
+            continue
+        if df is None or df.empty or "시가총액" not in df.columns:
+            continue
+        pos = universe.positions(normalize_tickers(df.index))
+        hit = pos >= 0
+        cap[pos[hit]] = pd.to_numeric(df["시가총액"], errors="coerce").to_numpy(dtype=np.float64)[hit]
+    return cap
+
+
+def _path(target_date: str):
+    return BREADTH_DIR / f"{target_date}.csv"
+
+
+def get_breadth(target_date: str, universe=None) -> pd.DataFrame:
+    """
+    Sector breadth table for target_date (columns: COLUMNS). Computed once from the all-market OHLCV
+    frame and the universe's sector codes, then served from memory / cache/breadth/{date}.csv.
+    Empty when the market was closed or data is unavailable.
+    """
+    with _lock:
+        if target_date in _memory:
+            return _memory[target_date].copy()
+    path = _path(target_date)
+    if path.exists():
+        df = pd.read_csv(path, encoding="utf-8-sig")
+    else:
+        from src.screener import load_market_frame
+        from src.universe import TickerUniverse
+
+        universe = universe if universe is not None else TickerUniverse.build(target_date)
+        market = load_market_frame(target_date, universe)
+        if market is None or not len(universe.sectors):
+            return pd.DataFrame(columns=COLUMNS)
+        pos = market.index.to_numpy()
+        known = pos >= 0
+        market, pos = market[known], pos[known]
+        df = compute_breadth(
+            universe.sector_codes[pos],
+            universe.sectors,
+            pd.to_numeric(market["change_pct"], errors="coerce").to_numpy(dtype=np.float64),
+            pd.to_numeric(market["trading_value"], errors="coerce").to_numpy(dtype=np.float64),
+            _market_caps(target_date, universe)[pos],
+        )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        df.to_csv(tmp, index=False, encoding="utf-8-sig")
+        tmp.replace(path)
+    with _lock:
+        _memory[target_date] = df
+    return df.copy()
+
+
+def breadth_factor(sectors: pd.Series, breadth: pd.DataFrame, weight: float) -> np.ndarray:
+    """
+    Multiplier per sector for theme strength: (1 - weight) + weight × advance_ratio.
+    weight 0 leaves strength unchanged; 1 scales it by the share of the sector's stocks that rose.
+    Sectors missing from the breadth table keep factor 1.
+    """
+    ratio = sectors.map(breadth.set_index("sector")["advance_ratio"]).to_numpy(dtype=np.float64)
+    return np.where(np.isfinite(ratio), (1 - weight) + weight * ratio, 1.0)
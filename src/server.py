@@ -0,0 +1,260 @@
+"""
+상주 서버(serve): 시장 데이터·업종·종목명 캐시를 유지한 채 로컬 HTTP/JSON API 제공
+
+  GET  /health                              상태 및 캐시 항목 수
+  POST /run?date=YYYYMMDD&profile=NAME      파이프라인 실행 요청 (큐 등록, 동일 요청은 중복 제거)
+  GET  /jobs                                작업 목록
+  GET  /jobs/{id}                           작업 상태
+  GET  /results?date=&profile=&table=&top=  결과 조회 (table: ranked/recommended/themes/valuation/screened/news)
+  GET  /news/search?q=&start=&end=&ticker=&limit=  뉴스 전문 검색 (ticker는 쉼표 구분)
+  GET  /metrics                             Prometheus 지표 (단계 시간·외부 호출 지연·캐시 적중·등급 분포)
+"""
+import itertools
+import json
+import queue
+import re
+import threading
+import time
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from src import market_data, metrics
+from src.config_loader import PROJECT_ROOT, load_config, load_profile, use_config
+from src.dates import default_target_date, normalize_date
+from src.pipeline import run_pipeline
+from src.results_store import result_dir
+
+DEFAULT_PROFILE = "default"
+PROFILE_DIR = PROJECT_ROOT / "config" / "profiles"
+_PROFILE_NAME = re.compile(r"[A-Za-z0-9_-]+")
+RESULT_TABLES = ("ranked", "recommended", "themes", "valuation", "screened", "news")
+
+
+def profile_path(profile: str):
+    """config/profiles/{profile}.yaml; ValueError unless the name is [A-Za-z0-9_-]+ and the file exists."""
+    if not _PROFILE_NAME.fullmatch(profile or ""):
+        raise ValueError(f"profile must match [A-Za-z0-9_-]+: {profile!r}")
+    path = PROFILE_DIR / f"{profile}.yaml"
+    if not path.is_file():
+        raise ValueError(f"unknown profile: {profile}")
+    return path
+
+
+def check_profile(profile: str) -> str:
+    """profile unchanged when it is the default or a file under config/profiles/ (else ValueError)."""
+    if profile != DEFAULT_PROFILE:
+        profile_path(profile)
+    return profile
+
+
+class JobManager:
+    """
+    Single worker thread that runs pipeline jobs one at a time.
+    Requests for a (date, profile) that is already queued or running return the existing job;
+    finished results are kept in memory and served as pre-encoded JSON.
+    """
+
+    def __init__(self, save_output: bool = True, max_cached_results: int = 30, max_jobs: int = 1000):
+        self.save_output = save_output
+        self.max_cached_results = max_cached_results
+        self.max_jobs = max_jobs
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._jobs: dict[int, dict] = {}
+        self._active: dict[tuple[str, str], int] = {}
+        # (date, profile) -> {table: encoded JSON bytes}
+        self._results: dict[tuple[str, str], dict[str, bytes]] = {}
+        self._profiles: dict[str, dict] = {}
+        self._worker = threading.Thread(target=self._run_forever, name="pipeline-worker", daemon=True)
+        self._worker.start()
+
+    def _profile_config(self, profile: str) -> dict:
+        if profile == DEFAULT_PROFILE:
+            return load_config()
+        if profile not in self._profiles:
+            self._profiles[profile] = load_profile(profile_path(profile))
+        return self._profiles[profile]
+
+    def submit(self, date: str, profile: str, force: bool = False) -> dict:
+        """Queue a run; raises ValueError for a profile that is not a file under config/profiles/."""
+        self._profile_config(check_profile(profile))
+        if force:
+            # 강제 재실행은 이전 스냅샷으로 대체된 시장 데이터도 제공자에 다시 요청
+            market_data.drop_stale(date)
+        key = (date, profile)
+        with self._lock:
+            if key in self._active:
+                return dict(self._jobs[self._active[key]])
+            if not force and key in self._results:
+                return {"id": None, "date": date, "profile": profile, "status": "done", "cached": True}
+            job_id = next(self._ids)
+            job = {"id": job_id, "date": date, "profile": profile, "status": "queued",
+                   "submitted_at": time.time(), "started_at": None, "finished_at": None, "error": None}
+            self._jobs[job_id] = job
+            self._active[key] = job_id
+            # 오래된 완료 작업 기록 정리
+            for old_id in list(self._jobs)[: max(0, len(self._jobs) - self.max_jobs)]:
+                if self._jobs[old_id]["status"] in ("done", "failed"):
+                    del self._jobs[old_id]
+        self._queue.put(job_id)
+        return dict(job)
+
+    def job(self, job_id: int) -> dict | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def jobs(self) -> list[dict]:
+        with self._lock:
+            return [dict(j) for j in self._jobs.values()]
+
+    def result(self, date: str, profile: str, table: str) -> bytes | None:
+        with self._lock:
+            tables = self._results.get((date, profile))
+            return tables.get(table) if tables else None
+
+    def _store(self, key: tuple[str, str], results: dict | None) -> None:
+        encoded = {}
+        for table in RESULT_TABLES:
+            df = results.get(table) if results else None
+            if df is None:
+                encoded[table] = b"[]"
+            else:
+                encoded[table] = df.to_json(orient="records", force_ascii=False).encode("utf-8")
+        with self._lock:
+            self._results.pop(key, None)
+            self._results[key] = encoded
+            while len(self._results) > self.max_cached_results:
+                self._results.pop(next(iter(self._results)))
+
+    def _run_forever(self) -> None:
+        while True:
+            job_id = self._queue.get()
+            with self._lock:
+                job = self._jobs[job_id]
+                job["status"] = "running"
+                job["started_at"] = time.time()
+            key = (job["date"], job["profile"])
+            started = time.perf_counter()
+            try:
+                cfg = self._profile_config(job["profile"])
+                out_dir = None
+                if job["profile"] != DEFAULT_PROFILE:
+                    out_dir = result_dir(job["date"], job["profile"])
+                with use_config(cfg):
+                    results = run_pipeline(job["date"], save_output=self.save_output, out_dir=out_dir)
+                self._store(key, results)
+                status, error = "done", None
+            except Exception as e:
+                traceback.print_exc()
+                status, error = "failed", str(e)
+            metrics.record_run("success" if status == "done" else "failure", time.perf_counter() - started)
+            with self._lock:
+                job["status"] = status
+                job["error"] = error
+                job["finished_at"] = time.time()
+                self._active.pop(key, None)
+
+
+def _make_handler(manager: JobManager):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, code: int, body: bytes | dict | list, content_type: str = "application/json; charset=utf-8") -> None:
+            if not isinstance(body, bytes):
+                body = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _params(self) -> tuple[str, dict[str, str]]:
+            url = urlparse(self.path)
+            params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            length = int(self.headers.get("Content-Length") or 0)
+            if length:
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                    params.update({k: str(v) for k, v in body.items()})
+                except (ValueError, AttributeError):
+                    pass
+            return url.path.rstrip("/") or "/", params
+
+        def _date_profile(self, params: dict[str, str]) -> tuple[str, str]:
+            date = normalize_date(params["date"]) if params.get("date") else default_target_date()
+            return date, check_profile(params.get("profile") or DEFAULT_PROFILE)
+
+        def do_GET(self):
+            path, params = self._params()
+            try:
+                if path == "/health":
+                    return self._send(200, {"status": "ok", "cache": market_data.cache_info()})
+                if path == "/jobs":
+                    return self._send(200, manager.jobs())
+                if path == "/metrics":
+                    return self._send(200, metrics.render().encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8")
+                if path.startswith("/jobs/"):
+                    job = manager.job(int(path.rsplit("/", 1)[1]))
+                    return self._send(200, job) if job else self._send(404, {"error": "job not found"})
+                if path == "/results":
+                    date, profile = self._date_profile(params)
+                    table = params.get("table", "ranked")
+                    if table not in RESULT_TABLES:
+                        return self._send(400, {"error": f"table must be one of {list(RESULT_TABLES)}"})
+                    body = manager.result(date, profile, table)
+                    if body is None:
+                        return self._send(404, {"error": "no cached result; POST /run first", "date": date, "profile": profile})
+                    top = params.get("top")
+                    if top:
+                        body = json.dumps(json.loads(body)[: int(top)], ensure_ascii=False).encode("utf-8")
+                    return self._send(200, body)
+                if path == "/news/search":
+                    from src import news_index
+
+                    if not params.get("q"):
+                        return self._send(400, {"error": "q is required"})
+                    rows, ms = news_index.timed_search(
+                        params["q"],
+                        start=normalize_date(params["start"]) if params.get("start") else None,
+                        end=normalize_date(params["end"]) if params.get("end") else None,
+                        tickers=[t for t in params.get("ticker", "").split(",") if t] or None,
+                        limit=int(params.get("limit", 20)),
+                    )
+                    return self._send(200, {"took_ms": round(ms, 2), "count": len(rows), "results": rows})
+                return self._send(404, {"error": "not found"})
+            except ValueError as e:
+                return self._send(400, {"error": str(e)})
+
+        def do_POST(self):
+            path, params = self._params()
+            if path != "/run":
+                return self._send(404, {"error": "not found"})
+            try:
+                date, profile = self._date_profile(params)
+            except ValueError as e:
+                return self._send(400, {"error": str(e)})
+            force = params.get("force", "").lower() in ("1", "true", "yes")
+            try:
+                job = manager.submit(date, profile, force=force)
+            except ValueError as e:
+                return self._send(400, {"error": str(e)})
+            return self._send(200 if job["status"] == "done" else 202, job)
+
+        def log_message(self, fmt, *args):
+            pass
+
+    return Handler
+
+
+def serve(host: str = "127.0.0.1", port: int = 8765, save_output: bool = True) -> None:
+    """Run the HTTP API until interrupted."""
+    manager = JobManager(save_output=save_output)
+    httpd = ThreadingHTTPServer((host, port), _make_handler(manager))
+    print(f"[serve] http://{host}:{port} (Ctrl+C 종료)")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
@@ -1,47 +1,187 @@
 """
 3. 주도 테마 분석: 선별 종목의 업종(Sector) 집계 및 상위 N개 주도 테마
+   (theme.taxonomy_file 지정 시 사용자 정의 테마, theme.source: correlation이면 수익률 상관 군집으로 집계;
+    종목별 업종은 밸류에이션용으로 유지)
 """
+import numpy as np
 import pandas as pd
-from pykrx import stock
 
+from src import market_data
 from src.config_loader import load_config
+from src.universe import normalize_tickers
 
 
 def get_sector_mapping(date: str) -> pd.DataFrame:
-    """Return DataFrame with columns: ticker (index), sector (업종명). Uses pykrx sector classifications."""
+    """
+    Return DataFrame with columns: ticker, sector (업종명), name (종목명), market.
+    Uses pykrx sector classifications.
+    """
     out = []
     for market in ("KOSPI", "KOSDAQ"):
         try:
-            df = stock.get_market_sector_classifications(date, market)
+            df = market_data.get_sector_classifications(date, market)
             if df is not None and not df.empty:
                 df = df.reset_index()
                 # columns: 종목코드, 종목명, 업종명, ...
                 code_col = df.columns[0]
                 sector_col = "업종명" if "업종명" in df.columns else df.columns[2]
-                df = df[[code_col, sector_col]].copy()
-                df = df.rename(columns={code_col: "ticker", sector_col: "sector"})
-                df["ticker"] = df["ticker"].astype(str).str.zfill(6)
+                name_col = "종목명" if "종목명" in df.columns else df.columns[1]
+                df = df[[code_col, sector_col, name_col]].copy()
+                df = df.rename(columns={code_col: "ticker", sector_col: "sector", name_col: "name"})
+                df["ticker"] = normalize_tickers(df["ticker"]).to_numpy()
+                df["market"] = market
                 out.append(df)
         except Exception:
             continue
     if not out:
-        return pd.DataFrame(columns=["ticker", "sector"])
+        return pd.DataFrame(columns=["ticker", "sector", "name", "market"])
     return pd.concat(out, ignore_index=True).drop_duplicates(subset=["ticker"], keep="first")
 
 
+def _apply_breadth(agg_df: pd.DataFrame, breadth: pd.DataFrame, weight: float) -> pd.DataFrame:
+    """Scale theme_strength by the sector's market-wide advance ratio and add breadth columns."""
+    from src.sector_breadth import breadth_factor
+
+    agg_df["theme_strength"] = (agg_df["theme_strength"] * breadth_factor(agg_df["sector"], breadth, weight)).round(2)
+    by_sector = breadth.set_index("sector")
+    for col in ("advance_ratio", "median_change"):
+        agg_df[col] = agg_df["sector"].map(by_sector[col])
+    return agg_df
+
+
+def _run_with_universe(screened_df: pd.DataFrame, universe, top_n: int, weight_by_rise: bool, breadth=None, breadth_weight=0.0):
+    """Sector aggregation on universe positions (screened_df.index) with integer sector codes."""
+    pos = screened_df.index.to_numpy()
+    codes = universe.sector_codes[pos]
+    keep = codes >= 0
+    if not keep.any():
+        return (
+            pd.DataFrame(columns=["sector", "count", "sample_tickers"]),
+            pd.Series(dtype=object),
+        )
+    if "change_pct" in screened_df.columns:
+        change = pd.to_numeric(screened_df["change_pct"], errors="coerce").fillna(0).to_numpy()
+    else:
+        change = np.zeros(len(pos))
+    # KRX 분류 순서로 정렬 (합계·대표 종목이 종목코드 매핑 방식과 동일하게 나오도록)
+    order = np.flatnonzero(keep)
+    order = order[np.argsort(universe.class_order[pos[order]], kind="stable")]
+    pos, codes, change = pos[order], codes[order].astype(np.int64), change[order]
+    tickers = universe.tickers_at(pos)
+
+    by_sector = pd.DataFrame({"code": codes, "ticker": tickers, "rise": np.clip(change, 0, None)}).groupby("code")
+    agg_df = by_sector.agg(count=("ticker", "count"), theme_strength=("rise", "sum"))
+    agg_df.insert(0, "sector", universe.sectors[agg_df.index])
+    if weight_by_rise:
+        # theme_strength = sum of positive change_pct (상승만 반영) per sector
+        sort_col = "theme_strength"
+    else:
+        agg_df["theme_strength"] = agg_df["count"]
+        sort_col = "count"
+    if breadth is not None:
+        agg_df = _apply_breadth(agg_df, breadth, breadth_weight)
+        sort_col = "theme_strength"
+    agg_df["sample_tickers"] = by_sector["ticker"].apply(lambda x: ", ".join(x.head(2).tolist()))
+    agg_df = agg_df.sort_values(sort_col, ascending=False).head(top_n).reset_index(drop=True)
+
+    ticker_to_sector = pd.Series(universe.sectors_at(pos), index=pd.Index(tickers, name="ticker"), name="sector")
+    return agg_df, ticker_to_sector
+
+
+def _theme_taxonomy(theme_cfg: dict, target_date: str | None):
+    """User taxonomy file, correlation clusters (theme.source: correlation), or None for KRX sectors."""
+    if theme_cfg.get("taxonomy_file"):
+        from src.theme_taxonomy import load_taxonomy
+
+        return load_taxonomy(theme_cfg["taxonomy_file"])
+    if theme_cfg.get("source", "krx") == "correlation" and target_date:
+        from src.corr_themes import cluster_taxonomy
+
+        return cluster_taxonomy(target_date, theme_cfg.get("correlation"))
+    return None
+
+
+def _custom_themes(screened_df: pd.DataFrame, taxonomy, top_n: int, weight_by_rise: bool) -> pd.DataFrame:
+    """Top N user-defined themes (a stock counts toward every theme it belongs to)."""
+    if "change_pct" in screened_df.columns:
+        change = pd.to_numeric(screened_df["change_pct"], errors="coerce").fillna(0).to_numpy()
+    else:
+        change = np.zeros(len(screened_df))
+    agg_df = taxonomy.aggregate(normalize_tickers(screened_df["ticker"]).to_numpy(), np.clip(change, 0, None))
+    if weight_by_rise:
+        sort_col = "theme_strength"
+    else:
+        agg_df["theme_strength"] = agg_df["count"]
+        sort_col = "count"
+    return agg_df.sort_values(sort_col, ascending=False, kind="stable").head(top_n).reset_index(drop=True)
+
+
 def run_theme_analyzer(
     screened_df: pd.DataFrame,
     target_date: str | None = None,
+    universe=None,
 ) -> tuple[pd.DataFrame, pd.Series]:
     """
     screened_df: output of screener (columns include ticker, name, ...).
     target_date: YYYYMMDD for sector lookup (required for pykrx).
+    universe: TickerUniverse; when given, screened_df.index holds universe positions and sectors
+      come from the universe's integer sector codes (no extra lookups).
     Returns:
-      - themes_df: top N sectors with count and sample tickers (columns: sector, count, sample_tickers)
-      - ticker_to_sector: Series ticker -> sector name for screened stocks
+      - themes_df: top N sectors with count and sample tickers (columns: sector, count, sample_tickers);
+        with theme.taxonomy_file / theme.source: correlation the "sector" column holds theme names;
+        with theme.breadth_weight > 0 (KRX sectors) theme_strength is scaled by the sector's market-wide
+        advance ratio and advance_ratio / median_change columns are added
+      - ticker_to_sector: Series ticker -> KRX sector name for screened stocks
     """
     cfg = load_config()
-    top_n = cfg.get("theme", {}).get("top_n_sectors", 10)
+    theme_cfg = cfg.get("theme", {})
+    top_n = theme_cfg.get("top_n_sectors", 10)
+    weight_by_rise = theme_cfg.get("weight_by_change_pct", True)
+    breadth_weight = float(theme_cfg.get("breadth_weight", 0) or 0)
+    breadth = None
+    if breadth_weight > 0 and target_date:
+        from src.sector_breadth import get_breadth
+
+        breadth = get_breadth(target_date, universe)
+        if breadth.empty:
+            breadth = None
+
+    themes_df, ticker_to_sector = _run_krx_sectors(
+        screened_df, target_date, universe, top_n, weight_by_rise, breadth, breadth_weight
+    )
+    taxonomy = _theme_taxonomy(theme_cfg, target_date)
+    if taxonomy is not None:
+        themes_df = _custom_themes(screened_df, taxonomy, top_n, weight_by_rise)
+    return themes_df, ticker_to_sector
+
+
+def best_theme_rank(
+    screened_df: pd.DataFrame,
+    theme_rank: dict[str, int],
+    target_date: str | None = None,
+) -> np.ndarray | None:
+    """
+    With a theme taxonomy (file or correlation clusters): each screened stock's best rank among the
+    themes it belongs to (aligned with screened_df rows, NaN = no ranked theme). None when using KRX sectors.
+    """
+    taxonomy = _theme_taxonomy(load_config().get("theme", {}), target_date)
+    if taxonomy is None:
+        return None
+    return taxonomy.best_rank(screened_df["ticker"].to_numpy(), theme_rank)
+
+
+def _run_krx_sectors(
+    screened_df: pd.DataFrame,
+    target_date: str | None,
+    universe,
+    top_n: int,
+    weight_by_rise: bool,
+    breadth: pd.DataFrame | None = None,
+    breadth_weight: float = 0.0,
+) -> tuple[pd.DataFrame, pd.Series]:
+    """KRX sector aggregation (universe positions when given, else ticker strings)."""
+    if universe is not None:
+        return _run_with_universe(screened_df, universe, top_n, weight_by_rise, breadth, breadth_weight)
 
     if not target_date:
         return (
@@ -67,7 +207,6 @@ def run_theme_analyzer(
         sub["change_pct"] = 0.0
     sub["change_pct"] = pd.to_numeric(sub["change_pct"], errors="coerce").fillna(0)
 
-    weight_by_rise = cfg.get("theme", {}).get("weight_by_change_pct", True)
     if weight_by_rise:
         # theme_strength = sum of positive change_pct (상승만 반영) per sector
         sub["rise"] = sub["change_pct"].clip(lower=0)
@@ -75,11 +214,15 @@ def run_theme_analyzer(
             count=("ticker", "count"),
             theme_strength=("rise", "sum"),
         )
-        agg_df = agg_df.sort_values("theme_strength", ascending=False).head(top_n)
+        sort_col = "theme_strength"
     else:
         agg_df = sub.groupby("sector", as_index=False).agg(count=("ticker", "count"))
         agg_df["theme_strength"] = agg_df["count"]
-        agg_df = agg_df.sort_values("count", ascending=False).head(top_n)
+        sort_col = "count"
+    if breadth is not None:
+        agg_df = _apply_breadth(agg_df, breadth, breadth_weight)
+        sort_col = "theme_strength"
+    agg_df = agg_df.sort_values(sort_col, ascending=False).head(top_n)
 
     sample = sub.groupby("sector")["ticker"].apply(lambda x: ", ".join(x.head(2).tolist())).to_dict()
     agg_df["sample_tickers"] = agg_df["sector"].map(sample)
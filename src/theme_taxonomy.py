@@ -0,0 +1,146 @@
+"""
+사용자 정의 테마 분류: 테마 → 종목 목록 파일(YAML/CSV)을 읽어 종목×테마 희소 행렬(COO)로 보관.
+한 종목이 여러 테마에 속할 수 있으며, 집계는 np.bincount로 수행해 테마 수가 많아도 가볍다.
+
+YAML 예시 (종목코드는 따옴표로 감쌀 것, 001200 등이 8진수로 읽히지 않도록):
+  2차전지: ["373220", "006400", "247540"]
+  방산: ["012450", "079550"]
+CSV 예시 (헤더 theme,ticker):
+  theme,ticker
+  2차전지,373220
+"""
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.config_loader import PROJECT_ROOT
+from src.universe import normalize_tickers
+
+_cache: dict[Path, tuple[float, "ThemeTaxonomy"]] = {}
+_lock = threading.Lock()
+
+
+class ThemeTaxonomy:
+    """
+    Sparse ticker×theme membership.
+
+    tickers: pd.Index of 6-char tickers (row space).
+    themes:  pd.Index of theme names (column space), in file order.
+    rows, cols: int32 COO coordinates, one entry per (ticker, theme) membership.
+    """
+
+    def __init__(self, tickers: pd.Index, themes: pd.Index, rows: np.ndarray, cols: np.ndarray):
+        self.tickers = tickers
+        self.themes = themes
+        self.rows = rows
+        self.cols = cols
+
+    @property
+    def nnz(self) -> int:
+        return len(self.rows)
+
+    @classmethod
+    def from_pairs(cls, themes, tickers) -> "ThemeTaxonomy":
+        """Build from parallel theme/ticker sequences (duplicate pairs are dropped)."""
+        pairs = pd.DataFrame({"theme": pd.Series(themes, dtype=object), "ticker": normalize_tickers(tickers)})
+        pairs = pairs.dropna().drop_duplicates()
+        theme_cat = pd.Categorical(pairs["theme"].astype(str), categories=pd.unique(pairs["theme"].astype(str)))
+        ticker_cat = pd.Categorical(pairs["ticker"])
+        return cls(
+            pd.Index(ticker_cat.categories, name="ticker"),
+            pd.Index(theme_cat.categories, name="theme"),
+            ticker_cat.codes.astype(np.int32),
+            theme_cat.codes.astype(np.int32),
+        )
+
+    @classmethod
+    def read(cls, path: Path) -> "ThemeTaxonomy":
+        if path.suffix.lower() == ".csv":
+            df = pd.read_csv(path, dtype=str, encoding="utf-8-sig")
+            return cls.from_pairs(df["theme"], df["ticker"])
+        import yaml
+
+        with open(path, "r", encoding="utf-8") as f:
+            data = yaml.safe_load(f) or {}
+        themes, tickers = [], []
+        for theme, members in data.items():
+            for t in members or []:
+                themes.append(str(theme))
+                tickers.append(str(t))
+        return cls.from_pairs(themes, tickers)
+
+    def screened_entries(self, tickers) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Membership entries restricted to the given tickers.
+        Returns (slot, col): slot = index into `tickers`, col = theme code, one pair per membership.
+        """
+        idx = self.tickers.get_indexer(normalize_tickers(tickers))
+        slot_of_row = np.full(len(self.tickers), -1, dtype=np.int64)
+        hit = idx >= 0
+        slot_of_row[idx[hit]] = np.flatnonzero(hit)
+        slot = slot_of_row[self.rows]
+        keep = slot >= 0
+        return slot[keep], self.cols[keep].astype(np.int64)
+
+    def aggregate(self, tickers, rise: np.ndarray, samples: int = 2) -> pd.DataFrame:
+        """
+        Per-theme count, theme_strength (sum of rise) and sample_tickers (first `samples` members
+        in the given ticker order) for themes with at least one member among tickers.
+        """
+        tickers = np.asarray(tickers, dtype=object)
+        slot, col = self.screened_entries(tickers)
+        n = len(self.themes)
+        count = np.bincount(col, minlength=n)
+        strength = np.bincount(col, weights=np.asarray(rise, dtype=float)[slot], minlength=n)
+        present = np.flatnonzero(count)
+
+        # 대표 종목: 테마별로 입력 순서상 앞선 종목 (col, slot 정렬 후 그룹 내 순번)
+        order = np.lexsort((slot, col))
+        col_s, slot_s = col[order], slot[order]
+        starts = np.r_[0, np.flatnonzero(np.diff(col_s)) + 1] if len(col_s) else np.array([], dtype=np.int64)
+        rank_in_group = np.arange(len(col_s)) - np.repeat(starts, np.diff(np.r_[starts, len(col_s)]))
+        first = rank_in_group < samples
+        sample_map: dict[int, list[str]] = {}
+        for c, s in zip(col_s[first], slot_s[first]):
+            sample_map.setdefault(int(c), []).append(tickers[s])
+
+        return pd.DataFrame({
+            "sector": self.themes[present],
+            "count": count[present],
+            "theme_strength": strength[present],
+            "sample_tickers": [", ".join(sample_map[int(c)]) for c in present],
+        })
+
+    def best_rank(self, tickers, theme_rank: dict[str, int]) -> np.ndarray:
+        """Best (lowest) rank among each ticker's themes; NaN when none of its themes is ranked."""
+        slot, col = self.screened_entries(tickers)
+        rank_of_theme = pd.Series(theme_rank, dtype=float).reindex(self.themes).to_numpy()
+        out = np.full(len(tickers), np.inf)
+        np.minimum.at(out, slot, np.nan_to_num(rank_of_theme[col], nan=np.inf))
+        out[np.isinf(out)] = np.nan
+        return out
+
+
+def resolve_path(path: str | Path) -> Path:
+    p = Path(path)
+    if not p.is_absolute() and not p.exists():
+        p = PROJECT_ROOT / p
+    if not p.exists():
+        raise FileNotFoundError(f"테마 분류 파일 없음: {path}")
+    return p
+
+
+def load_taxonomy(path: str | Path) -> ThemeTaxonomy:
+    """Load (and cache by modification time) a theme taxonomy file."""
+    p = resolve_path(path)
+    mtime = p.stat().st_mtime
+    with _lock:
+        hit = _cache.get(p)
+        if hit is not None and hit[0] == mtime:
+            return hit[1]
+    taxonomy = ThemeTaxonomy.read(p)
+    with _lock:
+        _cache[p] = (mtime, taxonomy)
+    return taxonomy
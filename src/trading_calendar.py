@@ -0,0 +1,118 @@
+"""
+KRX 거래일 달력: 로컬 OHLCV 저장소의 일자 기록(days/{date}.npz = 거래일, days/{date}.closed = 휴장일)과
+양력 고정 휴장일(신정·삼일절·근로자의 날·어린이날·현충일·광복절·개천절·한글날·성탄절·연말)로 만든다.
+저장소 디렉터리가 바뀌면(새 스냅샷·휴장 표식) 다음 조회 때 다시 읽는다 (지연 갱신).
+음력 명절·대체공휴일·선거일 등은 지난 일자에 빈 시세가 돌아오고 근거가 있을 때(이후 거래일이 이미 저장됨,
+또는 잠시 뒤 다시 조회해도 빈 시세) 휴장으로 기록한다. 표식은 trading_calendar.closed_marker_days가 지나면
+다시 확인하며, ohlcv-backfill --force로 기간 내 표식을 지울 수 있다 (KRX 차단·지연으로 잘못 기록된 경우).
+"""
+import threading
+from datetime import datetime, timedelta
+
+from src import ohlcv_store
+from src.config_loader import load_config
+
+# KRX 양력 고정 휴장일 (MMDD). 12/31은 연말 휴장
+FIXED_HOLIDAYS = frozenset({"0101", "0301", "0501", "0505", "0606", "0815", "1003", "1009", "1225", "1231"})
+MAX_LOOKBACK_DAYS = 30
+
+_lock = threading.Lock()
+_cached: tuple[tuple, "TradingCalendar"] | None = None
+
+
+class TradingCalendar:
+    """
+    Trading day lookups. Stored days win (a stored snapshot is a trading day, a .closed marker a holiday);
+    other dates are trading days when they are weekdays, not fixed holidays and not in extra_holidays.
+    """
+
+    def __init__(self, stored: dict[str, bool], fixed_holidays: bool = True, extra_holidays=()):
+        self.stored = stored
+        self.fixed_holidays = fixed_holidays
+        self.extra_holidays = frozenset(str(d).replace("-", "") for d in extra_holidays)
+
+    def is_trading_day(self, date: str) -> bool:
+        known = self.stored.get(date)
+        if known is not None:
+            return known
+        if date in self.extra_holidays or datetime.strptime(date, "%Y%m%d").weekday() >= 5:
+            return False
+        return not (self.fixed_holidays and date[4:] in FIXED_HOLIDAYS)
+
+    def previous_trading_day(self, date: str, inclusive: bool = True) -> str:
+        """Most recent trading day on or before date (strictly before when inclusive=False)."""
+        d = datetime.strptime(date, "%Y%m%d")
+        if not inclusive:
+            d -= timedelta(days=1)
+        for _ in range(MAX_LOOKBACK_DAYS):
+            day = d.strftime("%Y%m%d")
+            if self.is_trading_day(day):
+                return day
+            d -= timedelta(days=1)
+        raise ValueError(f"{date} 이전 {MAX_LOOKBACK_DAYS}일 안에 거래일 없음")
+
+    def trading_days(self, start: str, end: str) -> list[str]:
+        """Trading days from start to end inclusive (YYYYMMDD)."""
+        d = datetime.strptime(start, "%Y%m%d")
+        last = datetime.strptime(end, "%Y%m%d")
+        out = []
+        while d <= last:
+            day = d.strftime("%Y%m%d")
+            if self.is_trading_day(day):
+                out.append(day)
+            d += timedelta(days=1)
+        return out
+
+
+def _days_mtime() -> int:
+    days = ohlcv_store.STORE_ROOT / "days"
+    return days.stat().st_mtime_ns if days.exists() else 0
+
+
+def get_calendar() -> TradingCalendar:
+    """Calendar over the current OHLCV store; rebuilt only when the store's day directory or config changed."""
+    global _cached
+    cfg = load_config().get("trading_calendar", {})
+    fixed, extra = bool(cfg.get("fixed_holidays", True)), tuple(cfg.get("extra_holidays") or ())
+    marker_days = float(cfg.get("closed_marker_days", ohlcv_store.CLOSED_MARKER_DAYS))
+    # 표식 만료는 디렉터리 변경 없이 일어나므로 오늘 날짜도 키에 포함
+    key = (str(ohlcv_store.STORE_ROOT), _days_mtime(), fixed, extra, marker_days, datetime.now().strftime("%Y%m%d"))
+    with _lock:
+        if _cached is not None and _cached[0] == key:
+            return _cached[1]
+    calendar = TradingCalendar(ohlcv_store.stored_days(marker_days), fixed, extra)
+    with _lock:
+        _cached = (key, calendar)
+    return calendar
+
+
+def is_trading_day(date: str) -> bool:
+    return get_calendar().is_trading_day(date)
+
+
+def previous_trading_day(date: str, inclusive: bool = True) -> str:
+    return get_calendar().previous_trading_day(date, inclusive)
+
+
+def trading_days(start: str, end: str) -> list[str]:
+    return get_calendar().trading_days(start, end)
+
+
+def has_later_trading_day(date: str) -> bool:
+    """True when a trading day after date is already stored (KRX was serving data for later dates)."""
+    return any(trading and d > date for d, trading in get_calendar().stored.items())
+
+
+def mark_closed(date: str, evidence: str) -> None:
+    """
+    Record date as a market holiday after an empty all-market OHLCV answer for a past date.
+    evidence: why the empty answer is trusted ("later_data" or "retry"); kept in the marker file.
+    """
+    if not ohlcv_store.snapshot_path(date).exists():
+        ohlcv_store.mark_closed(date, evidence)
+        print(f"[{date}] 빈 시세 → 휴장일로 기록 (근거: {evidence})")
+
+
+def clear_closed(dates) -> int:
+    """Forget recorded holidays in dates so they are fetched again; returns the number of markers removed."""
+    return ohlcv_store.clear_closed(dates)
@@ -0,0 +1,137 @@
+"""
+일자별 종목 유니버스: 정규화된 종목코드·종목명·시장·업종을 한 번만 만들어 단계 간 공유.
+종목은 유니버스 내 정수 위치(position)로 식별하며, 시장·업종은 정수 코드 + 범주 목록으로 보관.
+"""
+import numpy as np
+import pandas as pd
+
+UNCLASSIFIED_SECTOR = "(미분류)"
+
+
+def normalize_tickers(values) -> pd.Index:
+    """Canonical 6-character ticker codes (the only place tickers are zero-padded)."""
+    return pd.Index(pd.Index(values).astype(str).str.zfill(6), name="ticker")
+
+
+class TickerUniverse:
+    """
+    Canonical ticker table for one date.
+
+    codes:        pd.Index of 6-char tickers; position i is the stock's integer id for this date.
+    names:        object array of stock names ("" when unknown until looked up).
+    market_codes: int8 codes into `markets` (-1 = not in KRX sector classification).
+    sector_codes: int16 codes into `sectors` (-1 = not in KRX sector classification).
+    class_order:  int32 row order in the KRX sector classification (-1 = not classified).
+
+    Frames produced with a universe (screener, valuation) carry these positions as their index,
+    so later stages join with array takes instead of re-formatting and re-hashing ticker strings.
+    """
+
+    def __init__(
+        self,
+        date: str,
+        codes: pd.Index,
+        names: np.ndarray,
+        market_codes: np.ndarray,
+        markets: pd.Index,
+        sector_codes: np.ndarray,
+        sectors: pd.Index,
+        class_order: np.ndarray | None = None,
+        source_index: pd.Index | None = None,
+    ):
+        self.date = date
+        self.codes = codes
+        self.names = names
+        self.market_codes = market_codes
+        self.markets = markets
+        self.sector_codes = sector_codes
+        self.sectors = sectors
+        self.class_order = class_order if class_order is not None else np.full(len(codes), -1, dtype=np.int32)
+        self._source_index = source_index
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @classmethod
+    def build(cls, date: str) -> "TickerUniverse":
+        """Build from the date's all-market OHLCV and KRX sector classifications (both cached)."""
+        from src import market_data
+        from src.theme_analyzer import get_sector_mapping
+
+        try:
+            ohlcv = market_data.get_market_ohlcv(date)
+        except Exception as e:
+            raise RuntimeError(f"pykrx 조회 실패 (날짜={date}): {e}") from e
+        source_index = ohlcv.index if ohlcv is not None else pd.Index([])
+        return cls.from_frames(date, source_index, get_sector_mapping(date))
+
+    @classmethod
+    def from_frames(cls, date: str, source_index: pd.Index, sector_map: pd.DataFrame) -> "TickerUniverse":
+        """source_index: raw OHLCV ticker index. sector_map: ticker, sector[, name, market]."""
+        codes = normalize_tickers(source_index)
+        n = len(codes)
+        names = np.full(n, "", dtype=object)
+        market_codes = np.full(n, -1, dtype=np.int8)
+        sector_codes = np.full(n, -1, dtype=np.int16)
+        class_order = np.full(n, -1, dtype=np.int32)
+        markets = pd.Index([])
+        sectors = pd.Index([])
+        if sector_map is not None and not sector_map.empty:
+            pos = codes.get_indexer(sector_map["ticker"])
+            hit = pos >= 0
+            pos = pos[hit]
+            sub = sector_map[hit]
+            sector_cat = pd.Categorical(sub["sector"].fillna(UNCLASSIFIED_SECTOR))
+            sectors = pd.Index(sector_cat.categories)
+            sector_codes[pos] = sector_cat.codes
+            class_order[pos] = np.arange(len(pos), dtype=np.int32)
+            if "market" in sub.columns:
+                market_cat = pd.Categorical(sub["market"])
+                markets = pd.Index(market_cat.categories)
+                market_codes[pos] = market_cat.codes
+            if "name" in sub.columns:
+                names[pos] = sub["name"].fillna("").astype(str).to_numpy()
+        return cls(
+            date, codes, names, market_codes, markets, sector_codes, sectors,
+            class_order=class_order, source_index=source_index,
+        )
+
+    def align(self, index) -> np.ndarray:
+        """Positions (int64, -1 = unknown) for a raw ticker index, e.g. a pykrx frame's index."""
+        if self._source_index is not None and isinstance(index, pd.Index) and index.equals(self._source_index):
+            return np.arange(len(self.codes))
+        return self.codes.get_indexer(normalize_tickers(index))
+
+    def positions(self, tickers) -> np.ndarray:
+        """Positions for canonical ticker strings (-1 = unknown)."""
+        return self.codes.get_indexer(tickers)
+
+    def tickers_at(self, pos: np.ndarray) -> np.ndarray:
+        return self.codes.to_numpy()[pos]
+
+    def names_at(self, pos: np.ndarray) -> np.ndarray:
+        """Stock names; names missing from the sector classification are looked up once and kept."""
+        pos = np.asarray(pos)
+        missing = pos[self.names[pos] == ""]
+        if len(missing):
+            from src import market_data
+
+            for p in np.unique(missing):
+                self.names[p] = market_data.get_ticker_name(self.codes[p])
+        return self.names[pos]
+
+    def sectors_at(self, pos: np.ndarray) -> np.ndarray:
+        """Sector names (NaN where unclassified)."""
+        codes = self.sector_codes[np.asarray(pos)]
+        if not len(self.sectors):
+            return np.full(len(codes), np.nan, dtype=object)
+        out = self.sectors.to_numpy(dtype=object)[np.where(codes >= 0, codes, 0)]
+        out[codes < 0] = np.nan
+        return out
+
+    def scatter(self, pos: np.ndarray, values, fill=np.nan) -> np.ndarray:
+        """Full-length array with values placed at pos (for position joins between stages)."""
+        values = np.asarray(values)
+        out = np.full(len(self.codes), fill, dtype=object if values.dtype.kind in "OUS" else np.float64)
+        out[np.asarray(pos)] = values
+        return out
@@ -1,9 +1,10 @@
 """
 4. 밸류에이션: PER, PBR 조회 및 업종 대비 저평가/고평가 판정
 """
+import numpy as np
 import pandas as pd
-from pykrx import stock
 
+from src import market_data
 from src.config_loader import load_config
 
 
@@ -18,15 +19,49 @@ def _ensure_english_columns(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def _sector_medians_by_position(
+    fund: pd.DataFrame, fpos: np.ndarray, scope_pos: np.ndarray, universe
+) -> tuple[dict[str, float], dict[str, float]]:
+    """Sector PER/PBR medians over fundamental rows whose universe position is in scope_pos."""
+    in_scope = np.zeros(len(universe), dtype=bool)
+    in_scope[scope_pos[scope_pos >= 0]] = True
+    rows = (fpos >= 0) & in_scope[np.where(fpos >= 0, fpos, 0)]
+    codes = universe.sector_codes[fpos[rows]]
+    grouped = pd.DataFrame({
+        "code": codes,
+        "per": pd.to_numeric(fund["per"], errors="coerce").to_numpy()[rows] if "per" in fund.columns else np.nan,
+        "pbr": pd.to_numeric(fund["pbr"], errors="coerce").to_numpy()[rows] if "pbr" in fund.columns else np.nan,
+    })
+    grouped = grouped[grouped["code"] >= 0]
+    medians: tuple[dict[str, float], dict[str, float]] = ({}, {})
+    for out, col in zip(medians, ("per", "pbr")):
+        positive = grouped[grouped[col] > 0].groupby("code")[col].median()
+        for code in np.unique(grouped["code"]):
+            out[universe.sectors[code]] = float(positive.get(code, float("nan")))
+    return medians
+
+
 def run_valuation(
     tickers: list[str],
     target_date: str,
     sector_series: pd.Series | None = None,
+    universe=None,
+    positions: np.ndarray | None = None,
+    median_positions: np.ndarray | None = None,
 ) -> pd.DataFrame:
     """
     Get PER/PBR for given tickers on target_date and judge undervalued/overvalued.
     sector_series: ticker -> sector name (from theme_analyzer). If provided, use sector median for comparison.
+    universe, positions: TickerUniverse and the tickers' positions in it. When given, the fundamental
+      frame is aligned to the universe once, sectors come from the universe (sector_series then only
+      switches sector-relative judging on), medians group on integer sector codes over the requested
+      tickers, and the returned frame's index holds universe positions.
+    median_positions: universe positions whose rows give the sector medians (default: positions),
+      e.g. the day's screened set when judging a watchlist the same way as the full run.
     Returns DataFrame with columns: ticker, per, pbr, valuation_label, sector_median_per, sector_median_pbr (if sector given).
+    With valuation.history_sketch (universe required) also per/pbr_pct_sector (today's in-sector percentile)
+    and per/pbr_pct_hist (percentile within the sector's accumulated history); label_mode "percentile"
+    labels from those percentiles instead of the median ratios.
     """
     cfg = load_config()
     val_cfg = cfg.get("valuation", {})
@@ -34,10 +69,15 @@ def run_valuation(
     over_per = val_cfg.get("overvalued_per_ratio", 1.2)
     under_pbr = val_cfg.get("undervalued_pbr_ratio", 0.8)
     over_pbr = val_cfg.get("overvalued_pbr_ratio", 1.2)
+    use_history = val_cfg.get("history_sketch", False) and universe is not None
+    label_by_pct = use_history and val_cfg.get("label_mode", "ratio") == "percentile"
+    pct_basis = "hist" if val_cfg.get("percentile_basis", "historical") == "historical" else "sector"
+    under_pct = val_cfg.get("undervalued_percentile", 20)
+    over_pct = val_cfg.get("overvalued_percentile", 80)
 
     # Get market-wide fundamental for the date (all tickers); then filter to our list
     try:
-        fund = stock.get_market_fundamental_by_ticker(target_date, market="ALL")
+        fund = market_data.get_market_fundamental(target_date)
     except Exception as e:
         raise RuntimeError(f"pykrx fundamental 조회 실패 (날짜={target_date}): {e}") from e
 
@@ -45,15 +85,28 @@ def run_valuation(
         return _empty_valuation_df()
 
     fund = _ensure_english_columns(fund.copy())
-    fund = fund.reset_index()
-    first_col = fund.columns[0]
-    if first_col != "ticker":
-        fund = fund.rename(columns={first_col: "ticker"})
-    fund["ticker"] = fund["ticker"].astype(str).str.zfill(6)
+    full_pos = None
+    if universe is not None:
+        if positions is None:
+            positions = universe.positions(tickers)
+        full_pos = universe.align(fund.index)
+        full = fund.reset_index(drop=True)
+        wanted = np.zeros(len(universe), dtype=bool)
+        wanted[positions[positions >= 0]] = True
+        mask = (full_pos >= 0) & wanted[np.where(full_pos >= 0, full_pos, 0)]
+        fund = full[mask].copy()
+        fund.insert(0, "ticker", universe.tickers_at(full_pos[mask]))
+        fund.index = full_pos[mask]
+    else:
+        fund = fund.reset_index()
+        first_col = fund.columns[0]
+        if first_col != "ticker":
+            fund = fund.rename(columns={first_col: "ticker"})
+        fund["ticker"] = fund["ticker"].astype(str).str.zfill(6)
 
-    # Filter to requested tickers
-    ticker_set = set(str(t).zfill(6) for t in tickers)
-    fund = fund[fund["ticker"].isin(ticker_set)].copy()
+        # Filter to requested tickers
+        ticker_set = set(str(t).zfill(6) for t in tickers)
+        fund = fund[fund["ticker"].isin(ticker_set)].copy()
 
     for col in ("per", "pbr", "PER", "PBR"):
         if col in fund.columns:
@@ -66,8 +119,11 @@ def run_valuation(
     # Sector medians: if we have sector_series, get sector medians from full fundamental
     sector_median_per: dict[str, float] = {}
     sector_median_pbr: dict[str, float] = {}
-    if sector_series is not None and not sector_series.empty:
-        full = stock.get_market_fundamental_by_ticker(target_date, market="ALL")
+    if universe is not None and sector_series is not None and not sector_series.empty:
+        scope = positions if median_positions is None else median_positions
+        sector_median_per, sector_median_pbr = _sector_medians_by_position(full, full_pos, scope, universe)
+    elif sector_series is not None and not sector_series.empty:
+        full = market_data.get_market_fundamental(target_date)
         if full is not None and not full.empty:
             full = _ensure_english_columns(full.reset_index())
             tc = full.columns[0]
@@ -91,6 +147,16 @@ def run_valuation(
                 sector_median_per[sec] = float(per_vals.median()) if len(per_vals) else float("nan")
                 sector_median_pbr[sec] = float(pbr_vals.median()) if len(pbr_vals) else float("nan")
 
+    # Sector percentiles (current day + accumulated history sketches)
+    if use_history:
+        from src import valuation_history
+
+        pct = valuation_history.sector_percentiles(
+            full, full_pos, universe, target_date, alpha=val_cfg.get("sketch_alpha", 0.01)
+        )
+        for col in valuation_history.PERCENTILE_COLUMNS:
+            fund[col] = pct[col].reindex(fund.index).to_numpy()
+
     # Valuation label: sector-relative or absolute
     def label_row(row):
         per = row.get("per", row.get("PER", float("nan")))
@@ -98,6 +164,16 @@ def run_valuation(
         sector = row.get("sector")
         if pd.isna(per) and pd.isna(pbr):
             return "N/A"
+        if label_by_pct:
+            per_p = row.get(f"per_pct_{pct_basis}", float("nan"))
+            pbr_p = row.get(f"pbr_pct_{pct_basis}", float("nan"))
+            if not (pd.isna(per_p) and pd.isna(pbr_p)):
+                # 낮은 분위 = 업종 내 상대적으로 싸다
+                if not pd.isna(per_p) and per_p <= under_pct and (pd.isna(pbr_p) or pbr_p <= under_pct):
+                    return "저평가"
+                if (not pd.isna(per_p) and per_p >= over_pct) or (not pd.isna(pbr_p) and pbr_p >= over_pct):
+                    return "고평가"
+                return "적정"
         if sector and sector in sector_median_per and sector in sector_median_pbr:
             med_per = sector_median_per[sector]
             med_pbr = sector_median_pbr[sector]
@@ -122,7 +198,10 @@ def run_valuation(
         return "적정"
 
     if sector_series is not None:
-        fund["sector"] = fund["ticker"].map(sector_series)
+        if universe is not None:
+            fund["sector"] = universe.sectors_at(fund.index.to_numpy())
+        else:
+            fund["sector"] = fund["ticker"].map(sector_series)
     fund["valuation_label"] = fund.apply(label_row, axis=1)
     if sector_series is not None:
         fund["sector_median_per"] = fund["sector"].map(sector_median_per)
@@ -0,0 +1,205 @@
+"""
+업종별 PER/PBR 과거 분포: 일자마다 전종목 값을 업종별 분위 스케치에 누적해
+종목의 업종 내 현재 분위·과거(누적) 분위를 계산. 스케치는 cache/ 에 JSON으로 저장.
+"""
+import json
+import threading
+
+import numpy as np
+import pandas as pd
+
+from src.config_loader import CACHE_ROOT
+from src.quantile_sketch import QuantileSketch
+
+SKETCH_PATH = CACHE_ROOT / "valuation_sketches.json"
+METRICS = ("per", "pbr")
+PERCENTILE_COLUMNS = ["per_pct_sector", "pbr_pct_sector", "per_pct_hist", "pbr_pct_hist"]
+# backfill: 이 일자 수마다 스케치 파일 저장 (중단돼도 진행분 유지)
+SAVE_EVERY = 20
+# backfill: 업종 분류는 월이 바뀌거나 분류된 종목 비율이 이만큼 줄면 다시 조회 (신규 상장·업종 변경 반영)
+MAPPING_COVERAGE_DROP = 0.01
+
+_store = None
+_lock = threading.Lock()
+
+
+class SectorSketchStore:
+    """Per-sector PER/PBR quantile sketches plus the set of dates already ingested."""
+
+    def __init__(self, alpha: float = 0.01):
+        self.alpha = alpha
+        self.dates: set[str] = set()
+        self.sketches: dict[str, dict[str, QuantileSketch]] = {}
+
+    @classmethod
+    def load(cls, path=None, alpha: float = 0.01) -> "SectorSketchStore":
+        path = path or SKETCH_PATH
+        store = cls(alpha=alpha)
+        if path.exists():
+            data = json.loads(path.read_text(encoding="utf-8"))
+            store.alpha = data.get("alpha", alpha)
+            store.dates = set(data.get("dates", []))
+            store.sketches = {
+                sector: {m: QuantileSketch.from_dict(d) for m, d in metrics.items()}
+                for sector, metrics in data.get("sectors", {}).items()
+            }
+        return store
+
+    def save(self, path=None) -> None:
+        path = path or SKETCH_PATH
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "alpha": self.alpha,
+            "dates": sorted(self.dates),
+            "sectors": {
+                sector: {m: sk.to_dict() for m, sk in metrics.items()}
+                for sector, metrics in sorted(self.sketches.items())
+            },
+        }
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(path)
+
+    def ingest(self, date: str, sectors: np.ndarray, values: dict[str, np.ndarray]) -> bool:
+        """Add one day's values (aligned with sectors). Returns False if date was already ingested."""
+        if date in self.dates:
+            return False
+        for sector in pd.unique(sectors):
+            if not isinstance(sector, str):
+                continue
+            rows = sectors == sector
+            metrics = self.sketches.setdefault(sector, {})
+            for m in METRICS:
+                metrics.setdefault(m, QuantileSketch(self.alpha)).add_many(values[m][rows])
+        self.dates.add(date)
+        return True
+
+    def percentile_of(self, sectors: np.ndarray, metric: str, values: np.ndarray) -> np.ndarray:
+        """Historical sector percentile (0~100) of each value; NaN when the sector has no history."""
+        out = np.full(len(values), np.nan)
+        for sector in pd.unique(sectors):
+            sk = self.sketches.get(sector, {}).get(metric) if isinstance(sector, str) else None
+            if sk is None:
+                continue
+            rows = sectors == sector
+            out[rows] = sk.percentile_of(values[rows])
+        return out
+
+
+def get_store(alpha: float = 0.01) -> SectorSketchStore:
+    """Process-wide store (loaded once, kept warm in serve mode)."""
+    global _store
+    with _lock:
+        if _store is None:
+            _store = SectorSketchStore.load(alpha=alpha)
+        return _store
+
+
+def sector_percentiles(
+    full: pd.DataFrame,
+    full_pos: np.ndarray,
+    universe,
+    target_date: str,
+    alpha: float = 0.01,
+    update: bool = True,
+) -> pd.DataFrame:
+    """
+    full: all-market fundamental (per/pbr columns), rows aligned with full_pos (universe positions).
+    Returns a frame indexed by universe position with current in-sector percentiles
+    (per_pct_sector, pbr_pct_sector) and historical ones from the sketches (per_pct_hist, pbr_pct_hist).
+    When update is True, the day's values are folded into the sketches first (once per date), unless
+    market_data served the day's fundamentals from an older snapshot.
+    """
+    ok = full_pos >= 0
+    pos = full_pos[ok]
+    sectors = universe.sectors_at(pos)
+    values = {
+        m: pd.to_numeric(full[m], errors="coerce").to_numpy(dtype=float)[ok] if m in full.columns
+        else np.full(len(pos), np.nan)
+        for m in METRICS
+    }
+    out = pd.DataFrame(index=pos)
+
+    # 당일 업종 내 분위 (양수 값만 순위 대상)
+    codes = universe.sector_codes[pos]
+    for m in METRICS:
+        v = pd.Series(np.where(values[m] > 0, values[m], np.nan), index=pos)
+        v[codes < 0] = np.nan
+        out[f"{m}_pct_sector"] = v.groupby(codes).rank(pct=True) * 100
+
+    if update:
+        from src import market_data
+
+        update = not market_data.served_stale("fundamental", target_date)
+    store = get_store(alpha)
+    with _lock:
+        if update and store.ingest(target_date, sectors, values):
+            store.save()
+        for m in METRICS:
+            out[f"{m}_pct_hist"] = store.percentile_of(sectors, m, values[m])
+    return out[PERCENTILE_COLUMNS]
+
+
+def backfill(dates: list[str], alpha: float = 0.01) -> int:
+    """
+    Ingest fundamentals for each date not yet in the sketches. Returns number of dates added.
+    Sectors come from a KRX classification fetch reused within a month (instead of a universe build per
+    date) and fetched again when the month changes or the share of classified tickers drops by
+    MAPPING_COVERAGE_DROP (new listings); the sketches are saved every SAVE_EVERY added dates and at the end.
+    """
+    from src import market_data
+    from src.theme_analyzer import get_sector_mapping
+    from src.universe import normalize_tickers
+
+    store = get_store(alpha)
+    sector_of: pd.Series | None = None
+    mapped_month, mapped_coverage = "", 0.0
+    added = unsaved = 0
+    try:
+        for date in dates:
+            if date in store.dates:
+                continue
+            try:
+                fund = market_data.get_market_fundamental(date)
+            except Exception as e:
+                print(f"[{date}] fundamental 조회 실패: {e}")
+                continue
+            if fund is None or fund.empty:
+                continue
+            if market_data.served_stale("fundamental", date):
+                print(f"[{date}] fundamental 조회 실패 → 이전 스냅샷은 누적하지 않음")
+                continue
+            tickers = normalize_tickers(fund.index)
+            sectors = None
+            if sector_of is not None and date[:6] == mapped_month:
+                sectors = sector_of.reindex(tickers).to_numpy(dtype=object)
+                if pd.notna(sectors).mean() < mapped_coverage - MAPPING_COVERAGE_DROP:
+                    sectors = None
+            if sectors is None:
+                mapping = get_sector_mapping(date)
+                if mapping.empty:
+                    print(f"[{date}] 업종 분류 조회 실패")
+                    continue
+                sector_of = pd.Series(mapping["sector"].to_numpy(), index=pd.Index(mapping["ticker"]))
+                sectors = sector_of.reindex(tickers).to_numpy(dtype=object)
+                mapped_month, mapped_coverage = date[:6], float(pd.notna(sectors).mean())
+            values = {
+                m: pd.to_numeric(fund[col], errors="coerce").to_numpy(dtype=float) if col in fund.columns
+                else np.full(len(fund), np.nan)
+                for m, col in zip(METRICS, ("PER", "PBR"))
+            }
+            with _lock:
+                if not store.ingest(date, sectors, values):
+                    continue
+            added += 1
+            unsaved += 1
+            print(f"[{date}] 업종 분위 스케치 누적")
+            if unsaved >= SAVE_EVERY:
+                with _lock:
+                    store.save()
+                unsaved = 0
+    finally:
+        if unsaved:
+            with _lock:
+                store.save()
+    return added